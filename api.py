@@ -0,0 +1,281 @@
+# api.py
+"""API baca HTTP/JSON untuk data penelitian, dijalankan sebagai proses terpisah dari app.py.
+
+Memakai lapisan data yang sama (utils/data_handler.py): data dimuat sekali
+dan hanya dimuat ulang jika file berubah. Respons di-cache per versi data,
+mendukung ETag (If-None-Match -> 304), gzip, dan koneksi keep-alive.
+
+Jalankan dari root repository:
+    python api.py [--host 127.0.0.1] [--port 8502] [--data-file data/research_data.json]
+
+Endpoint (GET/HEAD):
+    /api/research?status=&tahun=&bidang=&institusi=&q=&sort=&order=&page=&page_size=&full=1
+    /api/research/<id>
+    /api/aggregates
+    /api/facets/<bidang|kata_kunci>?limit=&status=&tahun=&bidang=&institusi=&q=
+    /api/suggest/<bidang|kata_kunci>?prefix=&limit=    (autocomplete)
+    /api/attachments/<sha256>    (mendukung header Range)
+    /api/health
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from utils import data_handler
+from utils.attachments import attachment_path, iter_attachment, parse_byte_range
+from utils.data_handler import (count_research, get_data_version, get_facet_counts, get_research_aggregates,
+                                get_research_detail, iter_full_records, query_research_page, suggest_terms)
+from utils.schema import LONG_TEXT_FIELDS, abstract_preview, record_to_json
+
+# Jumlah respons (per URL dan versi data) yang disimpan di memori
+RESPONSE_CACHE_SIZE = 1024
+
+# Respons lebih kecil dari ini tidak dikompres
+GZIP_MIN_BYTES = 1024
+
+# Batas jumlah record per halaman
+MAX_PAGE_SIZE = 100
+
+_LONG_SET = frozenset(LONG_TEXT_FIELDS)
+_FILTER_PARAMS = ('status', 'tahun', 'bidang', 'institusi')
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class ResponseCache:
+    """Cache LRU respons JSON: kunci (versi data, URL ternormalisasi) -> [body, body gzip]"""
+
+    def __init__(self, max_size=RESPONSE_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, body):
+        entry = [body, None]
+        with self.lock:
+            self.entries[key] = entry
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return entry
+
+_responses = ResponseCache()
+
+def _summary(record):
+    """Record tanpa teks panjang (tidak dibaca dari disk), ditambah cuplikan abstrak"""
+    data = {key: record.get(key) for key in record if key not in _LONG_SET}
+    data['cuplikan_abstrak'] = abstract_preview(record)
+    return data
+
+def _filter_value(field, values):
+    if field == 'tahun':
+        try:
+            values = [int(v) for v in values]
+        except ValueError:
+            raise ApiError(400, "Parameter tahun harus berupa angka")
+    return values[0] if len(values) == 1 else values
+
+def _int_param(params, name, default):
+    try:
+        return int(params.get(name, [default])[0])
+    except ValueError:
+        raise ApiError(400, f"Parameter {name} harus berupa angka")
+
+def list_research(params):
+    filters = {f: _filter_value(f, params[f]) for f in _FILTER_PARAMS if params.get(f)}
+    sort_by = params.get('sort', [None])[0]
+    if sort_by not in (None,) + data_handler.SORT_KEYS:
+        raise ApiError(400, f"Parameter sort harus salah satu dari {', '.join(data_handler.SORT_KEYS)}")
+    page_size = min(max(_int_param(params, 'page_size', 20), 1), MAX_PAGE_SIZE)
+    result = query_research_page(**filters, text=params.get('q', [None])[0], sort_by=sort_by,
+                                 descending=params.get('order', ['desc'])[0] != 'asc',
+                                 page=_int_param(params, 'page', 1), page_size=page_size)
+    full = params.get('full', ['0'])[0] not in ('0', '')
+    records = list(iter_full_records(result['records'])) if full else [_summary(r) for r in result['records']]
+    return {'records': records, 'total': result['total'], 'page': result['page'],
+            'pages': result['pages'], 'page_size': page_size}
+
+def research_detail(research_id):
+    record = get_research_detail(int(research_id) if research_id.isdigit() else research_id)
+    if record is None:
+        raise ApiError(404, f"Penelitian {research_id} tidak ditemukan")
+    return record
+
+def aggregates():
+    data = get_research_aggregates()
+    # Kunci tahun (int) dan Counter kata kunci sebagai objek JSON biasa
+    return {key: ({str(k): v for k, v in value.items()} if isinstance(value, dict) else value)
+            for key, value in data.items()}
+
+def _facet_field(field):
+    if field not in data_handler.FACET_FIELDS:
+        raise ApiError(404, f"Facet {field} tidak ditemukan")
+    return field
+
+def facets(field, params):
+    filters = {f: _filter_value(f, params[f]) for f in _FILTER_PARAMS if params.get(f)}
+    limit = max(_int_param(params, 'limit', 50), 1)
+    counts = get_facet_counts(_facet_field(field), limit=limit, text=params.get('q', [None])[0], **filters)
+    return {'field': field, 'facets': [{'label': label, 'count': count} for label, count in counts]}
+
+def suggest(field, params):
+    limit = min(max(_int_param(params, 'limit', 10), 1), MAX_PAGE_SIZE)
+    terms = suggest_terms(_facet_field(field), params.get('prefix', [''])[0], limit)
+    return {'field': field, 'suggestions': [{'label': label, 'count': count} for label, count in terms]}
+
+def _route(path, params):
+    """Payload JSON untuk path, ApiError jika tidak ada"""
+    parts = [p for p in path.split("/") if p]
+    if parts[:1] != ['api']:
+        raise ApiError(404, "Endpoint tidak ditemukan")
+    if parts[1:] == ['research']:
+        return list_research(params)
+    if len(parts) == 3 and parts[1] == 'research':
+        return research_detail(parts[2])
+    if parts[1:] == ['aggregates']:
+        return aggregates()
+    if len(parts) == 3 and parts[1] == 'facets':
+        return facets(parts[2], params)
+    if len(parts) == 3 and parts[1] == 'suggest':
+        return suggest(parts[2], params)
+    raise ApiError(404, "Endpoint tidak ditemukan")
+
+class ResearchApiHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1: koneksi tetap terbuka (keep-alive) selama Content-Length dikirim
+    protocol_version = "HTTP/1.1"
+    # Header dan body ditulis terpisah; tanpa TCP_NODELAY tiap respons tertahan delayed ACK
+    disable_nagle_algorithm = True
+    server_version = "ResearchAPI/1.0"
+    quiet = True
+
+    def do_GET(self):
+        self._handle(send_body=True)
+
+    def do_HEAD(self):
+        self._handle(send_body=False)
+
+    def _handle(self, send_body):
+        url = urlsplit(self.path)
+        try:
+            if url.path.startswith("/api/attachments/"):
+                self._send_attachment(url.path.rsplit("/", 1)[-1], send_body)
+            elif url.path == "/api/health":
+                payload = {'status': 'ok', 'records': count_research(), 'version': get_data_version()}
+                self._send_json(200, json.dumps(payload).encode('utf-8'), send_body)
+            else:
+                self._send_cached(url, send_body)
+        except ApiError as e:
+            self._send_json(e.status, json.dumps({'error': str(e)}).encode('utf-8'), send_body)
+        except Exception as e:
+            print(f"Error handling {self.path}: {e}")
+            self._send_json(500, b'{"error": "Kesalahan server"}', send_body)
+
+    def _send_cached(self, url, send_body):
+        params = parse_qs(url.query)
+        # Urutan parameter tidak memengaruhi kunci cache maupun ETag
+        normalized = url.path + "?" + urlencode(sorted((k, v) for k, vs in params.items() for v in vs))
+        version = get_data_version()
+        etag = '"' + hashlib.blake2b(f"{version} {normalized}".encode('utf-8'), digest_size=12).hexdigest() + '"'
+        if etag in self.headers.get('If-None-Match', ''):
+            self._send_headers(304, {'ETag': etag, 'Content-Length': '0'})
+            return
+        key = (version, normalized)
+        entry = _responses.get(key)
+        if entry is None:
+            body = json.dumps(_route(url.path, params), ensure_ascii=False, default=record_to_json).encode('utf-8')
+            entry = _responses.put(key, body)
+        body = entry[0]
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+        if len(body) >= GZIP_MIN_BYTES and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            if entry[1] is None:
+                entry[1] = gzip.compress(body, compresslevel=6)
+            body = entry[1]
+            headers['Content-Encoding'] = 'gzip'
+        self._send_json(200, body, send_body, headers)
+
+    def _send_attachment(self, digest, send_body):
+        path = attachment_path(digest)
+        if path is None:
+            raise ApiError(404, "Lampiran tidak ditemukan")
+        size = os.path.getsize(path)
+        # Blob dinamai dengan hash isinya sehingga tidak pernah berubah
+        headers = {'ETag': f'"{digest}"', 'Accept-Ranges': 'bytes',
+                   'Cache-Control': 'public, max-age=31536000, immutable',
+                   'Content-Type': 'application/octet-stream'}
+        if f'"{digest}"' in self.headers.get('If-None-Match', ''):
+            self._send_headers(304, dict(headers, **{'Content-Length': '0'}))
+            return
+        try:
+            byte_range = parse_byte_range(self.headers.get('Range'), size)
+        except ValueError:
+            self._send_headers(416, {'Content-Range': f"bytes */{size}", 'Content-Length': '0'})
+            return
+        status, (start, end) = (206, byte_range) if byte_range else (200, (0, size - 1))
+        if byte_range:
+            headers['Content-Range'] = f"bytes {start}-{end}/{size}"
+        headers['Content-Length'] = str(end - start + 1)
+        self._send_headers(status, headers)
+        if send_body and size:
+            for chunk in iter_attachment(digest, start, end):
+                self.wfile.write(chunk)
+
+    def _send_json(self, status, body, send_body, headers=None):
+        headers = dict(headers or {}, **{'Content-Type': 'application/json; charset=utf-8',
+                                         'Content-Length': str(len(body))})
+        self._send_headers(status, headers)
+        if send_body:
+            self.wfile.write(body)
+
+    def _send_headers(self, status, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+def create_server(host="127.0.0.1", port=8502, verbose=False):
+    """Server HTTP berthread (belum berjalan); panggil serve_forever()"""
+    ResearchApiHandler.quiet = not verbose
+    server = ThreadingHTTPServer((host, port), ResearchApiHandler)
+    server.daemon_threads = True
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API baca HTTP/JSON untuk data penelitian")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--data-file", help="path file data JSON (default data/research_data.json)")
+    parser.add_argument("--verbose", action="store_true", help="catat setiap request")
+    args = parser.parse_args(argv)
+    if args.data_file:
+        data_handler.DATA_FILE = args.data_file
+    # Data dimuat sekali sebelum request pertama
+    count = count_research()
+    server = create_server(args.host, args.port, args.verbose)
+    print(f"API penelitian ({count} record) berjalan di http://{args.host}:{server.server_port}/api/research")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
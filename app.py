@@ -7,7 +7,22 @@ import plotly.graph_objects as go
 from datetime import datetime
 import os
 import sys
-from utils.data_handler import load_research_data, save_research_data
+from utils.data_handler import (
+    append_research_data, get_store_stats,
+    query_research_page, latest_research, count_research, count_research_by, get_research_aggregates,
+    get_research_frames, get_research_detail, get_data_generation, get_similar_research, find_near_duplicates,
+    list_collections, use_collection, get_facet_counts, canonical_terms
+)
+from utils.attachments import attachment_path, schedule_text_extraction, store_attachment
+from utils.exporter import EXPORT_FORMATS, cached_export_path, export_research
+from utils.figure_cache import cached_figure, get_figure_cache_stats
+from utils.importer import import_research_stream
+from utils.profiler import (chrome_trace, get_profile_counters, get_profile_summary, is_profiling_enabled,
+                            profiled, reset_profile, set_profiling, span)
+from utils.schema import PREVIEW_LENGTH, abstract_preview, validate_record
+
+# Jumlah kata kunci terpopuler yang ditawarkan sebagai pilihan di form input
+KEYWORD_OPTIONS = 500
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -68,6 +83,15 @@ def main():
             ["🏠 Dashboard", "📝 Input Data", "🔍 Lihat Penelitian", "📊 Analisis", "⚙️ Pengaturan"]
         )
         
+        # Dengan sharding, semua halaman bisa dibatasi ke satu koleksi
+        collection = None
+        collections = list_collections()
+        if collections:
+            collection = st.selectbox(
+                "Koleksi:", [None] + list(collections),
+                format_func=lambda slug: "Semua koleksi" if slug is None else collections[slug]
+            )
+        
         st.markdown("---")
         st.markdown("### Tentang Aplikasi")
         st.info(
@@ -79,33 +103,36 @@ def main():
         st.markdown("**Dibuat oleh:** Tim Penelitian")
         st.markdown("**Versi:** 1.0.0")
 
-    # Halaman Dashboard
-    if menu == "🏠 Dashboard":
-        show_dashboard()
-    
-    # Halaman Input Data
-    elif menu == "📝 Input Data":
-        show_input_form()
-    
-    # Halaman Lihat Penelitian
-    elif menu == "🔍 Lihat Penelitian":
-        show_research_list()
-    
-    # Halaman Analisis
-    elif menu == "📊 Analisis":
-        show_analysis()
-    
-    # Halaman Pengaturan
-    elif menu == "⚙️ Pengaturan":
-        show_settings()
+    # Satu rerun dicatat sebagai satu span jika profiling aktif
+    with use_collection(collection), span("rerun", 'page', halaman=menu, koleksi=collection):
+        # Halaman Dashboard
+        if menu == "🏠 Dashboard":
+            show_dashboard()
+        
+        # Halaman Input Data
+        elif menu == "📝 Input Data":
+            show_input_form()
+        
+        # Halaman Lihat Penelitian
+        elif menu == "🔍 Lihat Penelitian":
+            show_research_list()
+        
+        # Halaman Analisis
+        elif menu == "📊 Analisis":
+            show_analysis()
+        
+        # Halaman Pengaturan
+        elif menu == "⚙️ Pengaturan":
+            show_settings()
 
+@profiled(category='page')
 def show_dashboard():
     st.markdown('<h1 class="main-header">📊 Dashboard Resume Laporan Penelitian</h1>', unsafe_allow_html=True)
     
-    # Load data penelitian
-    research_data = load_research_data()
+    # Jumlah data penelitian
+    total_research = count_research()
     
-    if not research_data:
+    if not total_research:
         st.warning("Belum ada data penelitian. Silakan tambah data di halaman 'Input Data'.")
         return
     
@@ -114,23 +141,27 @@ def show_dashboard():
     
     with col1:
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-        st.metric("Total Penelitian", len(research_data))
+        st.metric("Total Penelitian", total_research)
         st.markdown('</div>', unsafe_allow_html=True)
     
+    # Jumlah per status dan tahun diambil dari indeks, tanpa memindai data
+    status_index = count_research_by('status')
+    year_index = count_research_by('tahun')
+    
     with col2:
-        completed = sum(1 for r in research_data if r.get('status') == 'Selesai')
+        completed = status_index.get('Selesai', 0)
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
         st.metric("Penelitian Selesai", completed)
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col3:
-        ongoing = sum(1 for r in research_data if r.get('status') == 'Berjalan')
+        ongoing = status_index.get('Berjalan', 0)
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
         st.metric("Sedang Berjalan", ongoing)
         st.markdown('</div>', unsafe_allow_html=True)
     
     with col4:
-        years = list(set(r.get('tahun', '') for r in research_data))
+        years = [y for y in year_index if isinstance(y, int)]
         st.markdown('<div class="metric-card">', unsafe_allow_html=True)
         st.metric("Rentang Tahun", f"{min(years)} - {max(years)}" if years else "-")
         st.markdown('</div>', unsafe_allow_html=True)
@@ -138,50 +169,47 @@ def show_dashboard():
     # Grafik status penelitian
     st.markdown('<h2 class="section-header">📈 Statistik Penelitian</h2>', unsafe_allow_html=True)
     
+    # Agregat terpelihara, tidak dihitung ulang dari seluruh data
+    aggregates = get_research_aggregates()
+    
+    # Figure hanya dibangun ulang jika generasi data berubah
+    generation = get_data_generation()
+    
     col1, col2 = st.columns(2)
     
     with col1:
         # Pie chart status
-        status_counts = {}
-        for research in research_data:
-            status = research.get('status', 'Tidak Diketahui')
-            status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = aggregates['status']
         
         if status_counts:
-            fig = px.pie(
+            fig = cached_figure("dashboard_status", lambda: px.pie(
                 values=list(status_counts.values()),
                 names=list(status_counts.keys()),
                 title="Distribusi Status Penelitian",
                 color_discrete_sequence=px.colors.qualitative.Set3
-            )
+            ), generation)
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Bar chart tahun
-        year_counts = {}
-        for research in research_data:
-            year = research.get('tahun', '')
-            if year:
-                year_counts[year] = year_counts.get(year, 0) + 1
+        year_counts = aggregates['tahun']
         
         if year_counts:
-            fig = px.bar(
+            fig = cached_figure("dashboard_tahun", lambda: px.bar(
                 x=list(year_counts.keys()),
                 y=list(year_counts.values()),
                 title="Jumlah Penelitian per Tahun",
                 labels={'x': 'Tahun', 'y': 'Jumlah'},
                 color=list(year_counts.values()),
                 color_continuous_scale='Viridis'
-            )
+            ), generation)
             st.plotly_chart(fig, use_container_width=True)
     
     # Penelitian terbaru
     st.markdown('<h2 class="section-header">📋 Penelitian Terbaru</h2>', unsafe_allow_html=True)
     
-    # Urutkan berdasarkan tanggal (terbaru)
-    sorted_research = sorted(research_data, 
-                           key=lambda x: x.get('tanggal_mulai', ''), 
-                           reverse=True)[:5]
+    # Lima terbaru dari indeks tanggal, tanpa mengurutkan seluruh data
+    sorted_research = latest_research(5)
     
     for research in sorted_research:
         with st.container():
@@ -191,10 +219,11 @@ def show_dashboard():
                 <p><strong>Peneliti:</strong> {research.get('peneliti_utama', '')}</p>
                 <p><strong>Status:</strong> <span style="color: {'#10B981' if research.get('status') == 'Selesai' else '#F59E0B'}">{research.get('status', 'Tidak Diketahui')}</span></p>
                 <p><strong>Tahun:</strong> {research.get('tahun', '')}</p>
-                <p>{research.get('abstrak', '')[:200]}...</p>
+                <p>{abstract_preview(research)}...</p>
             </div>
             """, unsafe_allow_html=True)
 
+@profiled(category='page')
 def show_input_form():
     st.markdown('<h1 class="main-header">📝 Input Data Penelitian Baru</h1>', unsafe_allow_html=True)
     
@@ -231,24 +260,38 @@ def show_input_form():
         
         # Link dan referensi
         link_publikasi = st.text_input("Link Publikasi", placeholder="URL jurnal/repositori")
-        kata_kunci = st.text_input("Kata Kunci (pisahkan dengan koma)", placeholder="contoh: AI, Machine Learning, Data Science")
+        # Kata kunci yang sudah ada dipilih dari kamus (bisa diketik untuk mencari)
+        kata_kunci_ada = st.multiselect(
+            "Kata Kunci",
+            [k[0] for k in get_facet_counts('kata_kunci', limit=KEYWORD_OPTIONS)]
+        )
+        kata_kunci = st.text_input("Kata Kunci Lain (pisahkan dengan koma)", placeholder="contoh: AI, Machine Learning, Data Science")
         
         # Upload file (opsional)
         uploaded_file = st.file_uploader("Upload Dokumen Pendukung (PDF/DOC)", type=['pdf', 'doc', 'docx'])
         
+        simpan_meski_mirip = st.checkbox("Tetap simpan meskipun mirip dengan penelitian yang sudah ada")
+        
         # Tombol submit
         submitted = st.form_submit_button("💾 Simpan Data Penelitian")
         
         if submitted:
+            near_duplicates = []
+            if judul and abstrak and not simpan_meski_mirip:
+                near_duplicates = find_near_duplicates({'judul': judul, 'abstrak': abstrak})
+            
             if not judul or not peneliti_utama or not abstrak:
                 st.error("Harap isi semua field yang wajib diisi (*)")
+            elif near_duplicates:
+                st.warning("⚠️ Penelitian ini sangat mirip dengan data yang sudah ada dan belum disimpan. "
+                           "Centang \"Tetap simpan\" jika memang penelitian yang berbeda.")
+                for other, score in near_duplicates:
+                    st.markdown(f"- **{other.get('judul', 'Tanpa Judul')}** - {other.get('peneliti_utama', '')} "
+                                f"({other.get('tahun', '')}), kemiripan {score:.0%}")
             else:
-                # Load data yang ada
-                research_data = load_research_data()
-                
-                # Buat data baru
+                # Buat data baru; id unik diberikan append_research_data hanya
+                # saat record benar-benar disimpan, isian yang ditolak tidak memakai id
                 new_research = {
-                    'id': len(research_data) + 1,
                     'judul': judul,
                     'peneliti_utama': peneliti_utama,
                     'institusi': institusi,
@@ -264,29 +307,47 @@ def show_input_form():
                     'hasil': hasil,
                     'kesimpulan': kesimpulan,
                     'link_publikasi': link_publikasi,
-                    'kata_kunci': [k.strip() for k in kata_kunci.split(',')] if kata_kunci else [],
+                    'kata_kunci': canonical_terms('kata_kunci', kata_kunci_ada + kata_kunci.split(',')),
                     'tanggal_input': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 }
                 
-                # Tambahkan ke data yang ada
-                research_data.append(new_research)
-                
-                # Simpan data
-                if save_research_data(research_data):
-                    st.success("✅ Data penelitian berhasil disimpan!")
-                    
-                    # Tampilkan preview
-                    with st.expander("Preview Data yang Disimpan"):
-                        st.json(new_research)
+                # Tambahkan ke journal tanpa menulis ulang seluruh data
+                validation_error = validate_record(new_research)
+                if validation_error:
+                    st.error(f"❌ Data tidak valid: {validation_error}")
                 else:
-                    st.error("❌ Gagal menyimpan data. Silakan coba lagi.")
+                    # Dokumen baru disimpan setelah record lolos semua pemeriksaan
+                    # sehingga isian yang ditolak tidak meninggalkan blob yatim
+                    if uploaded_file is not None:
+                        _attach_upload(new_research, uploaded_file)
+                    if append_research_data(new_research):
+                        st.success("✅ Data penelitian berhasil disimpan!")
+                        if new_research.get('lampiran'):
+                            # Teks dokumen diekstrak di latar belakang lalu masuk ke pencarian
+                            schedule_text_extraction(new_research['id'])
+                        
+                        # Tampilkan preview
+                        with st.expander("Preview Data yang Disimpan"):
+                            st.json(new_research)
+                    else:
+                        st.error("❌ Gagal menyimpan data. Silakan coba lagi.")
+
+def _attach_upload(record, uploaded_file):
+    """Simpan dokumen unggahan ke blob store (di-hash, tanpa duplikasi) sebagai lampiran record"""
+    uploaded_file.seek(0)
+    attachment = store_attachment(uploaded_file, uploaded_file.name, uploaded_file.type)
+    if attachment:
+        record['lampiran'] = [attachment]
+    else:
+        st.warning("⚠️ Dokumen pendukung gagal disimpan.")
 
+@profiled(category='page')
 def show_research_list():
     st.markdown('<h1 class="main-header">🔍 Daftar Penelitian</h1>', unsafe_allow_html=True)
     
-    research_data = load_research_data()
+    total_research = count_research()
     
-    if not research_data:
+    if not total_research:
         st.warning("Belum ada data penelitian.")
         return
     
@@ -297,32 +358,54 @@ def show_research_list():
         filter_status = st.selectbox("Filter Status", ["Semua", "Berjalan", "Selesai", "Dalam Perencanaan"])
     
     with col2:
-        filter_year = st.selectbox("Filter Tahun", ["Semua"] + sorted(list(set(str(r.get('tahun', '')) for r in research_data)), reverse=True))
+        filter_year = st.selectbox("Filter Tahun", ["Semua"] + sorted((str(y) for y in count_research_by('tahun')), reverse=True))
     
     with col3:
-        search_term = st.text_input("Cari (Judul/Peneliti)")
-    
-    # Filter data
-    filtered_data = research_data
-    
-    if filter_status != "Semua":
-        filtered_data = [r for r in filtered_data if r.get('status') == filter_status]
-    
-    if filter_year != "Semua":
-        filtered_data = [r for r in filtered_data if str(r.get('tahun')) == filter_year]
-    
-    if search_term:
-        filtered_data = [
-            r for r in filtered_data 
-            if search_term.lower() in r.get('judul', '').lower() 
-            or search_term.lower() in r.get('peneliti_utama', '').lower()
-        ]
+        search_term = st.text_input("Cari (Judul/Peneliti/Abstrak/Kata Kunci)")
+    
+    # Pengurutan dan ukuran halaman
+    sort_options = {
+        "Relevansi / Urutan Data": None,
+        "Tanggal Mulai (Terbaru)": ('tanggal_mulai', True),
+        "Tanggal Mulai (Terlama)": ('tanggal_mulai', False),
+        "Tahun (Terbaru)": ('tahun', True),
+        "Tahun (Terlama)": ('tahun', False),
+    }
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        sort_label = st.selectbox("Urutkan", list(sort_options.keys()))
+    with col2:
+        page_size = st.selectbox("Per Halaman", [10, 20, 50, 100], index=1)
+    sort_by, descending = sort_options[sort_label] or (None, True)
+    
+    # Kembali ke halaman pertama jika filter atau urutan berubah
+    query_key = (filter_status, filter_year, search_term, sort_label, page_size)
+    if st.session_state.get('research_list_query') != query_key:
+        st.session_state.research_list_query = query_key
+        st.session_state.research_list_page = 1
+    
+    # Filter data lewat indeks; hanya halaman yang tampil yang diambil. Hasil
+    # antara disimpan per sesi sehingga rerun hanya menghitung filter yang berubah
+    result = query_research_page(
+        status=filter_status if filter_status != "Semua" else None,
+        tahun=filter_year if filter_year != "Semua" else None,
+        text=search_term or None,
+        sort_by=sort_by,
+        descending=descending,
+        page=st.session_state.research_list_page,
+        page_size=page_size,
+        state=st.session_state.setdefault('research_list_state', {})
+    )
+    page_data = result['records']
+    st.session_state.research_list_page = result['page']
+    offset = (result['page'] - 1) * page_size
     
     # Tampilkan jumlah hasil
-    st.info(f"Menampilkan {len(filtered_data)} dari {len(research_data)} penelitian")
+    st.info(f"Menampilkan {len(page_data)} dari {result['total']} hasil "
+            f"(total {total_research} penelitian) - halaman {result['page']} dari {result['pages']}")
     
     # Tampilkan daftar penelitian
-    for idx, research in enumerate(filtered_data):
+    for idx, research in enumerate(page_data, start=offset):
         with st.expander(f"{idx+1}. {research.get('judul', 'Judul Tidak Tersedia')}", expanded=False):
             col1, col2 = st.columns([3, 1])
             
@@ -335,7 +418,9 @@ def show_research_list():
                 
                 st.markdown("---")
                 st.markdown("**Abstrak:**")
-                st.write(research.get('abstrak', ''))
+                # Cuplikan saja; teks lengkap dimuat di Detail
+                preview = abstract_preview(research)
+                st.write(preview + ("..." if len(preview) >= PREVIEW_LENGTH else ""))
             
             with col2:
                 # Badge status
@@ -354,7 +439,8 @@ def show_research_list():
                 
                 if st.button("📥 Ekspor", key=f"export_{idx}"):
                     # Simpan sebagai JSON
-                    json_str = json.dumps(research, indent=2, ensure_ascii=False)
+                    detail = get_research_detail(research.get('id')) or dict(research)
+                    json_str = json.dumps(detail, indent=2, ensure_ascii=False)
                     st.download_button(
                         label="Download JSON",
                         data=json_str,
@@ -367,47 +453,131 @@ def show_research_list():
                 st.markdown("---")
                 st.markdown("### Detail Lengkap")
                 
+                # Teks panjang dimuat dari disk hanya untuk record yang dibuka
+                detail = get_research_detail(research.get('id')) or research
+                
                 tab1, tab2, tab3, tab4 = st.tabs(["📄 Info", "🔬 Metodologi", "📊 Hasil", "🔗 Link"])
                 
                 with tab1:
+                    st.markdown("**Abstrak:**")
+                    st.write(detail.get('abstrak', ''))
                     col1, col2 = st.columns(2)
                     with col1:
                         st.markdown("**Latar Belakang:**")
-                        st.write(research.get('latar_belakang', ''))
+                        st.write(detail.get('latar_belakang', ''))
                     with col2:
                         st.markdown("**Sumber Dana:**")
-                        st.write(research.get('sumber_dana', 'Tidak Tersedia'))
+                        st.write(detail.get('sumber_dana', 'Tidak Tersedia'))
                 
                 with tab2:
                     st.markdown("**Metodologi:**")
-                    st.write(research.get('metodologi', ''))
+                    st.write(detail.get('metodologi', ''))
                 
                 with tab3:
                     col1, col2 = st.columns(2)
                     with col1:
                         st.markdown("**Hasil Penelitian:**")
-                        st.write(research.get('hasil', ''))
+                        st.write(detail.get('hasil', ''))
                     with col2:
                         st.markdown("**Kesimpulan:**")
-                        st.write(research.get('kesimpulan', ''))
+                        st.write(detail.get('kesimpulan', ''))
                 
                 with tab4:
                     if research.get('link_publikasi'):
                         st.markdown(f"[🔗 Link Publikasi]({research.get('link_publikasi')})")
                     else:
                         st.info("Tidak ada link publikasi tersedia")
+                    
+                    for i, lampiran in enumerate(detail.get('lampiran') or []):
+                        path = attachment_path(lampiran.get('sha256'))
+                        if path is None:
+                            st.warning(f"Dokumen {lampiran.get('nama')} tidak ditemukan")
+                            continue
+                        with open(path, 'rb') as f:
+                            st.download_button(
+                                label=f"📎 {lampiran.get('nama')} ({lampiran.get('ukuran', 0) / 1e6:.1f} MB)",
+                                data=f,
+                                file_name=lampiran.get('nama'),
+                                mime=lampiran.get('mime'),
+                                key=f"lampiran_{idx}_{i}"
+                            )
+                
+                # Rekomendasi dari kemiripan judul, kata kunci, dan abstrak
+                similar = get_similar_research(research.get('id'), k=5)
+                if similar:
+                    st.markdown("#### 🔗 Penelitian Serupa")
+                    for other, score in similar:
+                        st.markdown(f"- **{other.get('judul', 'Tanpa Judul')}** - {other.get('peneliti_utama', '')} "
+                                    f"({other.get('tahun', '')}), kemiripan {score:.0%}")
+    
+    # Ekspor seluruh hasil pencarian/filter saat ini
+    with st.expander("📥 Ekspor Hasil Pencarian"):
+        show_export_controls(
+            "research_list", "research_filtered",
+            status=filter_status if filter_status != "Semua" else None,
+            tahun=filter_year if filter_year != "Semua" else None,
+            text=search_term or None
+        )
+    
+    # Navigasi halaman
+    if result['pages'] > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            st.button("◀ Sebelumnya", on_click=change_research_page, args=(-1,),
+                      disabled=result['page'] <= 1)
+        with col2:
+            st.markdown(f"<p style='text-align: center;'>Halaman {result['page']} dari {result['pages']}</p>",
+                        unsafe_allow_html=True)
+        with col3:
+            st.button("Berikutnya ▶", on_click=change_research_page, args=(1,),
+                      disabled=result['page'] >= result['pages'])
+
+def change_research_page(delta):
+    st.session_state.research_list_page = st.session_state.get('research_list_page', 1) + delta
+
+@profiled(category='page')
+def show_export_controls(key, file_prefix, **filters):
+    """Pilihan format dan tombol unduh ekspor untuk seluruh data atau hasil filter"""
+    format_labels = {
+        "JSON": 'json',
+        "JSON Lines": 'jsonl',
+        "CSV": 'csv',
+        "Excel (XLSX)": 'xlsx',
+    }
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        fmt = format_labels[st.selectbox("Format", list(format_labels.keys()), key=f"export_format_{key}")]
+    with col2:
+        path = cached_export_path(fmt, **filters)
+        if path is None and st.button("⚙️ Siapkan File Ekspor", key=f"export_prepare_{key}"):
+            with st.spinner("Menyiapkan file ekspor..."):
+                path = export_research(fmt, **filters)
+            if path is None:
+                st.error("Gagal membuat file ekspor")
+        if path is not None:
+            extension, mime = EXPORT_FORMATS[fmt]
+            with open(path, 'rb') as f:
+                st.download_button(
+                    label=f"📥 Download ({os.path.getsize(path) / 1e6:.1f} MB)",
+                    data=f,
+                    file_name=f"{file_prefix}_{datetime.now().strftime('%Y%m%d')}.{extension}",
+                    mime=mime,
+                    key=f"export_download_{key}"
+                )
 
+@profiled(category='page')
 def show_analysis():
     st.markdown('<h1 class="main-header">📊 Analisis Data Penelitian</h1>', unsafe_allow_html=True)
     
-    research_data = load_research_data()
+    # Agregat terpelihara, tidak dihitung ulang dari seluruh data
+    aggregates = get_research_aggregates()
     
-    if not research_data:
+    if not aggregates['total']:
         st.warning("Belum ada data penelitian untuk dianalisis.")
         return
     
-    # Konversi ke DataFrame untuk analisis lebih mudah
-    df = pd.DataFrame(research_data)
+    # Figure hanya dibangun ulang jika generasi data berubah
+    generation = get_data_generation()
     
     col1, col2 = st.columns(2)
     
@@ -415,95 +585,138 @@ def show_analysis():
         # Analisis tren tahunan
         st.markdown('<h3 class="section-header">📈 Tren Penelitian per Tahun</h3>', unsafe_allow_html=True)
         
-        if 'tahun' in df.columns:
-            yearly_counts = df['tahun'].value_counts().sort_index()
-            fig = px.line(
-                x=yearly_counts.index,
-                y=yearly_counts.values,
+        if aggregates['tahun']:
+            yearly_counts = sorted(aggregates['tahun'].items(), key=lambda item: str(item[0]))
+            fig = cached_figure("analisis_tren_tahun", lambda: px.line(
+                x=[y[0] for y in yearly_counts],
+                y=[y[1] for y in yearly_counts],
                 title="Jumlah Penelitian per Tahun",
                 labels={'x': 'Tahun', 'y': 'Jumlah Penelitian'},
                 markers=True
-            )
+            ), generation)
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
         # Analisis bidang ilmu
         st.markdown('<h3 class="section-header">🔬 Distribusi Bidang Ilmu</h3>', unsafe_allow_html=True)
         
-        # Hitung bidang ilmu
-        bidang_counts = {}
-        for bidang_list in df['bidang'].dropna():
-            for bidang in bidang_list:
-                bidang_counts[bidang] = bidang_counts.get(bidang, 0) + 1
+        # Bidang dengan ejaan berbeda ("Teknologi"/"teknologi") dihitung sebagai satu
+        bidang_counts = get_facet_counts('bidang')
         
         if bidang_counts:
-            fig = px.bar(
-                x=list(bidang_counts.keys()),
-                y=list(bidang_counts.values()),
+            fig = cached_figure("analisis_bidang", lambda: px.bar(
+                x=[b[0] for b in bidang_counts],
+                y=[b[1] for b in bidang_counts],
                 title="Jumlah Penelitian per Bidang",
                 labels={'x': 'Bidang Ilmu', 'y': 'Jumlah'},
-                color=list(bidang_counts.values()),
+                color=[b[1] for b in bidang_counts],
                 color_continuous_scale='Plasma'
-            )
+            ), generation)
             st.plotly_chart(fig, use_container_width=True)
     
     # Word cloud kata kunci
     st.markdown('<h3 class="section-header">🏷️ Kata Kunci Populer</h3>', unsafe_allow_html=True)
     
-    # Ekstrak semua kata kunci
-    all_keywords = []
-    for keywords in df['kata_kunci'].dropna():
-        all_keywords.extend(keywords)
+    # Kata kunci dinormalisasi: "AI"/"ai" dan "Machine Learning"/"machine-learning" digabung
+    keyword_counts = get_facet_counts('kata_kunci')
     
-    if all_keywords:
-        from collections import Counter
-        keyword_counts = Counter(all_keywords)
-        
+    if keyword_counts:
         col1, col2 = st.columns([2, 1])
         
         with col1:
             # Buat bar chart untuk kata kunci
-            top_keywords = keyword_counts.most_common(10)
-            fig = px.bar(
+            top_keywords = keyword_counts[:10]
+            fig = cached_figure("analisis_kata_kunci", lambda: px.bar(
                 x=[k[0] for k in top_keywords],
                 y=[k[1] for k in top_keywords],
                 title="10 Kata Kunci Terpopuler",
                 labels={'x': 'Kata Kunci', 'y': 'Frekuensi'},
                 color=[k[1] for k in top_keywords]
-            )
+            ), generation)
             st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             st.markdown("**Statistik Kata Kunci:**")
-            st.metric("Total Kata Kunci", len(keyword_counts))
-            st.metric("Kata Kunci Unik", len(set(all_keywords)))
-            st.metric("Rata-rata per Penelitian", round(len(all_keywords)/len(df), 1))
+            st.metric("Total Kata Kunci", aggregates['keyword_occurrences'])
+            st.metric("Kata Kunci Unik", len(keyword_counts))
+            st.metric("Rata-rata per Penelitian", round(aggregates['keyword_occurrences']/aggregates['total'], 1))
     
     # Analisis timeline
     st.markdown('<h3 class="section-header">📅 Timeline Penelitian</h3>', unsafe_allow_html=True)
     
-    if 'tanggal_mulai' in df.columns:
-        # Coba konversi tanggal
-        try:
-            df['tanggal'] = pd.to_datetime(df['tanggal_mulai'])
-            df['bulan_tahun'] = df['tanggal'].dt.to_period('M').astype(str)
-            
-            monthly_counts = df['bulan_tahun'].value_counts().sort_index()
-            
-            fig = px.area(
-                x=monthly_counts.index,
-                y=monthly_counts.values,
-                title="Timeline Penelitian (per Bulan)",
-                labels={'x': 'Bulan-Tahun', 'y': 'Jumlah Penelitian'}
-            )
+    # Bulan sudah terurut; tanggal yang tidak valid dilewati saat agregasi
+    monthly_counts = aggregates['bulan']
+    
+    if monthly_counts:
+        fig = cached_figure("analisis_timeline", lambda: px.area(
+            x=list(monthly_counts.keys()),
+            y=list(monthly_counts.values()),
+            title="Timeline Penelitian (per Bulan)",
+            labels={'x': 'Bulan-Tahun', 'y': 'Jumlah Penelitian'}
+        ), generation)
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("Data tanggal tidak dapat diproses untuk timeline")
+    
+    # Analisis lintas dimensi memakai DataFrame kolumnar yang di-cache per generasi data
+    st.markdown('<h3 class="section-header">🧮 Status dan Bidang per Tahun</h3>', unsafe_allow_html=True)
+    
+    def build_status_per_year():
+        research_df = get_research_frames()['penelitian'].dropna(subset=['tahun'])
+        status_per_year = (
+            research_df.groupby(['tahun', 'status'], observed=True)
+            .size()
+            .reset_index(name='jumlah')
+        )
+        if status_per_year.empty:
+            return None
+        return px.bar(
+            status_per_year,
+            x='tahun',
+            y='jumlah',
+            color='status',
+            title="Status Penelitian per Tahun",
+            labels={'tahun': 'Tahun', 'jumlah': 'Jumlah', 'status': 'Status'}
+        )
+    
+    def build_bidang_per_year():
+        frames = get_research_frames()
+        research_df = frames['penelitian'].dropna(subset=['tahun'])
+        bidang_per_year = (
+            frames['bidang'].merge(research_df[['id', 'tahun']], on='id')
+            .groupby(['tahun', 'bidang'], observed=True)
+            .size()
+            .reset_index(name='jumlah')
+        )
+        if bidang_per_year.empty:
+            return None
+        return px.bar(
+            bidang_per_year,
+            x='tahun',
+            y='jumlah',
+            color='bidang',
+            title="Bidang Ilmu per Tahun",
+            labels={'tahun': 'Tahun', 'jumlah': 'Jumlah', 'bidang': 'Bidang Ilmu'}
+        )
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Agregasi DataFrame ikut di-cache bersama figure
+        fig = cached_figure("analisis_status_per_tahun", build_status_per_year, generation)
+        if fig is not None:
+            st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = cached_figure("analisis_bidang_per_tahun", build_bidang_per_year, generation)
+        if fig is not None:
             st.plotly_chart(fig, use_container_width=True)
-        except:
-            st.info("Data tanggal tidak dapat diproses untuk timeline")
 
+@profiled(category='page')
 def show_settings():
     st.markdown('<h1 class="main-header">⚙️ Pengaturan Aplikasi</h1>', unsafe_allow_html=True)
     
-    tab1, tab2, tab3 = st.tabs(["Pengaturan Umum", "Ekspor/Impor", "Bantuan"])
+    tab1, tab2, tab3, tab4 = st.tabs(["Pengaturan Umum", "Ekspor/Impor", "Bantuan", "Diagnostik"])
     
     with tab1:
         st.markdown("### Konfigurasi Aplikasi")
@@ -526,59 +739,46 @@ def show_settings():
     with tab2:
         st.markdown("### Ekspor Data Penelitian")
         
-        research_data = load_research_data()
+        if count_research():
+            # File ekspor baru dibuat saat diminta dan disimpan per versi data
+            show_export_controls("settings", "research_data")
+        else:
+            st.warning("Tidak ada data untuk diekspor")
         
-        if research_data:
-            # Ekspor sebagai JSON
-            json_data = json.dumps(research_data, indent=2, ensure_ascii=False)
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.download_button(
-                    label="📥 Download Semua Data (JSON)",
-                    data=json_data,
-                    file_name=f"research_data_{datetime.now().strftime('%Y%m%d')}.json",
-                    mime="application/json"
-                )
-            
-            with col2:
-                st.download_button(
-                    label="📊 Download sebagai CSV",
-                    data=pd.DataFrame(research_data).to_csv(index=False),
-                    file_name=f"research_data_{datetime.now().strftime('%Y%m%d')}.csv",
-                    mime="text/csv"
-                )
-            
-            st.markdown("---")
-            st.markdown("### Impor Data")
-            
-            uploaded_file = st.file_uploader("Upload file JSON data penelitian", type=['json'])
+        st.markdown("---")
+        st.markdown("### Impor Data")
+        
+        uploaded_file = st.file_uploader("Upload file data penelitian (JSON atau JSON Lines)", type=['json', 'jsonl'])
+        
+        if uploaded_file is not None:
+            st.info(f"File berhasil diupload: {uploaded_file.size / 1e6:.1f} MB")
             
-            if uploaded_file is not None:
+            if st.button("Gabungkan dengan Data Saat Ini"):
+                progress = st.progress(0.0)
+                status_text = st.empty()
+                
+                def show_import_progress(report):
+                    if report['total_bytes']:
+                        progress.progress(min(report['bytes_read'] / report['total_bytes'], 1.0))
+                    status_text.text(f"{report['read']} entri dibaca, {report['imported']} disimpan "
+                                     f"({report['records_per_sec']:.0f} entri/detik)")
+                
                 try:
-                    imported_data = json.load(uploaded_file)
-                    st.info(f"File berhasil diupload: {len(imported_data)} entri ditemukan")
-                    
-                    if st.button("Gabungkan dengan Data Saat Ini"):
-                        # Gabungkan data
-                        combined_data = research_data + imported_data
-                        # Hapus duplikat berdasarkan ID
-                        unique_data = []
-                        seen_ids = set()
-                        for item in combined_data:
-                            if item['id'] not in seen_ids:
-                                seen_ids.add(item['id'])
-                                unique_data.append(item)
-                        
-                        if save_research_data(unique_data):
-                            st.success(f"Data berhasil digabungkan! Total: {len(unique_data)} entri")
-                        else:
-                            st.error("Gagal menyimpan data gabungan")
+                    # File dibaca dan disimpan bertahap per batch, duplikat id dan
+                    # entri yang hampir sama dengan data yang ada dilewati
+                    report = import_research_stream(uploaded_file, total_bytes=uploaded_file.size,
+                                                    on_progress=show_import_progress)
+                    progress.progress(1.0)
+                    st.success(f"Data berhasil digabungkan! {report['imported']} entri baru, "
+                               f"{report['duplicates']} duplikat dan {report['near_duplicates']} "
+                               f"hampir duplikat dilewati ({report['records_per_sec']:.0f} entri/detik)")
+                    if report['invalid']:
+                        st.warning(f"{report['invalid']} entri tidak valid dilewati")
+                        st.code("\n".join(report['errors']))
+                    if report['aborted']:
+                        st.error(f"Impor berhenti karena file rusak: {report['aborted']}")
                 except Exception as e:
                     st.error(f"Error membaca file: {e}")
-        else:
-            st.warning("Tidak ada data untuk diekspor")
     
     with tab3:
         st.markdown("### Panduan Penggunaan")
@@ -605,11 +805,68 @@ def show_settings():
         st.markdown("---")
         st.markdown("### Informasi Aplikasi")
         
+        store_stats = get_store_stats()
+        figure_stats = get_figure_cache_stats()
         st.code(f"""
         Versi Aplikasi: 1.0.0
-        Jumlah Data: {len(load_research_data())} penelitian
+        Jumlah Data: {count_research()} penelitian
         Update Terakhir: {datetime.now().strftime('%d %B %Y')}
+        Penyimpanan: {store_stats['backend']}
+        Cache Data: {store_stats['hits']} hit / {store_stats['misses']} miss (generasi {store_stats['generation']})
+        Cache Grafik: {figure_stats['hits']} hit / {figure_stats['misses']} miss ({figure_stats['size']}/{figure_stats['max_size']} grafik)
         """)
+    
+    with tab4:
+        show_diagnostics()
+
+def show_diagnostics():
+    st.markdown("### Profiling Kinerja")
+    
+    # Profiling berlaku untuk seluruh proses, bukan hanya sesi ini
+    enabled = st.checkbox("Aktifkan profiling", value=is_profiling_enabled(),
+                          help="Catat waktu setiap halaman, pemanggilan data, indeks, dan grafik")
+    if enabled != is_profiling_enabled():
+        set_profiling(enabled)
+    
+    summary = get_profile_summary()
+    if not summary:
+        st.info("Belum ada data profiling. Aktifkan profiling lalu buka halaman lain untuk mengukurnya.")
+    else:
+        st.caption("Self = waktu span dikurangi span di dalamnya (untuk halaman: render widget)")
+        df = pd.DataFrame(summary)[['name', 'category', 'calls', 'total_ms', 'self_ms', 'mean_ms', 'max_ms']]
+        df.columns = ['Span', 'Kategori', 'Panggilan', 'Total (ms)', 'Self (ms)', 'Rata-rata (ms)', 'Maks (ms)']
+        st.dataframe(df.round(1), use_container_width=True, hide_index=True)
+        
+        counters = get_profile_counters()
+        if counters:
+            cols = st.columns(len(counters))
+            for col, (name, value) in zip(cols, sorted(counters.items())):
+                col.metric(name.replace('_', ' ').title(), f"{value:,}")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="📥 Unduh Trace (Chrome)",
+                data=json.dumps(chrome_trace()),
+                file_name=f"trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                mime="application/json",
+                help="Buka di chrome://tracing atau ui.perfetto.dev"
+            )
+        with col2:
+            if st.button("Reset Profil"):
+                reset_profile()
+                st.rerun()
+    
+    st.markdown("### Cache")
+    store_stats = get_store_stats()
+    figure_stats = get_figure_cache_stats()
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**Store Data**")
+        st.json(store_stats)
+    with col2:
+        st.markdown("**Cache Grafik**")
+        st.json(figure_stats)
 
 if __name__ == "__main__":
     main()
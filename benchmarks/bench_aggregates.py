@@ -0,0 +1,74 @@
+# benchmarks/bench_aggregates.py
+"""Bandingkan hitung ulang statistik dashboard vs agregat terpelihara.
+
+Jalankan dari root repository:
+    python -m benchmarks.bench_aggregates [jumlah_record ...]
+"""
+import random
+import sys
+import time
+from collections import Counter
+
+from utils.aggregates import ResearchAggregates
+
+STATUSES = ["Berjalan", "Selesai", "Dalam Perencanaan"]
+BIDANG = ["Teknologi", "Kesehatan", "Pendidikan", "Pertanian", "Sosial", "Ekonomi", "Lainnya"]
+KEYWORDS = [f"kata{i}" for i in range(2000)]
+
+def _make_records(n, seed=42):
+    rng = random.Random(seed)
+    records = []
+    for i in range(1, n + 1):
+        year = rng.randint(2010, 2025)
+        records.append({
+            'id': i,
+            'status': rng.choice(STATUSES),
+            'tahun': year,
+            'bidang': rng.sample(BIDANG, rng.randint(1, 3)),
+            'kata_kunci': rng.sample(KEYWORDS, rng.randint(2, 6)),
+            'tanggal_mulai': f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        })
+    return records
+
+def _recompute(records):
+    """Perhitungan lama di show_dashboard/show_analysis: loop seluruh record"""
+    status_counts, year_counts, bidang_counts, months = {}, {}, {}, {}
+    all_keywords = []
+    for r in records:
+        status = r.get('status', 'Tidak Diketahui')
+        status_counts[status] = status_counts.get(status, 0) + 1
+        year = r.get('tahun', '')
+        if year:
+            year_counts[year] = year_counts.get(year, 0) + 1
+        for b in r.get('bidang') or []:
+            bidang_counts[b] = bidang_counts.get(b, 0) + 1
+        all_keywords.extend(r.get('kata_kunci') or [])
+        month = str(r.get('tanggal_mulai', ''))[:7]
+        months[month] = months.get(month, 0) + 1
+    return status_counts, year_counts, bidang_counts, Counter(all_keywords), months
+
+def _time(func, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run(sizes=(10_000, 100_000, 1_000_000)):
+    print(f"{'record':>10} {'hitung ulang':>14} {'build awal':>12} {'snapshot':>10} {'add 1':>10}")
+    for n in sizes:
+        records = _make_records(n)
+        recompute = _time(lambda: _recompute(records))
+        aggregates = ResearchAggregates()
+        build = _time(lambda: aggregates.build(records), repeat=1)
+        snapshot = _time(aggregates.snapshot)
+        extra = _make_records(1, seed=n)[0]
+        extra['id'] = n + 1
+        add = _time(lambda: aggregates.add(extra), repeat=1)
+        print(f"{n:>10} {recompute * 1000:>11.1f} ms {build * 1000:>9.1f} ms "
+              f"{snapshot * 1000:>7.2f} ms {add * 1e6:>7.1f} us")
+
+if __name__ == "__main__":
+    sizes = tuple(int(a) for a in sys.argv[1:]) or (10_000, 100_000, 1_000_000)
+    run(sizes)
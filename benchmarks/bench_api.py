@@ -0,0 +1,122 @@
+# benchmarks/bench_api.py
+"""Throughput API baca (api.py) terhadap dataset sintetis, lewat koneksi keep-alive.
+
+Server dijalankan sebagai proses terpisah; klien berjalan di beberapa proses
+agar tidak berbagi GIL dengan server.
+
+Jalankan dari root repository:
+    python -m benchmarks.bench_api [--records 100000] [--clients 4] [--duration 5]
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_dataset
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Skenario: (nama, daftar path yang diminta bergiliran, header tambahan)
+SCENARIOS = [
+    ('halaman_1', ["/api/research?page=1"], {}),
+    ('filter_bervariasi', [f"/api/research?status=Selesai&tahun={y}&page={p}"
+                           for y in range(2010, 2026) for p in (1, 2, 3)], {}),
+    ('teks_gzip', ["/api/research?q=machine+learning", "/api/research?q=kesehatan&page=2"],
+     {'Accept-Encoding': 'gzip'}),
+    ('detail', [f"/api/research/{i}" for i in range(1, 2001, 7)], {}),
+    ('agregat', ["/api/aggregates"], {}),
+]
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _client(port, paths, headers, duration, conditional, results):
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    etags, done, i = {}, 0, 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        request_headers = dict(headers)
+        if conditional and path in etags:
+            request_headers['If-None-Match'] = etags[path]
+        conn.request("GET", path, headers=request_headers)
+        response = conn.getresponse()
+        response.read()
+        if response.status not in (200, 304):
+            raise RuntimeError(f"{path}: HTTP {response.status}")
+        etags[path] = response.getheader('ETag')
+        done += 1
+    conn.close()
+    results.put(done)
+
+def _run_scenario(port, paths, headers, clients, duration, conditional=False):
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_client, args=(port, paths, headers, duration, conditional, results))
+             for _ in range(clients)]
+    for p in procs:
+        p.start()
+    total = sum(results.get() for _ in procs)
+    for p in procs:
+        p.join()
+    return total / duration
+
+def _wait_ready(port, server, timeout=300):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("server API berhenti sebelum siap")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/api/health")
+            health = json.loads(conn.getresponse().read())
+            conn.close()
+            return health
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server API tidak siap")
+
+def run(records=100_000, clients=4, duration=5.0, seed=42):
+    workdir = tempfile.mkdtemp(prefix="bench_api_")
+    server = None
+    try:
+        data_file = os.path.join(workdir, "data", "research_data.json")
+        os.makedirs(os.path.dirname(data_file))
+        write_dataset(data_file, records, seed)
+        port = _free_port()
+        start = time.perf_counter()
+        server = subprocess.Popen([sys.executable, "api.py", "--port", str(port), "--data-file", data_file],
+                                  cwd=APP_DIR, stdout=subprocess.DEVNULL)
+        health = _wait_ready(port, server)
+        print(f"{health['records']} record, server siap dalam {time.perf_counter() - start:.1f}s, "
+              f"{clients} klien keep-alive")
+        for name, paths, headers in SCENARIOS:
+            # Putaran pemanasan mengisi cache respons dan indeks
+            _run_scenario(port, paths, headers, 1, 0.5)
+            rps = _run_scenario(port, paths, headers, clients, duration)
+            print(f"  {name:<20} {rps:>9.0f} req/s")
+        rps = _run_scenario(port, SCENARIOS[1][1], {}, clients, duration, conditional=True)
+        print(f"  {'filter_304':<20} {rps:>9.0f} req/s")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    run(args.records, args.clients, args.duration, args.seed)
@@ -0,0 +1,67 @@
+# benchmarks/bench_backup.py
+"""Benchmark ukuran backup per simpan seiring bertambahnya data.
+
+Jalankan dari root repository:
+    python -m benchmarks.bench_backup
+"""
+import json
+import random
+import shutil
+import tempfile
+
+from utils.backup import backup_changes, restore_generation
+
+def _make_record(i, rng):
+    words = ["analisis", "sistem", "pengaruh", "implementasi", "model", "data",
+             "pendidikan", "kesehatan", "pertanian", "ekonomi", "digital"]
+    return {
+        'id': i,
+        'judul': " ".join(rng.choice(words) for _ in range(6)).title(),
+        'peneliti_utama': f"Peneliti {i}",
+        'tahun': rng.randint(2015, 2025),
+        'status': rng.choice(["Berjalan", "Selesai", "Dalam Perencanaan"]),
+        'abstrak': " ".join(rng.choice(words) for _ in range(60)),
+    }
+
+def run(saves=200, records_per_save=10, initial=1000, seed=42):
+    rng = random.Random(seed)
+    backup_dir = tempfile.mkdtemp(prefix="bench_backup_")
+    try:
+        records = [_make_record(i, rng) for i in range(1, initial + 1)]
+        backup_changes((), records=lambda: records, version="0", backup_dir=backup_dir,
+                       max_generations=None, max_age_days=None, max_bytes=None)
+        next_id = initial + 1
+        rows = []
+        for save in range(1, saves + 1):
+            added = []
+            for _ in range(records_per_save):
+                added.append(_make_record(next_id, rng))
+                next_id += 1
+            records.extend(added)
+            # Seperti save_research_data: delta dari record yang ditulis, tanpa membaca data lama
+            entry = backup_changes(added, record_count=len(records), records=lambda: records,
+                                   base_version=str(save - 1), version=str(save), backup_dir=backup_dir,
+                                   max_generations=None, max_age_days=None, max_bytes=None)
+            full_size = len(json.dumps(records, indent=2, ensure_ascii=False).encode('utf-8'))
+            rows.append((save, len(records), entry['kind'], entry['bytes'], full_size))
+
+        print(f"{'simpan':>6} {'record':>8} {'jenis':>6} {'byte backup':>12} {'byte salinan penuh':>19}")
+        for save, count, kind, size, full_size in rows:
+            if save % 20 == 1 or save == saves:
+                print(f"{save:>6} {count:>8} {kind:>6} {size:>12} {full_size:>19}")
+
+        deltas = [size for _, _, kind, size, _ in rows if kind == 'delta']
+        print(f"\nRata-rata byte per delta: {sum(deltas) / len(deltas):.0f}")
+        print(f"Rata-rata byte per simpan (termasuk backup penuh berkala): "
+              f"{sum(r[3] for r in rows) / len(rows):.0f}")
+        print(f"Salinan penuh terakhir (perilaku lama): {rows[-1][4]} byte")
+
+        last_generation = rows[-1][0] + 1
+        restored = restore_generation(last_generation, backup_dir)
+        assert restored == records, "restore tidak sama dengan data asli"
+        print(f"Restore generasi {last_generation}: {len(restored)} record OK")
+    finally:
+        shutil.rmtree(backup_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    run()
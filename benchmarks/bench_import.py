@@ -0,0 +1,86 @@
+# benchmarks/bench_import.py
+"""Bandingkan impor lama (json.load + gabung + simpan ulang) dengan impor bertahap.
+
+Jalankan dari root repository:
+    python -m benchmarks.bench_import [jumlah_record ...]
+"""
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from utils import data_handler
+from utils.importer import import_research_stream
+
+WORDS = ["analisis", "sistem", "pengaruh", "implementasi", "model", "data",
+         "pendidikan", "kesehatan", "pertanian", "ekonomi", "digital", "masyarakat"]
+
+def _write_export(path, n, seed=42):
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("[\n")
+        for i in range(1, n + 1):
+            record = {
+                'id': i,
+                'judul': " ".join(rng.choice(WORDS) for _ in range(6)).title(),
+                'peneliti_utama': f"Peneliti {i}",
+                'tahun': rng.randint(2015, 2025),
+                'status': rng.choice(["Berjalan", "Selesai", "Dalam Perencanaan"]),
+                'bidang': [rng.choice(["Teknologi", "Kesehatan", "Pendidikan"])],
+                'kata_kunci': rng.sample(WORDS, 3),
+                'abstrak': " ".join(rng.choice(WORDS) for _ in range(80)),
+            }
+            f.write(("," if i > 1 else "") + json.dumps(record, ensure_ascii=False) + "\n")
+        f.write("]\n")
+
+def _old_import(path):
+    research_data = data_handler.load_research_data()
+    with open(path, 'rb') as f:
+        imported_data = json.load(f)
+    unique_data, seen_ids = [], set()
+    for item in research_data + imported_data:
+        if item['id'] not in seen_ids:
+            seen_ids.add(item['id'])
+            unique_data.append(item)
+    data_handler.save_research_data(unique_data)
+    return len(imported_data)
+
+def _stream_import(path):
+    with open(path, 'rb') as f:
+        return import_research_stream(f, total_bytes=os.path.getsize(path))['read']
+
+def _measure(func, path, workdir):
+    data_dir = os.path.join(workdir, "data")
+    shutil.rmtree(data_dir, ignore_errors=True)
+    os.makedirs(data_dir)
+    data_handler.DATA_FILE = os.path.join(data_dir, "research_data.json")
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = func(path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count / elapsed, peak / 1e6
+
+def run(sizes=(10_000, 50_000)):
+    workdir = tempfile.mkdtemp(prefix="bench_import_")
+    try:
+        print(f"{'record':>10} {'ukuran':>9} {'lama':>22} {'bertahap':>22}")
+        for n in sizes:
+            path = os.path.join(workdir, f"export_{n}.json")
+            _write_export(path, n)
+            size = os.path.getsize(path) / 1e6
+            old_rate, old_peak = _measure(_old_import, path, workdir)
+            new_rate, new_peak = _measure(_stream_import, path, workdir)
+            print(f"{n:>10} {size:>6.1f} MB {old_rate:>8.0f} rec/s {old_peak:>6.0f} MB "
+                  f"{new_rate:>8.0f} rec/s {new_peak:>6.0f} MB")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sizes = tuple(int(a) for a in sys.argv[1:]) or (10_000, 50_000)
+    run(sizes)
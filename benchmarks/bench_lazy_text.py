@@ -0,0 +1,80 @@
+# benchmarks/bench_lazy_text.py
+"""Bandingkan store dengan teks panjang di memori vs record ringkas (teks dibaca saat dibutuhkan).
+
+Jalankan dari root repository:
+    python -m benchmarks.bench_lazy_text [jumlah_record ...]
+"""
+import gc
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from utils import data_handler, schema
+
+WORDS = ["analisis", "sistem", "pengaruh", "implementasi", "model", "data",
+         "pendidikan", "kesehatan", "pertanian", "ekonomi", "digital", "masyarakat"]
+
+def _text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+def _records(n, seed=42):
+    rng = random.Random(seed)
+    return [{
+        'id': i,
+        'judul': _text(rng, 6).title(),
+        'peneliti_utama': f"Dr. Peneliti {i}",
+        'institusi': "Universitas Indonesia",
+        'tahun': rng.randint(2015, 2025),
+        'status': rng.choice(["Berjalan", "Selesai", "Dalam Perencanaan"]),
+        'bidang': ["Teknologi"],
+        'abstrak': _text(rng, 150),
+        'latar_belakang': _text(rng, 100),
+        'metodologi': _text(rng, 50),
+        'hasil': _text(rng, 60),
+        'kesimpulan': _text(rng, 40),
+        'kata_kunci': rng.sample(WORDS, 3),
+    } for i in range(1, n + 1)]
+
+def _measure(lazy):
+    schema.LAZY_TEXT_MIN_LENGTH = 512 if lazy else float('inf')
+    data_handler._stores.clear()
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    # Record store (bukan salinan dict dari load_research_data)
+    records = data_handler.query_research()
+    load_time = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    data_handler.search_research("kesehatan")
+    index_time = time.perf_counter() - start
+    ids = random.Random(1).sample(range(1, len(records) + 1), 200)
+    start = time.perf_counter()
+    for research_id in ids:
+        data_handler.get_research_detail(research_id)
+    detail_time = (time.perf_counter() - start) / len(ids)
+    return load_time, memory / len(records), index_time, detail_time
+
+def run(sizes=(10_000, 50_000)):
+    workdir = tempfile.mkdtemp(prefix="bench_lazy_")
+    try:
+        data_handler.DATA_FILE = os.path.join(workdir, "data", "research_data.json")
+        print(f"{'record':>8} {'mode':>8} {'muat':>9} {'memori':>13} {'indeks cari':>12} {'detail':>11}")
+        for n in sizes:
+            data_handler._stores.clear()
+            data_handler.save_research_data(_records(n))
+            for lazy in (False, True):
+                load_time, per_record, index_time, detail_time = _measure(lazy)
+                print(f"{n:>8} {'ringkas' if lazy else 'penuh':>8} {load_time:>8.2f}s "
+                      f"{per_record:>7.0f} B/rec {index_time:>11.2f}s {detail_time * 1e6:>7.1f} us")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sizes = tuple(int(a) for a in sys.argv[1:]) or (10_000, 50_000)
+    run(sizes)
@@ -0,0 +1,75 @@
+# benchmarks/bench_record_memory.py
+"""Ukur memori per record: dict hasil json.load vs ResearchRecord bertipe.
+
+Jalankan dari root repository:
+    python -m benchmarks.bench_record_memory [jumlah_record ...]
+"""
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from utils.schema import coerce_record
+
+WORDS = ["analisis", "sistem", "pengaruh", "implementasi", "model", "data",
+         "pendidikan", "kesehatan", "pertanian", "ekonomi", "digital", "masyarakat"]
+INSTITUSI = [f"Universitas {k}" for k in ("Indonesia", "Gadjah Mada", "Airlangga", "Brawijaya",
+                                           "Diponegoro", "Hasanuddin", "Padjadjaran", "Andalas")]
+
+def _make_json(n, seed=42):
+    rng = random.Random(seed)
+    records = []
+    for i in range(1, n + 1):
+        year = rng.randint(2015, 2025)
+        records.append({
+            'id': i,
+            'judul': " ".join(rng.choice(WORDS) for _ in range(6)).title(),
+            'peneliti_utama': f"Dr. Peneliti {i}",
+            'institusi': rng.choice(INSTITUSI),
+            'tahun': str(year) if rng.random() < 0.3 else year,
+            'status': rng.choice(["Berjalan", "Selesai", "Dalam Perencanaan"]),
+            'tanggal_mulai': f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'tanggal_selesai': None,
+            'bidang': rng.sample(["Teknologi", "Kesehatan", "Pendidikan", "Pertanian"], 2),
+            'sumber_dana': rng.choice(["DIKTI", "LPDP", "Mandiri"]),
+            'abstrak': " ".join(rng.choice(WORDS) for _ in range(60)),
+            'latar_belakang': "",
+            'metodologi': "Kuantitatif",
+            'hasil': "",
+            'kesimpulan': "",
+            'link_publikasi': "",
+            'kata_kunci': rng.sample(WORDS, 3),
+            'tanggal_input': f"{year}-01-01 10:00:00",
+        })
+    return json.dumps(records)
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+def run(sizes=(10_000, 100_000)):
+    print(f"{'record':>10} {'dict':>14} {'ResearchRecord':>16} {'hemat':>7} {'waktu koersi':>14}")
+    for n in sizes:
+        text = _make_json(n)
+        dicts, dict_bytes, _ = _measure(lambda: json.loads(text))
+        del dicts
+        typed, typed_bytes, _ = _measure(lambda: [coerce_record(r) for r in json.loads(text)])
+        del typed
+        raw = json.loads(text)
+        start = time.perf_counter()
+        [coerce_record(r) for r in raw]
+        coerce_time = time.perf_counter() - start
+        print(f"{n:>10} {dict_bytes / n:>9.0f} B/rec {typed_bytes / n:>11.0f} B/rec "
+              f"{1 - typed_bytes / dict_bytes:>6.0%} {coerce_time * 1e6 / n:>8.1f} us/rec")
+
+if __name__ == "__main__":
+    sizes = tuple(int(a) for a in sys.argv[1:]) or (10_000, 100_000)
+    run(sizes)
@@ -0,0 +1,236 @@
+# benchmarks/bench_suite.py
+"""Benchmark menyeluruh lapisan data dan halaman aplikasi dengan data sintetis.
+
+Mengukur muat/simpan, filter daftar penelitian, agregat dashboard/analisis,
+impor/ekspor, dan (opsional) waktu render halaman lewat Streamlit AppTest
+secara headless. Hasil ditulis sebagai laporan JSON; dengan --baseline
+laporan dibandingkan dengan laporan sebelumnya dan keluar dengan kode 1
+jika ada metrik yang melambat melebihi toleransi.
+
+Jalankan dari root repository:
+    python -m benchmarks.bench_suite --sizes 1000 10000 100000 --output bench_report.json
+    python -m benchmarks.bench_suite --sizes 10000 --baseline bench_report.json
+"""
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import write_dataset
+from utils import data_handler
+from utils.exporter import export_research
+from utils.importer import import_research_stream
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+PAGES = ["🏠 Dashboard", "🔍 Lihat Penelitian", "📊 Analisis", "⚙️ Pengaturan"]
+
+# Filter yang sama dengan kombinasi di halaman Lihat Penelitian
+LIST_FILTERS = {
+    'filter_status': {'status': "Selesai"},
+    'filter_tahun': {'tahun': 2020},
+    'filter_teks': {'text': "machine learning"},
+    'filter_gabungan': {'status': "Berjalan", 'tahun': 2018, 'text': "kesehatan"},
+    'urut_tanggal': {'sort_by': 'tanggal_mulai', 'descending': True},
+}
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+def _best(func, repeat=3):
+    return min(_timed(func)[1] for _ in range(repeat))
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux melaporkan KB, macOS byte
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+def _reset_caches():
+    """Lupakan store di memori sehingga pembacaan berikutnya dingin"""
+    data_handler._stores.clear()
+    data_handler._sqlite_storages.clear()
+    data_handler._frames_cache.clear()
+    data_handler._sqlite_text_indexes.clear()
+    gc.collect()
+
+def _bench_data_layer(metrics, n):
+    _reset_caches()
+    records, metrics['muat_dingin'] = _timed(data_handler.load_research_data)
+    assert len(records) == n, f"jumlah record {len(records)} != {n}"
+    metrics['muat_hangat'] = _best(data_handler.load_research_data)
+
+    for name, filters in LIST_FILTERS.items():
+        query = lambda: data_handler.query_research_page(page=1, page_size=20, **filters)
+        metrics[name + '_pertama'] = _timed(query)[1]
+        metrics[name] = _best(query)
+
+    # Rerun dengan state sesi: hanya halaman yang berubah, filter dan urutan dipakai ulang
+    state = {}
+    session_query = lambda: data_handler.query_research_page(page=2, page_size=20, sort_by='tanggal_mulai',
+                                                             state=state, **LIST_FILTERS['filter_gabungan'])
+    metrics['filter_sesi_pertama'] = _timed(session_query)[1]
+    metrics['filter_sesi'] = _best(session_query)
+
+    metrics['agregat_pertama'] = _timed(data_handler.get_research_aggregates)[1]
+    metrics['agregat'] = _best(data_handler.get_research_aggregates)
+    metrics['hitung_per_status'] = _best(lambda: data_handler.count_research_by('status'))
+    metrics['terbaru_5'] = _best(lambda: data_handler.latest_research(5))
+    metrics['facet_kata_kunci_pertama'] = _timed(lambda: data_handler.get_facet_counts('kata_kunci', limit=10))[1]
+    metrics['facet_kata_kunci'] = _best(lambda: data_handler.get_facet_counts('kata_kunci', limit=10))
+    metrics['saran_kata_kunci'] = _best(lambda: data_handler.suggest_terms('kata_kunci', "an"))
+    metrics['frame_analisis_pertama'] = _timed(data_handler.get_research_frames)[1]
+    metrics['frame_analisis'] = _best(data_handler.get_research_frames)
+    metrics['serupa_pertama'] = _timed(lambda: data_handler.get_similar_research(1))[1]
+    metrics['serupa'] = _best(lambda: data_handler.get_similar_research(n // 2))
+    probe = {'judul': "Analisis Kebijakan Pendidikan Digital", 'abstrak': "Penelitian ini mengevaluasi kebijakan."}
+    metrics['hampir_duplikat_pertama'] = _timed(lambda: data_handler.find_near_duplicates(probe))[1]
+    metrics['hampir_duplikat'] = _best(lambda: data_handler.find_near_duplicates(probe))
+
+    appended = 20
+    start = time.perf_counter()
+    for i in range(appended):
+        data_handler.append_research_data({'judul': f"Benchmark tambah {i}", 'status': "Berjalan"})
+    metrics['tambah_satu'] = (time.perf_counter() - start) / appended
+
+    records = data_handler.load_research_data()
+    metrics['simpan'] = _timed(lambda: data_handler.save_research_data(records))[1]
+    del records
+
+    for fmt in ('json', 'csv', 'xlsx'):
+        if fmt == 'xlsx' and n > 100_000:
+            continue
+        metrics[f'ekspor_{fmt}'] = _timed(lambda: export_research(fmt))[1]
+    metrics['ekspor_json_cache'] = _best(lambda: export_research('json'))
+
+def _bench_import(metrics, n, seed, workdir):
+    source = os.path.join(workdir, "impor.jsonl")
+    write_dataset(source, n, seed + 1, fmt='jsonl')
+    data_handler.DATA_FILE = os.path.join(workdir, "impor", "research_data.json")
+    data_handler.DB_FILE = os.path.join(workdir, "impor", "research_data.db")
+    os.makedirs(os.path.dirname(data_handler.DATA_FILE), exist_ok=True)
+    _reset_caches()
+    with open(source, 'rb') as f:
+        report, metrics['impor'] = _timed(lambda: import_research_stream(f, total_bytes=os.path.getsize(source)))
+    metrics['impor_record_per_detik'] = report['records_per_sec']
+
+def _bench_pages(metrics):
+    """Waktu render halaman (run pertama dan rerun) lewat AppTest"""
+    from streamlit.testing.v1 import AppTest
+    for page in PAGES:
+        key = "halaman_" + page.split(" ", 1)[1].lower().replace(" ", "_")
+        at = AppTest.from_file(APP_PATH, default_timeout=600).run()
+        start = time.perf_counter()
+        at.sidebar.radio[0].set_value(page).run()
+        metrics[key + '_pertama'] = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{page}: {at.exception[0].value}")
+        metrics[key] = _best(at.run)
+
+def run_size(n, seed=42, backend='json', apptest=True):
+    """Jalankan semua benchmark untuk satu ukuran data, kembalikan dict metrik (detik)"""
+    workdir = tempfile.mkdtemp(prefix="bench_suite_")
+    metrics = {}
+    old_paths = (data_handler.DATA_FILE, data_handler.DB_FILE, data_handler.STORAGE_BACKEND)
+    try:
+        data_handler.STORAGE_BACKEND = backend
+        data_handler.DATA_FILE = os.path.join(workdir, "data", "research_data.json")
+        data_handler.DB_FILE = os.path.join(workdir, "data", "research_data.db")
+        os.makedirs(os.path.dirname(data_handler.DATA_FILE))
+        metrics['generate'] = _timed(lambda: write_dataset(data_handler.DATA_FILE, n, seed))[1]
+        if backend == 'sqlite':
+            _reset_caches()
+            metrics['migrasi_sqlite'] = _timed(data_handler._sqlite_backend)[1]
+        _bench_data_layer(metrics, n)
+        if apptest:
+            _bench_pages(metrics)
+        _bench_import(metrics, n, seed, workdir)
+    finally:
+        data_handler.DATA_FILE, data_handler.DB_FILE, data_handler.STORAGE_BACKEND = old_paths
+        _reset_caches()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return metrics
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(APP_PATH), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(report, baseline, tolerance):
+    """Daftar (ukuran, metrik, lama, baru) yang melambat lebih dari toleransi"""
+    previous = {(r['size'], r['backend']): r['metrics'] for r in baseline['results']}
+    regressions = []
+    for result in report['results']:
+        old = previous.get((result['size'], result['backend']), {})
+        for name, value in result['metrics'].items():
+            # Metrik sangat cepat terlalu berisik untuk dibandingkan
+            if name.endswith('_per_detik') or name not in old or old[name] < 0.001:
+                continue
+            if value > old[name] * (1 + tolerance):
+                regressions.append((result['size'], name, old[name], value))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark lapisan data dan halaman aplikasi")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--backend", choices=("json", "sqlite"), default="json")
+    parser.add_argument("--apptest-max", type=int, default=100_000,
+                        help="ukuran data terbesar yang halaman-halamannya diukur lewat AppTest")
+    parser.add_argument("--no-apptest", action="store_true")
+    parser.add_argument("--output", default="bench_report.json")
+    parser.add_argument("--baseline", help="laporan JSON sebelumnya untuk deteksi regresi")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': args.seed,
+        },
+        'results': [],
+    }
+    for n in args.sizes:
+        apptest = not args.no_apptest and n <= args.apptest_max
+        print(f"== {n} record ({args.backend}{', AppTest' if apptest else ''})", flush=True)
+        metrics = run_size(n, args.seed, args.backend, apptest)
+        for name, value in metrics.items():
+            unit = "rec/s" if name.endswith('_per_detik') else "ms"
+            print(f"  {name:<34} {value if unit == 'rec/s' else value * 1000:>12.1f} {unit}")
+        report['results'].append({'size': n, 'backend': args.backend, 'metrics': metrics,
+                                  'peak_rss_mb': _peak_rss_mb()})
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Laporan ditulis ke {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for size, name, old, new in regressions:
+            print(f"REGRESI {size} record {name}: {old * 1000:.1f} ms -> {new * 1000:.1f} ms")
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+# benchmarks/synthetic.py
+"""Generator data penelitian sintetis yang deterministik (seed) untuk benchmark.
+
+Record dibuat satu per satu sehingga dataset 1 juta record bisa ditulis ke
+disk tanpa ditahan di memori:
+    python -m benchmarks.synthetic 100000 data_sintetis.json [--seed 42] [--format jsonl]
+"""
+import argparse
+import bisect
+import itertools
+import json
+import random
+from datetime import date, timedelta
+
+TOPIK = ["Pengaruh", "Analisis", "Implementasi", "Evaluasi", "Pengembangan", "Optimalisasi",
+         "Studi Komparatif", "Rancang Bangun", "Efektivitas", "Peran", "Strategi", "Model"]
+OBJEK = ["Machine Learning", "Internet of Things", "Pembelajaran Daring", "Pupuk Organik",
+         "Kebijakan Fiskal", "Layanan Kesehatan Primer", "UMKM Digital", "Energi Surya",
+         "Sistem Informasi Desa", "Irigasi Tetes", "Literasi Keuangan", "Vaksinasi Anak",
+         "Blockchain", "Bank Sampah", "Ekowisata", "Telemedisin", "Padi Varietas Unggul",
+         "Kurikulum Merdeka", "Transportasi Publik", "Kualitas Air Sungai"]
+KONTEKS = ["terhadap Produktivitas Petani", "pada Siswa Sekolah Dasar", "di Wilayah Pesisir",
+           "dalam Diagnosis Penyakit", "bagi Pelaku Usaha Mikro", "di Kawasan Perkotaan",
+           "pada Masyarakat Adat", "untuk Mitigasi Bencana", "di Puskesmas", "pada Era Pandemi"]
+LOKASI = ["Jawa Barat", "Jawa Timur", "Sumatera Utara", "Sulawesi Selatan", "Bali", "Papua",
+          "Kalimantan Timur", "Nusa Tenggara Timur", "DI Yogyakarta", "Aceh", "Maluku", "Riau"]
+NAMA_DEPAN = ["Ahmad", "Siti", "Budi", "Dewi", "Rizki", "Putri", "Agus", "Ratna", "Hendra",
+              "Nur", "Fajar", "Indah", "Wahyu", "Sri", "Eko", "Lestari", "Dimas", "Ayu"]
+NAMA_BELAKANG = ["Santoso", "Rahmawati", "Wijaya", "Hidayat", "Saputra", "Lestari", "Nugroho",
+                 "Kusuma", "Pratama", "Siregar", "Hasibuan", "Wibowo", "Sulistyo", "Harahap"]
+GELAR = ["Dr.", "Prof. Dr.", "", "Ir.", "dr."]
+INSTITUSI = ["Universitas Indonesia", "Universitas Gadjah Mada", "Institut Teknologi Bandung",
+             "Institut Pertanian Bogor", "Universitas Airlangga", "Universitas Brawijaya",
+             "Universitas Diponegoro", "Universitas Hasanuddin", "Universitas Padjadjaran",
+             "Universitas Andalas", "Universitas Sumatera Utara", "Universitas Udayana",
+             "BRIN", "Universitas Sebelas Maret", "Universitas Negeri Malang", "Politeknik Negeri Jakarta"]
+STATUS = ["Selesai", "Berjalan", "Dalam Perencanaan"]
+STATUS_BOBOT = [0.55, 0.35, 0.10]
+BIDANG = ["Teknologi", "Kesehatan", "Pendidikan", "Pertanian", "Sosial", "Ekonomi", "Lainnya"]
+BIDANG_BOBOT = [0.28, 0.2, 0.17, 0.13, 0.1, 0.08, 0.04]
+SUMBER_DANA = ["DIKTI", "LPDP", "BRIN", "Mandiri", "Swasta", "Hibah Internasional", "Pemerintah Daerah"]
+METODE = ["Kuantitatif dengan survei", "Kualitatif dengan wawancara mendalam", "Eksperimen lapangan",
+          "Studi kasus", "Mixed methods", "Systematic literature review", "Design science research"]
+KATA = ["data", "sistem", "masyarakat", "model", "hasil", "penelitian", "metode", "analisis",
+        "pengaruh", "faktor", "signifikan", "sampel", "responden", "kinerja", "kualitas",
+        "produktivitas", "teknologi", "kebijakan", "lingkungan", "pendidikan", "kesehatan",
+        "ekonomi", "digital", "daerah", "peningkatan", "penerapan", "pengembangan", "evaluasi"]
+# Kosakata kata kunci dengan frekuensi mengikuti distribusi Zipf
+KATA_KUNCI = sorted({o.lower() for o in OBJEK} | {k for k in KATA if len(k) > 5}
+                    | {f"{a} {b}" for a, b in itertools.product(["sistem", "model", "analisis"],
+                                                                ["prediksi", "spasial", "risiko", "kebijakan"])})
+
+def _cumulative(weights):
+    return list(itertools.accumulate(weights))
+
+_ZIPF = _cumulative([1 / (rank + 1) for rank in range(len(KATA_KUNCI))])
+_INSTITUSI_ZIPF = _cumulative([1 / (rank + 1) ** 0.8 for rank in range(len(INSTITUSI))])
+
+def _pick(rng, items, cumulative):
+    return items[bisect.bisect(cumulative, rng.random() * cumulative[-1])]
+
+def _kalimat(rng, words):
+    text = " ".join(rng.choices(KATA, k=words))
+    return text[0].upper() + text[1:] + "."
+
+# Jumlah kalimat acak yang dibuat sekali per generator lalu dirangkai menjadi paragraf
+SENTENCE_POOL_SIZE = 4096
+
+def sentence_pool(rng, size=SENTENCE_POOL_SIZE):
+    return [_kalimat(rng, rng.randint(8, 20)) for _ in range(size)]
+
+def generate_record(rng, record_id, pool=None):
+    """Satu record sintetis dengan struktur sama seperti hasil form input"""
+    pool = pool or sentence_pool(rng, 64)
+    
+    def paragraf(sentences):
+        return " ".join(rng.choices(pool, k=sentences))
+    
+    tahun = rng.randint(2010, 2025)
+    mulai = date(tahun, 1, 1) + timedelta(days=rng.randint(0, 364))
+    status = rng.choices(STATUS, STATUS_BOBOT)[0]
+    selesai = mulai + timedelta(days=rng.randint(90, 900)) if status == "Selesai" else None
+    bidang, jumlah_bidang = [], rng.choice((1, 1, 2, 2, 3))
+    while len(bidang) < jumlah_bidang:
+        pilihan = rng.choices(BIDANG, BIDANG_BOBOT)[0]
+        if pilihan not in bidang:
+            bidang.append(pilihan)
+    kata_kunci, jumlah_kata_kunci = [], rng.randint(3, 6)
+    while len(kata_kunci) < jumlah_kata_kunci:
+        pilihan = _pick(rng, KATA_KUNCI, _ZIPF)
+        if pilihan not in kata_kunci:
+            kata_kunci.append(pilihan)
+    gelar = rng.choice(GELAR)
+    nama = f"{rng.choice(NAMA_DEPAN)} {rng.choice(NAMA_BELAKANG)}"
+    return {
+        'id': record_id,
+        'judul': f"{rng.choice(TOPIK)} {rng.choice(OBJEK)} {rng.choice(KONTEKS)} di {rng.choice(LOKASI)}",
+        'peneliti_utama': f"{gelar} {nama}".strip(),
+        'institusi': _pick(rng, INSTITUSI, _INSTITUSI_ZIPF),
+        'tahun': tahun,
+        'status': status,
+        'tanggal_mulai': mulai.isoformat(),
+        'tanggal_selesai': selesai.isoformat() if selesai else None,
+        'bidang': bidang,
+        'sumber_dana': rng.choice(SUMBER_DANA),
+        'abstrak': paragraf(rng.randint(5, 10)),
+        'latar_belakang': paragraf(rng.randint(2, 6)),
+        'metodologi': f"{rng.choice(METODE)}. {paragraf(rng.randint(1, 3))}",
+        'hasil': paragraf(rng.randint(1, 4)) if status == "Selesai" else "",
+        'kesimpulan': paragraf(rng.randint(1, 2)) if status == "Selesai" else "",
+        'link_publikasi': f"https://jurnal.example.ac.id/artikel/{record_id}" if rng.random() < 0.4 else "",
+        'kata_kunci': kata_kunci,
+        'tanggal_input': f"{mulai.isoformat()} {rng.randint(7, 20):02d}:{rng.randint(0, 59):02d}:00",
+    }
+
+def generate_records(n, seed=42, start_id=1):
+    """Iterator n record sintetis; seed yang sama selalu menghasilkan data yang sama"""
+    rng = random.Random(seed)
+    pool = sentence_pool(rng)
+    for record_id in range(start_id, start_id + n):
+        yield generate_record(rng, record_id, pool)
+
+def write_dataset(path, n, seed=42, fmt='json'):
+    """Tulis dataset sintetis ke file secara bertahap.
+
+    fmt 'json' menghasilkan array dengan format yang sama seperti file data
+    aplikasi (indent 2), 'jsonl' satu record per baris.
+    """
+    indented = json.JSONEncoder(indent=2, ensure_ascii=False)
+    compact = json.JSONEncoder(ensure_ascii=False)
+    with open(path, 'w', encoding='utf-8') as f:
+        if fmt == 'jsonl':
+            for record in generate_records(n, seed):
+                f.write(compact.encode(record) + "\n")
+            return
+        if not n:
+            f.write("[]")
+            return
+        for i, record in enumerate(generate_records(n, seed)):
+            f.write((",\n  " if i else "[\n  ") + indented.encode(record).replace("\n", "\n  "))
+        f.write("\n]")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("count", type=int)
+    parser.add_argument("path")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--format", choices=("json", "jsonl"), default="json")
+    args = parser.parse_args()
+    write_dataset(args.path, args.count, args.seed, args.format)
@@ -0,0 +1,128 @@
+# tests/test_data_handler.py
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from utils import data_handler
+from utils.backup import list_backups, restore_generation
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def data_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "research_data.json")
+    monkeypatch.setattr(data_handler, 'DATA_FILE', path)
+    monkeypatch.setattr(data_handler, 'STORAGE_BACKEND', 'json')
+    monkeypatch.setattr(data_handler, 'SHARD_BY', None)
+    data_handler._stores.clear()
+    yield path
+    data_handler._stores.clear()
+
+
+def _outside_append(path, judul):
+    """Tambah record dari proses lain (file lock dan journal yang sama)"""
+    script = ("import sys; from utils import data_handler as dh; dh.DATA_FILE = sys.argv[1]; "
+              "sys.exit(0 if dh.append_research_data({'judul': sys.argv[2]}) else 1)")
+    subprocess.run([sys.executable, "-c", script, path, judul], cwd=ROOT, check=True)
+
+
+def _titles(records):
+    return [r['judul'] for r in records]
+
+
+def _on_disk(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_append_compact_reload(data_file):
+    assert data_handler.save_research_data([{'id': 1, 'judul': "Awal"}])
+    for i in range(3):
+        assert data_handler.append_research_data({'judul': f"Tambah {i}"})
+    journal = data_handler._get_store().journal_path
+    assert os.path.exists(journal)
+
+    assert data_handler.compact_research_data()
+    assert not os.path.exists(journal)
+    assert _titles(_on_disk(data_file)) == ["Awal", "Tambah 0", "Tambah 1", "Tambah 2"]
+
+    # Muat ulang dingin dari snapshot hasil pemadatan
+    data_handler._stores.clear()
+    records = data_handler.load_research_data()
+    assert _titles(records) == ["Awal", "Tambah 0", "Tambah 1", "Tambah 2"]
+    assert len({r['id'] for r in records}) == 4
+
+
+def test_background_compaction(data_file, monkeypatch):
+    monkeypatch.setattr(data_handler, 'JOURNAL_COMPACT_THRESHOLD', 5)
+    for i in range(5):
+        assert data_handler.append_research_data({'judul': f"Tambah {i}"})
+
+    store = data_handler._get_store()
+    deadline = time.time() + 10
+    while (store.compacting or os.path.exists(store.journal_path)) and time.time() < deadline:
+        time.sleep(0.01)
+    assert not os.path.exists(store.journal_path)
+    assert _titles(_on_disk(data_file)) == [f"Tambah {i}" for i in range(5)]
+    assert _titles(data_handler.load_research_data()) == [f"Tambah {i}" for i in range(5)]
+
+
+def test_reload_after_outside_write(data_file):
+    assert data_handler.save_research_data([{'id': 1, 'judul': "Awal"}])
+    assert _titles(data_handler.load_research_data()) == ["Awal"]
+    version = data_handler.get_data_version()
+
+    _outside_append(data_file, "Dari proses lain")
+
+    assert data_handler.get_data_version() != version
+    assert _titles(data_handler.load_research_data()) == ["Awal", "Dari proses lain"]
+
+
+def test_conflicting_save_merges_other_writer(data_file):
+    assert data_handler.save_research_data([{'id': 1, 'judul': "Awal"}])
+    version = data_handler.get_data_version()
+    data = data_handler.load_research_data()
+
+    # Penulis lain menambah record setelah versi dibaca
+    _outside_append(data_file, "Dari proses lain")
+
+    data[0]['judul'] = "Awal diubah"
+    data.append({'id': data_handler.allocate_research_id(), 'judul': "Baru"})
+    assert data_handler.save_research_data(data, expected_version=version)
+
+    titles = _titles(_on_disk(data_file))
+    assert sorted(titles) == ["Awal diubah", "Baru", "Dari proses lain"]
+    ids = [r['id'] for r in _on_disk(data_file)]
+    assert len(set(ids)) == len(ids)
+
+
+def test_backup_restore_round_trip(data_file):
+    # Abstrak panjang agar perubahan kecil berikutnya ditulis sebagai delta
+    assert data_handler.save_research_data([{'id': 1, 'judul': "Satu", 'abstrak': "kata " * 500},
+                                            {'id': 2, 'judul': "Dua"}])
+    first = _on_disk(data_file)
+
+    data = data_handler.load_research_data()
+    data[0]['judul'] = "Satu diubah"
+    del data[1]
+    data.append({'id': 3, 'judul': "Tiga"})
+    assert data_handler.save_research_data(data)
+    second = _on_disk(data_file)
+    assert data_handler.append_research_data({'judul': "Empat"})
+    assert data_handler.compact_research_data()
+    last = _on_disk(data_file)
+
+    backup_dir = os.path.join(os.path.dirname(data_file), "backups")
+    entries = list_backups(backup_dir)
+    assert [e['kind'] for e in entries[:2]] == ['full', 'delta']
+    assert restore_generation(entries[0]['generation'], backup_dir) == first
+    assert restore_generation(entries[1]['generation'], backup_dir) == second
+    assert restore_generation(entries[-1]['generation'], backup_dir) == last
+    assert _titles(last) == ["Satu diubah", "Tiga", "Empat"]
+    with pytest.raises(ValueError):
+        restore_generation(entries[-1]['generation'] + 1, backup_dir)
@@ -0,0 +1,37 @@
+# tests/test_facets.py
+from utils.facets import FacetIndex
+
+
+def _index(records):
+    index = FacetIndex('kata_kunci')
+    index.build(records)
+    return index
+
+
+def test_rename_keyword_releases_old_spelling():
+    index = _index([
+        {'id': 1, 'kata_kunci': ['Machine Learning', 'AI']},
+        {'id': 2, 'kata_kunci': ['machine-learning']},
+    ])
+
+    # Record 1 diubah: "Machine Learning" diganti "Deep Learning"
+    index.add({'id': 1, 'kata_kunci': ['Deep Learning', 'AI']})
+
+    assert dict(index.most_common()) == {'machine-learning': 1, 'AI': 1, 'Deep Learning': 1}
+    dictionary = index.dictionary
+    ml = dictionary.lookup('machine learning')
+    assert dict(dictionary.spellings[ml]) == {'machine-learning': 1}
+    assert dict(dictionary.spellings[dictionary.lookup('ai')]) == {'AI': 1}
+    assert dict(dictionary.spellings[dictionary.lookup('deep learning')]) == {'Deep Learning': 1}
+
+
+def test_remove_uses_stored_record():
+    index = _index([{'id': 1, 'kata_kunci': ['AI']}, {'id': 2, 'kata_kunci': ['ai']}])
+
+    # Pemanggil hanya membawa id (misalnya record versi baru)
+    index.remove({'id': 1, 'kata_kunci': ['Lain']})
+
+    assert index.most_common() == [('ai', 1)]
+    assert dict(index.dictionary.spellings[index.dictionary.lookup('AI')]) == {'ai': 1}
+    assert index.dictionary.lookup('Lain') is None
+    assert index.count_ids([1, 2]).tolist() == [1]
@@ -0,0 +1,21 @@
+# tests/test_sqlite_store.py
+import pytest
+
+from utils.sqlite_store import SqliteStorage
+
+
+def test_replace_all_normalizes_ids(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "research.db"))
+    storage.replace_all([{'id': "7", 'judul': "A"}, {'judul': "B"}, {'id': 8.0, 'judul': "C"}])
+
+    # Record tanpa id mendapat id setelah semua id yang ditulis, tidak menimpa "C"
+    assert sorted((r['id'], r['judul']) for r in storage.load_all()) == [(7, "A"), (8, "C"), (9, "B")]
+
+
+def test_replace_all_rejects_invalid_ids_before_writing(tmp_path):
+    storage = SqliteStorage(str(tmp_path / "research.db"))
+    storage.replace_all([{'id': 1, 'judul': "Lama"}])
+
+    with pytest.raises(ValueError, match="'abc'"):
+        storage.replace_all([{'id': 2, 'judul': "Baru"}, {'id': "abc", 'judul': "Salah"}])
+    assert [r['judul'] for r in storage.load_all()] == ["Lama"]
@@ -0,0 +1,103 @@
+# utils/aggregates.py
+import re
+from collections import Counter
+from utils.field_index import normalize_value
+
+UNKNOWN_STATUS = 'Tidak Diketahui'
+
+_MONTH_RE = re.compile(r"^(\d{4})-(\d{1,2})")
+
+def month_key(value):
+    """Kunci bulan 'YYYY-MM' dari tanggal ISO, None jika tidak bisa dibaca"""
+    if not value:
+        return None
+    match = _MONTH_RE.match(str(value))
+    if not match:
+        return None
+    month = int(match.group(2))
+    if not 1 <= month <= 12:
+        return None
+    return f"{match.group(1)}-{month:02d}"
+
+class ResearchAggregates:
+    """Statistik agregat data penelitian yang diperbarui secara inkremental.
+
+    Menyimpan jumlah per status, tahun, bidang, kata kunci, dan bulan mulai
+    sehingga dashboard cukup membaca bucket tanpa memindai seluruh record.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.status = Counter()
+        self.tahun = Counter()
+        self.bidang = Counter()
+        self.kata_kunci = Counter()
+        self.bulan = Counter()
+        self.keyword_occurrences = 0
+
+    def build(self, records):
+        self.__init__()
+        self.total = len(records)
+        self.status.update(r.get('status', UNKNOWN_STATUS) for r in records)
+        years = (normalize_value('tahun', r.get('tahun', '')) for r in records)
+        self.tahun.update(y for y in years if y)
+        self.bidang.update(b for r in records for b in r.get('bidang') or [])
+        keywords = [k for r in records for k in r.get('kata_kunci') or []]
+        self.kata_kunci.update(keywords)
+        self.keyword_occurrences = len(keywords)
+        months = (month_key(r.get('tanggal_mulai')) for r in records)
+        self.bulan.update(m for m in months if m)
+
+    @staticmethod
+    def _bump(counter, key, sign):
+        counter[key] += sign
+        if counter[key] <= 0:
+            # Buang bucket yang sudah kosong
+            del counter[key]
+
+    def _apply(self, record, sign):
+        self.total += sign
+        self._bump(self.status, record.get('status', UNKNOWN_STATUS), sign)
+        year = normalize_value('tahun', record.get('tahun', ''))
+        if year:
+            self._bump(self.tahun, year, sign)
+        for bidang in record.get('bidang') or []:
+            self._bump(self.bidang, bidang, sign)
+        keywords = record.get('kata_kunci') or []
+        for keyword in keywords:
+            self._bump(self.kata_kunci, keyword, sign)
+        self.keyword_occurrences += sign * len(keywords)
+        month = month_key(record.get('tanggal_mulai'))
+        if month:
+            self._bump(self.bulan, month, sign)
+
+    def add(self, record):
+        self._apply(record, 1)
+
+    def remove(self, record):
+        self._apply(record, -1)
+
+    def snapshot(self):
+        """Salinan agregat dalam bentuk dict biasa"""
+        return {
+            'total': self.total,
+            'status': dict(self.status),
+            'tahun': dict(self.tahun),
+            'bidang': dict(self.bidang),
+            'kata_kunci': Counter(self.kata_kunci),
+            'bulan': dict(sorted(self.bulan.items())),
+            'keyword_occurrences': self.keyword_occurrences,
+        }
+
+def merge_snapshots(snapshots):
+    """Gabungkan snapshot agregat beberapa shard menjadi satu snapshot"""
+    merged = ResearchAggregates()
+    for snapshot in snapshots:
+        merged.total += snapshot['total']
+        merged.status.update(snapshot['status'])
+        merged.tahun.update(snapshot['tahun'])
+        merged.bidang.update(snapshot['bidang'])
+        merged.kata_kunci.update(snapshot['kata_kunci'])
+        merged.bulan.update(snapshot['bulan'])
+        merged.keyword_occurrences += snapshot['keyword_occurrences']
+    return merged.snapshot()
@@ -0,0 +1,278 @@
+# utils/attachments.py
+import hashlib
+import mimetypes
+import mmap
+import os
+import queue
+import re
+import tempfile
+import threading
+import zipfile
+import zlib
+from xml.etree.ElementTree import iterparse
+from utils import data_handler
+from utils.profiler import profiled
+
+# Ukuran potongan baca/tulis blob
+ATTACHMENT_CHUNK_SIZE = 1 << 20
+
+# Batas teks hasil ekstraksi per dokumen (karakter) yang dimasukkan ke pencarian
+MAX_EXTRACTED_CHARS = 200_000
+
+# Batas ukuran satu stream PDF yang didekompresi oleh ekstraktor bawaan
+MAX_PDF_STREAM_BYTES = 8 << 20
+
+DOCX_MIME = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+_DIGEST_RE = re.compile(r"^[0-9a-f]{64}$")
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_PDF_STREAM_RE = re.compile(rb"stream\r?\n")
+_PDF_TEXT_RE = re.compile(rb"\((?:\\.|[^\\)])*\)\s*Tj|\[(?:\\.|[^\]])*\]\s*TJ|T\*|Td|TD|ET")
+# Elemen string atau jarak (kerning) di operator TJ
+_PDF_STRING_RE = re.compile(rb"\(((?:\\.|[^\\)])*)\)|(-?\d+(?:\.\d*)?)")
+_PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_extract_queue = queue.Queue()
+_extract_worker = None
+_extract_lock = threading.Lock()
+
+def _attachment_dir():
+    return os.path.join(os.path.dirname(data_handler.DATA_FILE) or ".", "attachments")
+
+def attachment_path(digest):
+    """Path blob untuk hash SHA-256 tertentu, atau None jika hash tidak valid/tidak ada"""
+    if not isinstance(digest, str) or not _DIGEST_RE.match(digest):
+        return None
+    path = os.path.join(_attachment_dir(), digest[:2], digest)
+    return path if os.path.exists(path) else None
+
+def _text_path(digest):
+    return os.path.join(_attachment_dir(), digest[:2], digest + ".txt")
+
+def store_attachment(stream, filename, mime=None):
+    """Simpan dokumen ke blob store berbasis hash isi dan kembalikan metadatanya.
+
+    Isi stream ditulis per potongan ke file sementara sambil di-hash, lalu
+    dinamai dengan hash SHA-256-nya; dokumen yang isinya sama hanya
+    disimpan sekali. Mengembalikan dict {'sha256', 'nama', 'ukuran', 'mime'}
+    untuk disimpan di field 'lampiran' record, atau None jika gagal.
+    """
+    tmp_path = None
+    try:
+        directory = _attachment_dir()
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix="upload.", suffix=".tmp", dir=directory)
+        digest = hashlib.sha256()
+        size = 0
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in iter(lambda: stream.read(ATTACHMENT_CHUNK_SIZE), b""):
+                digest.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        digest = digest.hexdigest()
+        path = os.path.join(directory, digest[:2], digest)
+        if os.path.exists(path):
+            # Dokumen yang sama sudah pernah diunggah
+            os.remove(tmp_path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        tmp_path = None
+        return {
+            'sha256': digest,
+            'nama': os.path.basename(filename or digest),
+            'ukuran': size,
+            'mime': mime or mimetypes.guess_type(filename or "")[0] or 'application/octet-stream',
+        }
+    except Exception as e:
+        print(f"Error storing attachment: {e}")
+        return None
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def parse_byte_range(header, size):
+    """(awal, akhir) inklusif dari header HTTP Range 'bytes=a-b'.
+
+    None jika header kosong atau tidak didukung (kirim seluruh isi);
+    ValueError jika rentang di luar ukuran file.
+    """
+    match = _RANGE_RE.match((header or "").strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Sufiks: N byte terakhir
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(f"Rentang {header!r} di luar ukuran {size}")
+    return start, end
+
+def iter_attachment(digest, start=0, end=None, chunk_size=None):
+    """Isi blob (atau rentang byte [start, end] inklusif) dalam potongan"""
+    path = attachment_path(digest)
+    if path is None:
+        raise FileNotFoundError(digest)
+    chunk_size = chunk_size or ATTACHMENT_CHUNK_SIZE
+    remaining = (end if end is not None else os.path.getsize(path) - 1) - start + 1
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while remaining > 0:
+            chunk = f.read(min(chunk_size, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+
+def _extract_docx(path):
+    """Teks paragraf dokumen Word (.docx), dibaca bertahap dari arsip zip"""
+    parts, length = [], 0
+    with zipfile.ZipFile(path) as archive, archive.open("word/document.xml") as document:
+        for _, element in iterparse(document):
+            if element.tag == _WORD_NS + "t" and element.text:
+                parts.append(element.text)
+                length += len(element.text)
+            elif element.tag == _WORD_NS + "p":
+                parts.append("\n")
+                # Elemen paragraf yang sudah dibaca dibuang agar memori tetap kecil
+                element.clear()
+            if length >= MAX_EXTRACTED_CHARS:
+                break
+    return "".join(parts)
+
+def _pdf_string(raw):
+    """Decode literal string PDF (escape sederhana, tanpa font encoding)"""
+    out, i = bytearray(), 0
+    while i < len(raw):
+        byte = raw[i:i + 1]
+        if byte == b"\\" and i + 1 < len(raw):
+            nxt = raw[i + 1:i + 2]
+            if nxt in b"01234567":
+                octal = re.match(rb"[0-7]{1,3}", raw[i + 1:i + 4]).group()
+                out.append(int(octal, 8) & 0xFF)
+                i += 1 + len(octal)
+                continue
+            out += _PDF_ESCAPES.get(nxt, nxt)
+            i += 2
+            continue
+        out += byte
+        i += 1
+    return out.decode('latin-1')
+
+def _extract_pdf_builtin(path):
+    """Ekstraksi teks PDF sederhana tanpa dependensi: operator Tj/TJ di stream konten.
+
+    Cukup untuk PDF yang dibuat pengolah kata dengan font standar; PDF hasil
+    pindaian atau dengan font ter-subset tidak menghasilkan teks.
+    """
+    parts, length = [], 0
+    if os.path.getsize(path) == 0:
+        return ""
+    # File dipetakan ke memori (mmap), bukan dibaca seluruhnya
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for match in _PDF_STREAM_RE.finditer(data):
+            end = data.find(b"endstream", match.end())
+            if end == -1:
+                break
+            if end - match.end() > MAX_PDF_STREAM_BYTES:
+                continue
+            length += _pdf_stream_text(data[match.end():end], parts)
+            if length >= MAX_EXTRACTED_CHARS:
+                break
+    return "".join(parts)
+
+def _pdf_stream_text(raw, parts):
+    """Tambahkan teks dari satu stream konten PDF ke parts, kembalikan panjangnya"""
+    length = 0
+    try:
+        content = zlib.decompressobj().decompress(raw, MAX_PDF_STREAM_BYTES)
+    except zlib.error:
+        content = raw
+    for op in _PDF_TEXT_RE.finditer(content):
+        token = op.group()
+        if token.endswith(b"Tj") or token.endswith(b"TJ"):
+            # Jarak negatif yang besar di dalam TJ menandai spasi antarkata
+            text = "".join(_pdf_string(string) if not spacing else (" " if float(spacing) <= -200 else "")
+                           for string, spacing in _PDF_STRING_RE.findall(token))
+            parts.append(text)
+            length += len(text)
+        elif parts and parts[-1] != "\n":
+            parts.append(" " if token in (b"Td", b"TD") else "\n")
+    return length
+
+def _extract_pdf(path):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return _extract_pdf_builtin(path)
+    parts, length = [], 0
+    for page in PdfReader(path).pages:
+        text = page.extract_text() or ""
+        parts.append(text)
+        length += len(text)
+        if length >= MAX_EXTRACTED_CHARS:
+            break
+    return "\n".join(parts)
+
+@profiled(category='attachment')
+def extract_text(digest, mime=None, filename=None):
+    """Teks dokumen untuk pencarian; hasil disimpan di samping blob dan dipakai ulang.
+
+    Dokumen .doc (format biner lama) dan format lain tidak diekstrak.
+    """
+    path = attachment_path(digest)
+    if path is None:
+        return ""
+    text_path = _text_path(digest)
+    if os.path.exists(text_path):
+        with open(text_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension == ".docx" or mime == DOCX_MIME:
+        text = _extract_docx(path)
+    elif extension == ".pdf" or mime == 'application/pdf':
+        text = _extract_pdf(path)
+    else:
+        text = ""
+    text = re.sub(r"[ \t]+", " ", text).strip()[:MAX_EXTRACTED_CHARS]
+    tmp_path = text_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, text_path)
+    return text
+
+def _index_attachments(research_id):
+    """Gabungkan teks semua lampiran record ke field teks_lampiran"""
+    record = data_handler.get_research_detail(research_id)
+    if not record:
+        return
+    texts = [extract_text(a.get('sha256'), a.get('mime'), a.get('nama'))
+             for a in record.get('lampiran') or []]
+    text = "\n\n".join(t for t in texts if t)
+    if text and text != record.get('teks_lampiran'):
+        data_handler.update_research_data(research_id, {'teks_lampiran': text})
+
+def _run_extractions():
+    while True:
+        research_id = _extract_queue.get()
+        try:
+            _index_attachments(research_id)
+        except Exception as e:
+            print(f"Error extracting attachment text: {e}")
+        finally:
+            _extract_queue.task_done()
+
+def schedule_text_extraction(research_id):
+    """Antrekan ekstraksi teks lampiran sebuah record di thread latar belakang"""
+    global _extract_worker
+    with _extract_lock:
+        if _extract_worker is None or not _extract_worker.is_alive():
+            _extract_worker = threading.Thread(target=_run_extractions, daemon=True)
+            _extract_worker.start()
+    _extract_queue.put(research_id)
@@ -0,0 +1,266 @@
+# utils/backup.py
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from utils.schema import record_to_json
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+BACKUP_DIR = "data/backups"
+
+# Kebijakan retensi backup
+BACKUP_MAX_GENERATIONS = 50
+BACKUP_MAX_AGE_DAYS = 30
+BACKUP_MAX_BYTES = 50 * 1024 * 1024
+
+# Kompresi gzip untuk file backup
+BACKUP_COMPRESS = True
+
+# Backup penuh baru (basis rantai delta) dibuat jika total ukuran delta sejak
+# backup penuh terakhir melebihi rasio ini terhadap ukuran backup penuh itu,
+# atau jika backup penuh terakhir lebih tua dari FULL_BACKUP_MAX_AGE_DAYS.
+# Dengan pemicu ukuran, rata-rata byte per simpan tetap sebanding ukuran
+# perubahan, bukan ukuran data.
+FULL_BACKUP_DELTA_RATIO = 1.0
+FULL_BACKUP_MAX_AGE_DAYS = 7
+
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = "manifest.lock"
+
+_backup_lock = threading.Lock()
+
+# Mode file baru mengikuti umask proses (dibaca sekali; os.umask tidak thread-safe)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _manifest_path(backup_dir):
+    return os.path.join(backup_dir, MANIFEST_FILE)
+
+def _load_manifest(backup_dir):
+    """Membaca daftar backup; manifest kosong jika belum ada"""
+    path = _manifest_path(backup_dir)
+    if not os.path.exists(path):
+        return {'next_generation': 1, 'entries': []}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _save_manifest(backup_dir, manifest):
+    """Tulis manifest lewat file sementara unik + rename.
+
+    mkstemp membuat file 0600; mode manifest lama (atau bawaan umask)
+    dipertahankan agar tetap terbaca proses lain.
+    """
+    path = _manifest_path(backup_dir)
+    fd, tmp_path = tempfile.mkstemp(prefix=MANIFEST_FILE + ".", suffix=".tmp", dir=backup_dir)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+@contextmanager
+def _manifest_locked(backup_dir):
+    """Kunci direktori backup untuk thread lain dan proses lain (file lock).
+
+    Dipegang selama manifest dibaca, delta dihitung, dan generasi baru ditulis.
+    """
+    with _backup_lock:
+        os.makedirs(backup_dir, exist_ok=True)
+        with open(os.path.join(backup_dir, LOCK_FILE), 'a+b') as handle:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                else:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _write_payload(path, payload, compress):
+    """Menulis payload JSON (opsional gzip), mengembalikan jumlah byte di disk"""
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=record_to_json).encode('utf-8')
+    if compress:
+        data = gzip.compress(data, compresslevel=6)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+def _read_payload(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if path.endswith('.gz'):
+        data = gzip.decompress(data)
+    return json.loads(data.decode('utf-8'))
+
+def _apply_delta(records, delta):
+    """Terapkan delta (upsert + delete) ke daftar record"""
+    deleted = set(delta.get('delete', []))
+    if deleted:
+        records = [r for r in records if r.get('id') not in deleted]
+    positions = {r.get('id'): i for i, r in enumerate(records)}
+    for record in delta.get('upsert', []):
+        pos = positions.get(record.get('id'))
+        if pos is None:
+            positions[record.get('id')] = len(records)
+            records.append(record)
+        else:
+            records[pos] = record
+    return records
+
+def _needs_full(manifest, now):
+    """True jika generasi berikutnya harus backup penuh (lihat FULL_BACKUP_DELTA_RATIO)"""
+    delta_bytes = 0
+    for entry in reversed(manifest['entries']):
+        if entry['kind'] == 'full':
+            if delta_bytes > FULL_BACKUP_DELTA_RATIO * entry['bytes']:
+                return True
+            return (FULL_BACKUP_MAX_AGE_DAYS is not None
+                    and now - entry['created'] > FULL_BACKUP_MAX_AGE_DAYS * 86400)
+        delta_bytes += entry['bytes']
+    return True
+
+def _apply_retention(backup_dir, manifest, max_generations, max_age_days, max_bytes):
+    """Hapus rantai backup tertua (full + delta-deltanya) yang melanggar retensi"""
+    entries = manifest['entries']
+    # Kelompokkan menjadi rantai yang diawali backup penuh
+    chains = []
+    for entry in entries:
+        if entry['kind'] == 'full' or not chains:
+            chains.append([entry])
+        else:
+            chains[-1].append(entry)
+
+    now = time.time()
+    while len(chains) > 1:
+        count = sum(len(c) for c in chains)
+        total_bytes = sum(e['bytes'] for c in chains for e in c)
+        newest_in_oldest = chains[0][-1]['created']
+        too_old = max_age_days is not None and now - newest_in_oldest > max_age_days * 86400
+        too_many = max_generations is not None and count > max_generations
+        too_big = max_bytes is not None and total_bytes > max_bytes
+        if not (too_old or too_many or too_big):
+            break
+        for entry in chains.pop(0):
+            try:
+                os.remove(os.path.join(backup_dir, entry['file']))
+            except OSError:
+                pass
+
+    manifest['entries'] = [e for c in chains for e in c]
+
+def _retention(max_generations, max_age_days, max_bytes):
+    return (BACKUP_MAX_GENERATIONS if max_generations is None else max_generations,
+            BACKUP_MAX_AGE_DAYS if max_age_days is None else max_age_days,
+            BACKUP_MAX_BYTES if max_bytes is None else max_bytes)
+
+def _write_generation(backup_dir, manifest, payload, record_count, version, compress, retention):
+    """Tulis satu generasi (payload delta atau {'records': ...}) lalu perbarui manifest"""
+    generation = manifest['next_generation']
+    kind = 'full' if 'records' in payload else 'delta'
+    suffix = '.json.gz' if compress else '.json'
+    filename = f"gen_{generation:08d}.{kind}{suffix}"
+    size = _write_payload(os.path.join(backup_dir, filename), payload, compress)
+
+    entry = {
+        'generation': generation,
+        'kind': kind,
+        'file': filename,
+        'bytes': size,
+        'records': record_count,
+        'created': time.time(),
+        'version': version,
+    }
+    manifest['entries'].append(entry)
+    manifest['next_generation'] = generation + 1
+    _apply_retention(backup_dir, manifest, *retention)
+    _save_manifest(backup_dir, manifest)
+    return entry
+
+def backup_changes(upsert, delete=(), record_count=None, records=None, base_version=None, version=None,
+                   backup_dir=None, compress=None, max_generations=None, max_age_days=None, max_bytes=None):
+    """Backup inkremental dari perubahan yang sudah diketahui pemanggil.
+
+    upsert berisi record lengkap yang ditambahkan atau diubah (record baru
+    dalam urutan kemunculannya di data), delete berisi id yang dihapus, dan
+    record_count jumlah record setelah perubahan. Delta hanya ditulis di atas
+    generasi terakhir yang mewakili data versi base_version; jika versi itu
+    tidak cocok (misalnya backup sebelumnya gagal) atau basis baru sudah
+    waktunya, records() dipanggil untuk backup penuh. version adalah versi
+    data setelah perubahan, basis delta berikutnya. Biayanya sebanding jumlah
+    perubahan karena data yang tidak berubah tidak dibaca sama sekali.
+    """
+    backup_dir = backup_dir or BACKUP_DIR
+    compress = BACKUP_COMPRESS if compress is None else compress
+    retention = _retention(max_generations, max_age_days, max_bytes)
+
+    with _manifest_locked(backup_dir):
+        manifest = _load_manifest(backup_dir)
+        entries = manifest['entries']
+        head = entries[-1] if entries else None
+        if (head is None or base_version is None or head.get('version') != base_version
+                or _needs_full(manifest, time.time())):
+            full = list(records())
+            return _write_generation(backup_dir, manifest, {'records': full}, len(full),
+                                     version, compress, retention)
+        if not upsert and not delete:
+            _set_version(backup_dir, manifest, version)
+            return None
+
+        delta = {'upsert': list(upsert), 'delete': list(delete)}
+        return _write_generation(backup_dir, manifest, delta, record_count, version, compress, retention)
+
+def _set_version(backup_dir, manifest, version):
+    """Catat versi data baru pada generasi terakhir saat isinya tidak berubah"""
+    head = manifest['entries'][-1] if manifest['entries'] else None
+    if head is not None and version is not None and head.get('version') != version:
+        head['version'] = version
+        _save_manifest(backup_dir, manifest)
+
+def list_backups(backup_dir=None):
+    """Daftar entri backup yang masih tersimpan, dari yang tertua"""
+    try:
+        return _load_manifest(backup_dir or BACKUP_DIR)['entries']
+    except Exception as e:
+        print(f"Error reading backups: {e}")
+        return []
+
+def restore_generation(generation, backup_dir=None):
+    """Bangun ulang data penelitian pada generasi backup tertentu"""
+    backup_dir = backup_dir or BACKUP_DIR
+    entries = _load_manifest(backup_dir)['entries']
+    chain = []
+    for entry in entries:
+        if entry['generation'] > generation:
+            break
+        if entry['kind'] == 'full':
+            chain = [entry]
+        elif chain:
+            chain.append(entry)
+    if not chain or chain[-1]['generation'] != generation:
+        raise ValueError(f"Generasi backup {generation} tidak tersedia")
+
+    records = _read_payload(os.path.join(backup_dir, chain[0]['file']))['records']
+    for entry in chain[1:]:
+        records = _apply_delta(records, _read_payload(os.path.join(backup_dir, entry['file'])))
+    return records
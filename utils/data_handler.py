@@ -1,54 +1,2034 @@
 # utils/data_handler.py
+import contextvars
+import heapq
+import inspect
 import json
+import mmap
 import os
-import pandas as pd
-from datetime import datetime
+import tempfile
+import threading
+from collections import ChainMap, Counter, OrderedDict
+from contextlib import contextmanager
+from functools import partial, wraps
+from itertools import groupby, islice
+from utils.aggregates import ResearchAggregates, merge_snapshots
+from utils.backup import backup_changes
+from utils.facets import FacetIndex, clean_label, normalize_term
+from utils.frames import build_research_frames
+from utils.profiler import count, profiled, span
+from utils.field_index import INDEXED_FIELDS, FieldIndex, RecencyIndex, date_key, normalize_value
+from utils.schema import (LIST_FIELDS, ResearchRecord, coerce_record, long_text_fields, record_to_json,
+                          summarize_record, summary_loader, summary_source)
+from utils.near_duplicate import NearDuplicateIndex
+from utils.search_index import SearchIndex
+from utils.shards import DEFAULT_COLLECTION, MANIFEST_FILE, collection_name, collection_slug, load_manifest, save_manifest
+from utils.similarity import SimilarityIndex
+from utils.sqlite_store import SqliteStorage, normalize_id
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 DATA_FILE = "data/research_data.json"
 
-def load_research_data():
-    """Memuat data penelitian dari file JSON"""
+# Backend penyimpanan: "json" (snapshot + journal) atau "sqlite"
+STORAGE_BACKEND = os.environ.get("RESEARCH_STORAGE", "json")
+DB_FILE = os.environ.get("RESEARCH_DB_FILE", "data/research_data.db")
+
+# Partisi data per koleksi: nama field record yang menentukan shard (misalnya
+# "institusi"). Kosong berarti semua record berada di DATA_FILE/DB_FILE.
+# Setiap shard adalah direktori sendiri di SHARDS_DIR dengan file data,
+# journal, file lock, dan backup-nya sendiri.
+SHARD_BY = os.environ.get("RESEARCH_SHARD_BY") or None
+SHARDS_DIR = os.environ.get("RESEARCH_SHARDS_DIR", "data/shards")
+
+# Jumlah entri journal sebelum dipadatkan ke snapshot utama
+JOURNAL_COMPACT_THRESHOLD = 500
+
+# Jumlah isi teks panjang (detail record) yang di-cache di memori
+DETAIL_CACHE_SIZE = 256
+
+# Field list yang istilahnya dinormalisasi ke kamus facet (lihat get_facet_counts)
+FACET_FIELDS = LIST_FIELDS
+
+# Encoder dipakai ulang (ResearchRecord diserialisasi lewat to_dict)
+_JOURNAL_ENCODER = json.JSONEncoder(ensure_ascii=False, default=record_to_json)
+_SNAPSHOT_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False, default=record_to_json)
+
+class _ResearchStore:
+    """Cache data penelitian di memori yang dipakai bersama oleh semua sesi.
+
+    Data terdiri dari snapshot JSON dan journal JSON Lines berisi record
+    yang ditambahkan setelah snapshot terakhir. Keduanya hanya di-parse
+    ulang jika mtime/ukuran salah satu file berubah.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.journal_path = _journal_path(path)
+        self.lock_path = os.path.splitext(path)[0] + ".lock"
+        self.seq_path = os.path.splitext(path)[0] + ".seq"
+        self.records = None
+        self.signature = None
+        self.generation = 0
+        self.journal_entries = 0
+        # Jumlah record di awal records yang berasal dari snapshot (sisanya record baru dari journal)
+        self.snapshot_count = 0
+        self.positions = {}
+        self.indexes = {}
+        self.frames = None
+        self.frames_generation = None
+        self.max_id = 0
+        self.compacting = False
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+        self.file_lock_depth = 0
+        self.file_lock_handle = None
+        # Teks panjang record ringkas dibaca lewat loader ini, dengan cache LRU
+        self.loader = partial(_load_long_text, self)
+        self.details = OrderedDict()
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+# Koleksi (slug shard) yang sedang dipakai di konteks ini; None berarti semua
+_active_collection = contextvars.ContextVar('research_collection', default=None)
+
+def _shard_path(filename):
+    """Path file data di shard koleksi aktif (atau filename itu sendiri tanpa sharding)"""
+    if SHARD_BY is None:
+        return filename
+    slug = _active_collection.get() or DEFAULT_COLLECTION
+    return os.path.join(SHARDS_DIR, slug, os.path.basename(filename))
+
+def _get_store(path=None):
+    """Ambil (atau buat) store untuk path file data tertentu"""
+    path = path or _shard_path(DATA_FILE)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = _ResearchStore(path)
+        return store
+
+_sqlite_storages = {}
+# Frame analisis per database SQLite (kunci path) dan gabungan semua koleksi (kunci None)
+_frames_cache = {}
+_sqlite_text_indexes = {}
+_sqlite_lock = threading.Lock()
+
+def _sqlite_backend():
+    """Backend SQLite jika dipilih lewat konfigurasi, None untuk backend JSON.
+
+    Saat database masih kosong dan file JSON tersedia, data dimigrasikan
+    sekali secara otomatis.
+    """
+    if STORAGE_BACKEND != "sqlite":
+        return None
+    db_path = _shard_path(DB_FILE)
+    with _sqlite_lock:
+        storage = _sqlite_storages.get(db_path)
+        if storage is None:
+            storage = SqliteStorage(db_path)
+            json_path = _shard_path(DATA_FILE)
+            if storage.count() == 0 and os.path.exists(json_path):
+                _migrate_to_sqlite(_get_store(json_path), storage)
+            storage = _sqlite_storages[db_path] = storage
+        return storage
+
+def _migrate_to_sqlite(store, storage):
+    """Salin seluruh record store JSON ke SQLite.
+
+    Backend JSON menerima id apa pun, SQLite hanya bilangan bulat: record
+    dengan id yang tidak bisa diubah ke int diberi id baru (dicetak) alih-alih
+    menggagalkan seluruh migrasi.
+    """
+    with store.lock:
+        _ensure_loaded(store)
+        records = [dict(r) for r in store.records]
+    for record in records:
+        try:
+            record['id'] = normalize_id(record.get('id'))
+        except ValueError:
+            old_id = record.get('id')
+            record['id'] = None
+            print(f"Migrasi: id {old_id!r} tidak valid untuk SQLite, "
+                  f"record \"{record.get('judul', '')}\" diberi id baru")
+    storage.replace_all(records)
+    return len(records)
+
+@profiled()
+def migrate_json_to_sqlite(json_path=None, db_path=None):
+    """Migrasi satu kali data JSON (snapshot + journal) ke database SQLite"""
+    try:
+        storage = SqliteStorage(db_path or DB_FILE)
+        count = _migrate_to_sqlite(_get_store(json_path or DATA_FILE), storage)
+        print(f"Migrasi selesai: {count} penelitian ke {storage.path}")
+        return count
+    except Exception as e:
+        print(f"Error migrating data: {e}")
+        return 0
+
+# --- Koleksi (shard) ---
+
+_collections_lock = threading.RLock()
+_sharded_dirs = set()
+_manifest_cache = {}
+
+@contextmanager
+def use_collection(key):
+    """Batasi operasi data di konteks ini (thread/rerun) ke satu koleksi.
+
+    key adalah nilai kunci koleksi (misalnya nama institusi) atau slug-nya;
+    None berarti semua koleksi. Tanpa SHARD_BY tidak berpengaruh.
+    """
+    token = _active_collection.set(collection_slug(key) if key is not None else None)
+    try:
+        yield
+    finally:
+        _active_collection.reset(token)
+
+def active_collection():
+    """Slug koleksi aktif, atau None jika semua koleksi (atau tanpa sharding)"""
+    return _active_collection.get() if SHARD_BY is not None else None
+
+def _registry_store():
+    """Store semu di SHARDS_DIR: file lock dan urutan id bersama semua shard"""
+    return _get_store(os.path.join(SHARDS_DIR, os.path.basename(DATA_FILE)))
+
+def _collections():
+    """Manifest koleksi {slug: nama}, dibaca ulang hanya jika file berubah"""
+    path = os.path.join(SHARDS_DIR, MANIFEST_FILE)
+    signature = _file_signature(path)
+    cached = _manifest_cache.get(path)
+    if cached is None or cached[0] != signature:
+        cached = _manifest_cache[path] = (signature, load_manifest(SHARDS_DIR))
+    return cached[1]
+
+def _register_collection(slug, name):
+    """Catat shard baru di manifest (sekali per koleksi)"""
+    if slug in _collections():
+        return
+    with _locked(_registry_store()):
+        manifest = load_manifest(SHARDS_DIR)
+        if slug not in manifest:
+            manifest[slug] = name
+            save_manifest(SHARDS_DIR, manifest)
+
+def _ensure_sharded():
+    """Bagi data tunggal lama ke shard sekali saat sharding pertama kali dipakai"""
+    if SHARDS_DIR in _sharded_dirs:
+        return
+    with _collections_lock:
+        if SHARDS_DIR in _sharded_dirs:
+            return
+        _sharded_dirs.add(SHARDS_DIR)
+        try:
+            if not _collections() and (os.path.exists(DATA_FILE) or
+                                       (STORAGE_BACKEND == "sqlite" and os.path.exists(DB_FILE))):
+                shard_research_data()
+        except BaseException:
+            _sharded_dirs.discard(SHARDS_DIR)
+            raise
+
+def list_collections():
+    """Koleksi yang ada sebagai {slug: nama tampilan}; kosong tanpa sharding"""
+    if SHARD_BY is None:
+        return {}
+    _ensure_sharded()
+    return dict(sorted(_collections().items(), key=lambda item: item[1].lower()))
+
+def _record_collection(record):
+    """Slug shard tujuan sebuah record: dari field SHARD_BY, lalu koleksi aktif"""
+    value = record.get(SHARD_BY)
+    if value in (None, "", []):
+        return _active_collection.get() or DEFAULT_COLLECTION, collection_name(None)
+    return collection_slug(value), collection_name(value)
+
+@profiled()
+def shard_research_data():
+    """Bagi data tunggal (DATA_FILE, atau DB_FILE untuk backend SQLite) ke shard per koleksi.
+
+    Dijalankan otomatis sekali saat SHARD_BY diaktifkan dan SHARDS_DIR masih
+    kosong. Mengembalikan jumlah record yang dipindahkan.
+    """
+    if STORAGE_BACKEND == "sqlite" and os.path.exists(DB_FILE):
+        records = SqliteStorage(DB_FILE).load_all()
+    else:
+        source = _get_store(DATA_FILE)
+        with source.lock:
+            _ensure_loaded(source)
+            records = list(_iter_full_dicts(source, source.records))
+    groups = {}
+    for record in records:
+        slug, name = _record_collection(record)
+        groups.setdefault(slug, (name, []))[1].append(record)
+    for slug, (name, group) in groups.items():
+        with use_collection(slug):
+            if not save_research_data(group):
+                raise IOError(f"Gagal menulis shard {slug}")
+    with _locked(_registry_store()):
+        manifest = load_manifest(SHARDS_DIR)
+        manifest.update({slug: name for slug, (name, _) in groups.items()})
+        save_manifest(SHARDS_DIR, manifest)
+    print(f"Sharding selesai: {len(records)} penelitian ke {len(groups)} koleksi di {SHARDS_DIR}")
+    return len(records)
+
+def _read_seq(store):
+    if not os.path.exists(store.seq_path):
+        return 0
+    with open(store.seq_path, 'r', encoding='utf-8') as f:
+        content = f.read().strip()
+    return int(content) if content else 0
+
+def _reserve_ids(records):
+    """Majukan urutan id bersama melewati id eksplisit yang baru disimpan di sebuah shard"""
+    top = _max_id(records)
+    registry = _registry_store()
+    if top <= registry.max_id:
+        return
+    with _locked(registry):
+        if top > _read_seq(registry):
+            _atomic_write(registry.seq_path, lambda f: f.write(str(top)))
+        registry.max_id = max(registry.max_id, top)
+
+def _collection_of(research_id):
+    """Slug shard yang memuat research_id (koleksi aktif diperiksa lebih dulu), atau None"""
+    active = _active_collection.get()
+    slugs = list(_collections())
+    if active is not None:
+        slugs = [active] + [slug for slug in slugs if slug != active]
+    for slug in slugs:
+        with use_collection(slug):
+            backend = _sqlite_backend()
+            if backend is not None:
+                if backend.get(research_id) is not None:
+                    return slug
+                continue
+            store = _get_store()
+            with store.lock:
+                _ensure_loaded(store)
+                if research_id in store.positions:
+                    return slug
+    return None
+
+def _all_collections():
+    """True jika sharding aktif tanpa koleksi terpilih: operasi harus menyentuh semua shard"""
+    if SHARD_BY is None:
+        return False
+    _ensure_sharded()
+    return _active_collection.get() is None
+
+def _across_collections(merge, route=None):
+    """Jalankan fungsi data per shard lalu gabungkan hasilnya.
+
+    Tanpa sharding, atau saat sebuah koleksi aktif, fungsi dijalankan apa
+    adanya. route(params) boleh mengembalikan daftar slug shard yang relevan
+    (None berarti semua); merge(results, params) menggabungkan hasil per shard.
+    params adalah argumen pemanggilan (termasuk default) sebagai dict.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _all_collections():
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = bound.arguments
+            slugs = route(params) if route else None
+            results = []
+            for slug in (list(_collections()) if slugs is None else slugs):
+                with use_collection(slug):
+                    results.append(func(*args, **kwargs))
+            return merge(results, params)
+        return wrapper
+    return decorator
+
+def _route_by_filter(params):
+    """Shard untuk filter bernama SHARD_BY (misalnya institusi); None jika tidak difilter"""
+    value = params.get(SHARD_BY)
+    if value is None:
+        return None
+    values = value if isinstance(value, (list, tuple, set)) else [value]
+    known = _collections()
+    return sorted({collection_slug(v) for v in values} & known.keys())
+
+def _route_by_id(params):
+    slug = _collection_of(params['research_id'])
+    return [] if slug is None else [slug]
+
+def _route_by_record(params):
+    value = params['record'].get(SHARD_BY)
+    if value in (None, "", []):
+        return None
+    slug = collection_slug(value)
+    return [slug] if slug in _collections() else []
+
+def _interleave(lists):
+    """Gabungkan daftar berperingkat dari beberapa shard secara bergiliran"""
+    iterators = [iter(items) for items in lists]
+    while iterators:
+        alive = []
+        for iterator in iterators:
+            item = next(iterator, _NO_ITEM)
+            if item is not _NO_ITEM:
+                alive.append(iterator)
+                yield item
+        iterators = alive
+
+_NO_ITEM = object()
+
+def _merge_concat(results, params):
+    if params.get('text') or params.get('query'):
+        # Skor relevansi tidak sebanding antar shard: peringkat diselang-seling
+        merged = list(_interleave(results))
+    else:
+        merged = [r for result in results for r in result]
+    limit = params.get('limit')
+    return merged[:limit] if limit is not None else merged
+
+def _merge_sum(results, params):
+    return sum(results)
+
+def _merge_counts(results, params):
+    total = Counter()
+    for counts in results:
+        total.update(counts)
+    return dict(total)
+
+def _merge_first(results, params):
+    return next((r for r in results if r is not None), None)
+
+def _merge_all(results, params):
+    return all(results)
+
+def _merge_aggregates(results, params):
+    return merge_snapshots(results)
+
+def _merge_latest(results, params):
+    records = [r for result in results for r in result]
+    return heapq.nlargest(params['n'], records, key=lambda r: date_key(r.get('tanggal_mulai')))
+
+def _merge_scored(results, params):
+    pairs = sorted((pair for result in results for pair in result), key=lambda pair: -pair[1])
+    limit = params.get('limit')
+    return pairs[:limit] if limit is not None else pairs
+
+def _merge_stats(results, params):
+    merged = {'backend': STORAGE_BACKEND, 'hits': 0, 'misses': 0, 'generation': 0, 'records': 0}
+    for stats in results:
+        for key in ('hits', 'misses', 'generation', 'records', 'queries'):
+            if key in stats:
+                merged[key] = merged.get(key, 0) + stats[key]
+    merged['collections'] = len(results)
+    return merged
+
+def _merge_facets(results, params):
+    """Jumlahkan facet per istilah ternormalisasi; label dari shard dengan jumlah terbanyak"""
+    totals, labels = Counter(), {}
+    for result in results:
+        for label, count in result:
+            key = normalize_term(label)
+            totals[key] += count
+            if count > labels.get(key, (None, 0))[1]:
+                labels[key] = (label, count)
+    return [(labels[key][0], count) for key, count in totals.most_common(params.get('limit'))]
+
+def _journal_path(path):
+    """Path file journal untuk sebuah snapshot data"""
+    return os.path.splitext(path)[0] + ".journal.jsonl"
+
+@contextmanager
+def _locked(store):
+    """Kunci store untuk thread lain (RLock) dan proses lain (file lock).
+
+    Bisa dipanggil bersarang dalam satu thread; file lock hanya diambil
+    pada tingkat terluar.
+    """
+    with store.lock:
+        if store.file_lock_depth == 0:
+            os.makedirs(os.path.dirname(store.lock_path) or ".", exist_ok=True)
+            handle = open(store.lock_path, 'a+b')
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            store.file_lock_handle = handle
+        store.file_lock_depth += 1
+        try:
+            yield
+        finally:
+            store.file_lock_depth -= 1
+            if store.file_lock_depth == 0:
+                handle = store.file_lock_handle
+                store.file_lock_handle = None
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                else:
+                    handle.seek(0)
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+                handle.close()
+
+# Mode file baru mengikuti umask proses (dibaca sekali; os.umask tidak thread-safe)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _match_mode(tmp_path, path):
+    """Samakan mode file sementara dengan file tujuan.
+
+    mkstemp membuat file 0600, dan os.replace membawa mode itu ke file
+    tujuan; file data harus tetap terbaca proses lain seperti sebelumnya.
+    """
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    os.chmod(tmp_path, mode)
+
+def _atomic_write(path, write, binary=False):
+    """Tulis file lewat file sementara + rename agar tidak pernah terpotong"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
     try:
-        # Coba baca dari file lokal
-        if os.path.exists(DATA_FILE):
-            with open(DATA_FILE, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data
+        with (os.fdopen(fd, 'wb') if binary else os.fdopen(fd, 'w', encoding='utf-8')) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        _match_mode(tmp_path, path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _atomic_write_json(path, data):
+    _atomic_write(path, lambda f: json.dump(data, f, indent=2, ensure_ascii=False, default=record_to_json))
+
+def _dump_snapshot(f, records, store=None):
+    """Tulis snapshot (format sama dengan json.dump indent=2) ke file biner.
+
+    Mengembalikan posisi (offset, panjang) byte setiap record di file,
+    dipakai untuk membaca teks panjang record ringkas milik store.
+    """
+    if not records:
+        f.write(b"[]")
+        return []
+    sources, buffer, position = [], [], 0
+    if store is not None:
+        records = _iter_full_dicts(store, records)
+    for i, record in enumerate(records):
+        head = b",\n  " if i else b"[\n  "
+        body = _SNAPSHOT_ENCODER.encode(record).replace("\n", "\n  ").encode('utf-8')
+        sources.append((position + len(head), len(body)))
+        position += len(head) + len(body)
+        buffer += (head, body)
+        if len(buffer) >= 1000:
+            f.write(b"".join(buffer))
+            buffer = []
+    buffer.append(b"\n]")
+    f.write(b"".join(buffer))
+    count('byte_ditulis', position + 2)
+    return sources
+
+def _write_snapshot(path, records, store=None):
+    sources = []
+    _atomic_write(path, lambda f: sources.extend(_dump_snapshot(f, records, store)), binary=True)
+    return sources
+
+def _file_signature(path):
+    """Tanda tangan file (mtime, ukuran) untuk mendeteksi perubahan dari luar"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _read_snapshot(path):
+    """Membaca snapshot beserta posisi byte tiap record, membuat file kosong jika belum ada.
+
+    Posisi hanya bisa dihitung untuk file berformat json.dump(indent=2)
+    seperti yang ditulis modul ini; file berformat lain dibaca utuh dan
+    posisinya None.
+    """
+    if not os.path.exists(path):
+        _atomic_write_json(path, [])
+        return [], None
+    with open(path, 'rb') as f:
+        data = f.read()
+    count('byte_dibaca', len(data))
+    records, sources = [], []
+    # Record tingkat atas diawali "\n  {" dan diakhiri "\n  }"; string JSON
+    # tidak pernah memuat newline mentah dan objek bersarang berindentasi lebih dalam
+    start = data.find(b"\n  {")
+    expected = b"["
+    previous_end = 0
+    try:
+        while start != -1:
+            if data[previous_end:start].strip() != expected:
+                raise ValueError("format snapshot tidak dikenali")
+            end = data.find(b"\n  }", start)
+            if end == -1:
+                raise ValueError("record snapshot tidak ditutup")
+            end += 4
+            records.append(json.loads(data[start + 3:end]))
+            sources.append(('snapshot', start + 3, end - start - 3))
+            previous_end, expected = end, b","
+            start = data.find(b"\n  {", end)
+        if not records or data[previous_end:].strip() != b"]":
+            raise ValueError("format snapshot tidak dikenali")
+    except ValueError:
+        return json.loads(data), None
+    return records, sources
+
+def _read_journal(path, offset=0, sources=None):
+    """Membaca entri journal JSON Lines mulai dari offset byte tertentu.
+
+    Jika sources berupa list, posisi byte tiap entri ditambahkan ke sana.
+    """
+    entries = []
+    if not os.path.exists(path):
+        return entries
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        position = offset
+        for raw in f:
+            line_start, position = position, position + len(raw)
+            line = raw.decode('utf-8').strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Baris terpotong akibat crash saat menulis
+                print(f"Warning: melewati baris journal rusak di {path}")
+                continue
+            if sources is not None:
+                sources.append(('journal', line_start, len(raw.rstrip())))
+    count('byte_dibaca', position - offset)
+    return entries
+
+def _typed_records(store, raw_records, sources):
+    """Ubah dict mentah menjadi ResearchRecord ringkas yang teks panjangnya tetap di disk"""
+    records = [coerce_record(r) for r in raw_records]
+    if sources is not None:
+        loader = store.loader
+        for record, source in zip(records, sources):
+            summarize_record(record, loader, source)
+    return records
+
+def _load_long_text(store, source, record_id, retry=True):
+    """Baca field teks panjang record ringkas dari snapshot/journal (cache LRU)"""
+    with store.lock:
+        cached = store.details.get(source)
+        if cached is not None:
+            store.details.move_to_end(source)
+            return cached
+        kind, offset, length = source
+        try:
+            with open(store.path if kind == 'snapshot' else store.journal_path, 'rb') as f:
+                f.seek(offset)
+                data = json.loads(f.read(length))
+            count('byte_dibaca', length)
+        except (OSError, ValueError):
+            data = None
+        if not isinstance(data, dict) or str(data.get('id')) != str(record_id):
+            # File sudah ditulis ulang proses lain: muat ulang lalu cari menurut id
+            if not retry:
+                return {}
+            with _locked(store):
+                _ensure_loaded(store)
+                pos = store.positions.get(record_id)
+                if pos is None:
+                    return {}
+                current = store.records[pos]
+            current_source = summary_source(current)
+            if current_source is None:
+                return long_text_fields(current)
+            return _load_long_text(store, current_source, record_id, retry=False)
+        texts = long_text_fields(data)
+        store.details[source] = texts
+        if len(store.details) > DETAIL_CACHE_SIZE:
+            store.details.popitem(last=False)
+        return texts
+
+def _append_journal(store, records, compact=True):
+    """Tulis record bertipe ke journal dalam satu penulisan lalu terapkan ke store.
+
+    Harus dipanggil dengan _locked(store) dipegang dan store sudah dimuat.
+    """
+    lines = [(_JOURNAL_ENCODER.encode(r) + "\n").encode('utf-8') for r in records]
+    os.makedirs(os.path.dirname(store.journal_path) or ".", exist_ok=True)
+    with open(store.journal_path, 'ab') as f:
+        offset = f.tell()
+        f.write(b"".join(lines))
+        count('byte_ditulis', f.tell() - offset)
+        f.flush()
+        os.fsync(f.fileno())
+    spans = []
+    for line in lines:
+        spans.append((offset, len(line) - 1))
+        offset += len(line)
+    _summarize_appended(store, records, spans)
+
+    _replay_journal(store.records, records, store.positions, store.indexes)
+    store.journal_entries += len(records)
+    store.max_id = _max_id(records, store.max_id)
+    store.signature = _store_signature(store)
+    store.generation += 1
+
+    if compact and store.journal_entries >= JOURNAL_COMPACT_THRESHOLD and not store.compacting:
+        store.compacting = True
+        # Salin konteks agar pemadatan berjalan di shard (koleksi) yang sama
+        threading.Thread(target=contextvars.copy_context().run, args=(compact_research_data,),
+                         daemon=True).start()
+
+def _summarize_appended(store, records, spans):
+    """Ringkas record yang baru ditulis ke journal; teksnya langsung di-cache"""
+    loader = store.loader
+    for record, (offset, length) in zip(records, spans):
+        source = ('journal', offset, length)
+        texts = long_text_fields(record)
+        if summarize_record(record, loader, source):
+            store.details[source] = texts
+    while len(store.details) > DETAIL_CACHE_SIZE:
+        store.details.popitem(last=False)
+
+def _read_full_snapshot(path):
+    """Seluruh isi snapshot sebagai dict utuh (untuk backup penuh)"""
+    with open(path, 'rb') as f:
+        return json.loads(f.read())
+
+def _journal_ids(store, end=None):
+    """Id record yang ditulis ke journal (entri yang dimulai sebelum offset end).
+
+    Journal dipadatkan setiap JOURNAL_COMPACT_THRESHOLD entri sehingga
+    membacanya murah dibanding membaca seluruh data.
+    """
+    sources = []
+    entries = _read_journal(store.journal_path, sources=sources)
+    return {entry.get('id') for entry, source in zip(entries, sources) if end is None or source[1] < end}
+
+def _snapshot_version(signature):
+    """Versi file snapshot (mtime, ukuran) yang dicatat di setiap generasi backup"""
+    return None if signature is None else "%x.%x" % signature
+
+def _backup_snapshot(store, upsert, delete, base_signature):
+    """Backup inkremental snapshot baru dari record yang berubah saja.
+
+    base_signature adalah tanda tangan snapshot lama: delta hanya ditulis di
+    atas generasi backup snapshot itu, selain itu dibuat backup penuh.
+    Harus dipanggil saat _locked(store) dipegang, setelah store diperbarui,
+    agar urutan generasi backup sama dengan urutan penulisan snapshot.
+    """
+    base_version = None if upsert is None else _snapshot_version(base_signature)
+    backup_changes(list(_iter_full_dicts(store, upsert or ())), delete,
+                   record_count=store.snapshot_count,
+                   records=lambda: _read_full_snapshot(store.path),
+                   base_version=base_version, version=_snapshot_version(store.signature[0]),
+                   backup_dir=_backup_dir(store))
+
+def _saved_changes(store, data, journal_ids):
+    """Record yang berubah oleh save_research_data terhadap snapshot lama.
+
+    Record yang objeknya sama dengan record di store dan tidak ditulis lewat
+    journal tidak berubah; isinya tidak dibandingkan sehingga tidak ada teks
+    yang dibaca. Mengembalikan (upsert, id terhapus), atau (None, None) jika
+    delta tidak bisa mereproduksi data dengan tepat (record tanpa id, id
+    ganda, atau urutan berubah) sehingga perlu backup penuh.
+    Harus dipanggil saat store.lock dipegang, sebelum store diperbarui.
+    """
+    ids = [r.get('id') for r in data]
+    base = [r.get('id') for r in store.records[:store.snapshot_count]]
+    if None in ids or None in base or len(set(ids)) != len(ids):
+        return None, None
+    current = store.records
+    positions = store.positions
+    upsert = []
+    for record in data:
+        pos = positions.get(record.get('id'))
+        if pos is None or current[pos] is not record or record.get('id') in journal_ids:
+            upsert.append(record)
+    kept = set(ids)
+    base_set = set(base)
+    delete = [i for i in base if i not in kept]
+    # Urutan hasil replay (lihat utils.backup._apply_delta) harus sama dengan data
+    expected = [i for i in base if i in kept] + [r.get('id') for r in upsert if r.get('id') not in base_set]
+    if expected != ids:
+        return None, None
+    return upsert, delete
+
+def _resummarize(store, records, sources):
+    """Arahkan record ke posisinya di file yang baru ditulis"""
+    loader = store.loader
+    for record, source in zip(records, sources):
+        summarize_record(record, loader, source)
+
+def _build_positions(records):
+    """Peta id -> posisi record dalam daftar"""
+    return {r.get('id'): i for i, r in enumerate(records) if r.get('id') is not None}
+
+def _replay_journal(records, entries, positions=None, indexes=None):
+    """Terapkan entri journal di atas snapshot; id yang sama menimpa record lama.
+
+    Jika positions diberikan, peta tersebut diperbarui di tempat. Indeks
+    turunan (lihat _get_index) ikut diperbarui secara inkremental.
+    """
+    if positions is None:
+        positions = _build_positions(records)
+    indexes = list(indexes.values()) if indexes else []
+    for entry in entries:
+        pos = positions.get(entry.get('id'))
+        if pos is None:
+            if entry.get('id') is not None:
+                positions[entry.get('id')] = len(records)
+            records.append(entry)
+        else:
+            for index in indexes:
+                index.remove(records[pos])
+            records[pos] = entry
+        for index in indexes:
+            index.add(entry)
+    return records
+
+def _backup_dir(store):
+    """Direktori backup inkremental, berdampingan dengan file data"""
+    return os.path.join(os.path.dirname(store.path) or ".", "backups")
+
+def _store_signature(store):
+    """Tanda tangan gabungan snapshot dan journal"""
+    return (_file_signature(store.path), _file_signature(store.journal_path))
+
+def _max_id(records, current=0):
+    """Id numerik terbesar di antara record"""
+    for record in records:
+        record_id = record.get('id')
+        if isinstance(record_id, int) and record_id > current:
+            current = record_id
+    return current
+
+def _ensure_loaded(store):
+    """Muat ulang store jika file berubah sejak terakhir dibaca"""
+    signature = _store_signature(store)
+    if store.records is not None and signature == store.signature:
+        store.hits += 1
+        return
+    store.misses += 1
+    with _locked(store), span('data_handler.muat_ulang', 'io'):
+        signature = _store_signature(store)
+        old = store.signature
+        if (store.records is not None and signature[0] == old[0]
+                and old[1] is not None and signature[1] is not None
+                and signature[1][1] > old[1][1]):
+            # Hanya journal yang bertambah (ditulis proses lain): baca ekornya saja
+            sources = []
+            entries = _read_journal(store.journal_path, offset=old[1][1], sources=sources)
+            entries = _typed_records(store, entries, sources)
+            _replay_journal(store.records, entries, store.positions, store.indexes)
+            store.journal_entries += len(entries)
+            store.max_id = _max_id(entries, store.max_id)
         else:
-            # Jika file tidak ada, buat file kosong
-            os.makedirs("data", exist_ok=True)
-            with open(DATA_FILE, 'w', encoding='utf-8') as f:
-                json.dump([], f)
-            return []
+            # Record disimpan sebagai ResearchRecord bertipe dan ringkas:
+            # teks panjang tetap di disk dan dibaca saat dibutuhkan
+            records, sources = _read_snapshot(store.path)
+            records = _typed_records(store, records, sources)
+            journal_sources = []
+            entries = _read_journal(store.journal_path, sources=journal_sources)
+            entries = _typed_records(store, entries, journal_sources)
+            store.details.clear()
+            store.snapshot_count = len(records)
+            store.positions = _build_positions(records)
+            store.records = _replay_journal(records, entries, store.positions)
+            store.indexes = {}
+            count('record_dipindai', len(store.records))
+            store.journal_entries = len(entries)
+            store.max_id = _max_id(store.records)
+        store.signature = _store_signature(store)
+        store.generation += 1
+
+@profiled()
+def load_research_data():
+    """Memuat data penelitian dari file JSON.
+
+    Mengembalikan list dict biasa (termasuk teks panjang) di semua backend,
+    sehingga hasilnya bisa diubah dan diserialisasi pemanggil. Kode yang
+    hanya membaca sebaiknya memakai query_research yang tidak menyalin data.
+    """
+    try:
+        return list(iter_full_records(_load_records()))
     except Exception as e:
         print(f"Error loading data: {e}")
         return []
 
-def save_research_data(data):
-    """Menyimpan data penelitian ke file JSON"""
-    try:
-        # Pastikan direktori ada
-        os.makedirs("data", exist_ok=True)
-        
-        # Simpan ke file
-        with open(DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        # Juga buat backup dengan timestamp
-        backup_file = f"data/research_data_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(backup_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
+@_across_collections(_merge_concat)
+def _load_records():
+    """Record store apa adanya (ResearchRecord ringkas di backend JSON)"""
+    backend = _sqlite_backend()
+    if backend is not None:
+        return backend.load_all()
+    store = _get_store()
+    with store.lock:
+        _ensure_loaded(store)
+        # Salinan dangkal agar pemanggil yang menambah/menghapus item
+        # tidak mengubah cache bersama
+        return list(store.records)
+
+def _iter_long_texts(store, records):
+    """Pasangan (record, teks panjang) untuk records, tanpa membuka file per record.
+
+    File snapshot/journal dipetakan ke memori (mmap) sekali lalu setiap
+    record ringkas diambil dari posisinya. Teks None berarti record tidak
+    ringkas, atau file sudah berubah sehingga teks harus dibaca lewat loader.
+    """
+    maps, read = {}, 0
+    try:
+        for record in records:
+            source = summary_source(record)
+            if source is None:
+                yield record, None
+                continue
+            cached = store.details.get(source)
+            if cached is not None:
+                yield record, cached
+                continue
+            kind, offset, length = source
+            if kind not in maps:
+                maps[kind] = _map_file(store.path if kind == 'snapshot' else store.journal_path)
+            data = maps[kind]
+            read += length
+            try:
+                raw = json.loads(data[offset:offset + length]) if data is not None else None
+            except ValueError:
+                raw = None
+            if isinstance(raw, dict) and str(raw.get('id')) == str(record.get('id')):
+                yield record, long_text_fields(raw)
+            else:
+                yield record, None
+    finally:
+        count('byte_dibaca', read)
+        for data in maps.values():
+            if data is not None:
+                data.close()
+
+def _map_file(path):
+    try:
+        with open(path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # File tidak ada atau kosong
+        return None
+
+def _iter_full_dicts(store, records):
+    """Dict lengkap untuk records; teks panjang dibaca lewat _iter_long_texts"""
+    for record, texts in _iter_long_texts(store, records):
+        if isinstance(record, ResearchRecord):
+            yield record.to_dict(texts)
+        else:
+            yield record
+
+def iter_full_records(records):
+    """Dict lengkap (termasuk teks panjang) untuk record hasil load/query.
+
+    Untuk memproses banyak record sekaligus (ekspor), jauh lebih cepat
+    daripada memanggil to_dict() per record karena file tidak dibuka ulang.
+    """
+    if STORAGE_BACKEND == "sqlite":
+        yield from records
+        return
+    if SHARD_BY is None:
+        yield from _iter_full_dicts(_get_store(), records)
+        return
+    # Record bisa berasal dari beberapa shard: teks dibaca dari store pemiliknya
+    for loader, group in groupby(records, key=summary_loader):
+        if loader is None:
+            yield from (r.to_dict() if isinstance(r, ResearchRecord) else r for r in group)
+        else:
+            yield from _iter_full_dicts(loader.args[0], group)
+
+def _get_index(store, name, factory, full_text=False):
+    """Indeks turunan milik store; dibangun sekali saat dibutuhkan.
+
+    Indeks dibuang setiap kali data dimuat ulang penuh atau ditimpa, dan
+    diperbarui lewat add()/remove() saat record masuk melalui journal.
+    Indeks dengan full_text=True dibangun dari record beserta teks panjangnya.
+    Harus dipanggil saat store.lock dipegang.
+    """
+    index = store.indexes.get(name)
+    if index is None:
+        index = factory()
+        with span(f"indeks:{name.split(':')[0]}", 'index', nama=name):
+            if full_text:
+                # ChainMap: field teks panjang dibaca dari teks yang sudah dimuat
+                index.build(ChainMap(texts, record) if texts else record
+                            for record, texts in _iter_long_texts(store, store.records))
+            else:
+                index.build(store.records)
+        count('record_dipindai', len(store.records))
+        store.indexes[name] = index
+    return index
+
+@profiled()
+@_across_collections(_merge_concat)
+def search_research(query, limit=None):
+    """Pencarian teks penuh (judul, peneliti, abstrak, kata kunci, metodologi, hasil).
+
+    Mengembalikan record yang cocok dengan semua kata pada query, diurutkan
+    dari yang paling relevan.
+    """
+    store = _get_store()
+    try:
+        backend = _sqlite_backend()
+        if backend is not None:
+            return backend.query({}, text=query, limit=limit)[0]
+        with store.lock:
+            _ensure_loaded(store)
+            index = _get_index(store, 'search', SearchIndex, full_text=True)
+            return [store.records[store.positions[doc_id]]
+                    for doc_id, _ in index.search(query, limit)]
+    except Exception as e:
+        print(f"Error searching data: {e}")
+        return []
+
+def _field_index(store, field):
+    return _get_index(store, f"field:{field}", lambda: FieldIndex(field))
+
+# Kunci pengurutan yang didukung query_research_page
+SORT_KEYS = ('relevansi', 'tanggal_mulai', 'tahun')
+
+def _query_ids(store, filters, text):
+    """Id record yang cocok dengan filter; None berarti seluruh data tanpa filter.
+
+    Harus dipanggil saat store.lock dipegang.
+    """
+    id_sets = [_field_index(store, field).lookup(value)
+               for field, value in filters.items() if value is not None]
+    matched = None
+    if id_sets:
+        id_sets.sort(key=len)
+        matched = set(id_sets[0])
+        for ids in id_sets[1:]:
+            matched.intersection_update(ids)
+
+    if text:
+        ranked = _get_index(store, 'search', SearchIndex, full_text=True).search(text)
+        return [doc_id for doc_id, _ in ranked if matched is None or doc_id in matched]
+    if matched is None:
+        return None
+    return sorted(matched, key=store.positions.__getitem__)
+
+# Tahap filter dari hulu ke hilir; hasil antara setiap tahap disimpan per sesi
+QUERY_STAGES = ('status', 'tahun', 'bidang', 'institusi', 'text')
+
+def _staged_ids(store, state, filters, text):
+    """_query_ids dengan hasil antara per tahap yang disimpan di state sesi.
+
+    Tahap yang masukannya (dan semua tahap sebelumnya) sama dengan pemanggilan
+    terakhir dipakai ulang; tahap berikutnya dihitung atas hasil tahap
+    sebelumnya saja. Hasil pencarian teks juga disimpan sehingga mengubah
+    filter hulu tidak mengulang pencarian. state dikosongkan jika generasi
+    data berubah. Harus dipanggil saat store.lock dipegang.
+    """
+    generation = (store.path, store.generation)
+    if state.get('generation') != generation:
+        state.clear()
+        state['generation'] = generation
+    stages = state.setdefault('stages', [])
+    values = [filters.get(name) for name in QUERY_STAGES[:-1]] + [text or None]
+    reused = 0
+    while reused < len(stages) and stages[reused][0] == values[reused]:
+        reused += 1
+    if reused == len(values):
+        return state['result']
+    del stages[reused:]
+    ids = stages[-1][1] if stages else None
+    for name, value in zip(QUERY_STAGES[reused:], values[reused:]):
+        if value is None:
+            pass
+        elif name == 'text':
+            # Hasil pencarian disimpan per teks: filter hulu yang berubah cukup menyaringnya ulang
+            searched = state.get('search')
+            if searched is None or searched[0] != value:
+                ranked = _get_index(store, 'search', SearchIndex, full_text=True).search(value)
+                searched = state['search'] = (value, [doc_id for doc_id, _ in ranked])
+            ids = searched[1] if ids is None else [doc_id for doc_id in searched[1] if doc_id in ids]
+        else:
+            matched = _field_index(store, name).lookup(value)
+            ids = set(matched) if ids is None else ids.intersection(matched)
+        stages.append((value, ids))
+    if ids is not None and not isinstance(ids, list):
+        # Hanya filter: urutan data asal seperti _query_ids
+        ids = sorted(ids, key=store.positions.__getitem__)
+    state['result'] = ids
+    return ids
+
+def _sort_value(record, sort_by):
+    if sort_by == 'tahun':
+        year = normalize_value('tahun', record.get('tahun'))
+        return year if isinstance(year, int) else -1
+    # Tanggal kosong/tidak valid selalu di urutan paling lama
+    return date_key(record.get(sort_by))
+
+@profiled()
+@_across_collections(_merge_concat, route=_route_by_filter)
+def query_research(status=None, tahun=None, bidang=None, institusi=None, text=None):
+    """Query data penelitian lewat indeks, tanpa memindai seluruh data.
+
+    Setiap filter boleh berupa satu nilai atau list nilai (OR); antar filter
+    digabung dengan AND. Tanpa text, hasil mengikuti urutan data; dengan
+    text, hasil diurutkan menurut relevansi.
+    """
+    filters = {'status': status, 'tahun': tahun, 'bidang': bidang, 'institusi': institusi}
+    store = _get_store()
+    try:
+        backend = _sqlite_backend()
+        if backend is not None:
+            return backend.query(filters, text=text)[0]
+        with store.lock:
+            _ensure_loaded(store)
+            ids = _query_ids(store, filters, text)
+            if ids is None:
+                return list(store.records)
+            return [store.records[store.positions[doc_id]] for doc_id in ids]
+    except Exception as e:
+        print(f"Error querying data: {e}")
+        return []
+
+def _page_bounds(total, page, page_size):
+    """Nomor halaman yang sudah dibatasi, jumlah halaman, dan offset awal"""
+    pages = max(1, -(-total // page_size))
+    page = min(max(1, int(page)), pages)
+    return page, pages, (page - 1) * page_size
+
+@profiled()
+def query_research_page(status=None, tahun=None, bidang=None, institusi=None, text=None,
+                        sort_by=None, descending=True, page=1, page_size=20, state=None):
+    """Satu halaman hasil query; hanya record pada halaman itu yang diambil.
+
+    sort_by: 'relevansi' (atau None) mengikuti urutan query_research,
+    'tanggal_mulai' atau 'tahun' mengurutkan dengan urutan asal sebagai
+    pemutus seri agar urutan antar halaman stabil. Mengembalikan dict berisi records,
+    total, page, dan pages.
+
+    state: dict milik satu sesi (misalnya di st.session_state) untuk
+    menyimpan hasil antara filter dan urutan antar pemanggilan, sehingga
+    rerun yang hanya mengubah filter hilir, urutan, atau halaman cukup
+    menghitung langkah yang berubah (lihat _staged_ids).
+    """
+    if sort_by not in (None,) + SORT_KEYS:
+        raise ValueError(f"Kunci urut {sort_by} tidak didukung")
+    filters = {'status': status, 'tahun': tahun, 'bidang': bidang, 'institusi': institusi}
+    page_size = max(1, int(page_size))
+    if _all_collections():
+        return _query_page_across_collections(filters, text, sort_by, descending, page, page_size, state)
+    store = _get_store()
+    try:
+        backend = _sqlite_backend()
+        if backend is not None:
+            # Filter, urut, dan paging dijalankan di SQL
+            records, total = backend.query(filters, text, sort_by, descending,
+                                           offset=(max(1, int(page)) - 1) * page_size, limit=page_size)
+            clamped, pages, start = _page_bounds(total, page, page_size)
+            if clamped != max(1, int(page)):
+                records, total = backend.query(filters, text, sort_by, descending,
+                                               offset=start, limit=page_size)
+            return {'records': records, 'total': total, 'page': clamped, 'pages': pages}
+        with store.lock:
+            _ensure_loaded(store)
+            if state is None:
+                ids = _query_ids(store, filters, text)
+            else:
+                ids = _staged_ids(store, state, filters, text)
+            fetch = lambda doc_id: store.records[store.positions[doc_id]]
+
+            order_key = (sort_by, descending)
+            cached = state.get('order') if state is not None else None
+            if cached is not None and cached[0] == order_key and cached[1] is ids:
+                # Hanya halaman yang berubah: urutan dari rerun sebelumnya dipakai ulang
+                ids, fetch = cached[2], cached[3]
+            else:
+                source = ids
+                recency = None
+                if sort_by == 'tanggal_mulai':
+                    recency = _get_index(store, 'recency', RecencyIndex)
+                    if len(recency) != len(store.records):
+                        # Ada record tanpa id: indeks tidak lengkap, urutkan biasa
+                        recency = None
+                    elif ids is not None and len(ids) * 8 < len(store.records):
+                        # Hasil kecil: mengurutkan hasil lebih murah daripada menyaring indeks
+                        recency = None
+
+                if recency is not None and ids is None:
+                    # Tanpa filter: ambil potongan halaman langsung dari indeks
+                    total = len(recency)
+                    page, pages, start = _page_bounds(total, page, page_size)
+                    page_ids = recency.ordered_ids(descending, start, start + page_size)
+                    records = [fetch(k) for k in page_ids]
+                    return {'records': records, 'total': total, 'page': page, 'pages': pages}
+
+                if recency is not None:
+                    # Urutan tanggal sudah terpelihara, cukup saring anggota hasil
+                    members = set(ids)
+                    ids = [doc_id for doc_id in recency.ordered_ids(descending) if doc_id in members]
+                elif ids is None:
+                    # Tanpa filter: gunakan posisi record (termasuk yang tanpa id)
+                    ids = range(len(store.records))
+                    fetch = store.records.__getitem__
+
+                if sort_by in ('tanggal_mulai', 'tahun') and recency is None:
+                    count('record_dipindai', len(ids))
+                    keyed = ((_sort_value(fetch(k), sort_by), i, k) for i, k in enumerate(ids))
+                    ordered = sorted(keyed, reverse=descending)
+                    ids = [k for _, _, k in ordered]
+
+                if state is not None:
+                    state['order'] = (order_key, source, ids, fetch)
+
+            total = len(ids)
+            page, pages, start = _page_bounds(total, page, page_size)
+            records = [fetch(k) for k in ids[start:start + page_size]]
+            return {'records': records, 'total': total, 'page': page, 'pages': pages}
+    except Exception as e:
+        print(f"Error querying data: {e}")
+        return {'records': [], 'total': 0, 'page': 1, 'pages': 1}
+
+def _query_page_across_collections(filters, text, sort_by, descending, page, page_size, state=None):
+    """query_research_page untuk semua koleksi: halaman teratas tiap shard lalu digabung.
+
+    Halaman ke-p gabungan hanya bisa berisi p * page_size record teratas
+    dari setiap shard, jadi cukup itu yang diambil per shard.
+    """
+    slugs = _route_by_filter(filters)
+    top = max(1, int(page)) * page_size
+    results = []
+    for slug in (list(_collections()) if slugs is None else slugs):
+        # Setiap shard punya hasil antaranya sendiri di state sesi
+        shard_state = state.setdefault(slug, {}) if state is not None else None
+        with use_collection(slug):
+            results.append(query_research_page(text=text, sort_by=sort_by, descending=descending,
+                                               page=1, page_size=top, state=shard_state, **filters))
+    total = sum(result['total'] for result in results)
+    page, pages, start = _page_bounds(total, page, page_size)
+    lists = [result['records'] for result in results]
+    if sort_by in ('tanggal_mulai', 'tahun'):
+        merged = heapq.merge(*lists, key=lambda r: _sort_value(r, sort_by), reverse=descending)
+    else:
+        merged = iter(_merge_concat(lists, {'text': text}))
+    records = list(islice(merged, start, start + page_size))
+    return {'records': records, 'total': total, 'page': page, 'pages': pages}
+
+@profiled()
+@_across_collections(_merge_latest)
+def latest_research(n=5):
+    """N penelitian dengan tanggal_mulai terbaru, tanpa mengurutkan seluruh data.
+
+    Record dengan tanggal kosong atau tidak valid dianggap paling lama.
+    """
+    store = _get_store()
+    try:
+        backend = _sqlite_backend()
+        if backend is not None:
+            return backend.latest(n)
+        with store.lock:
+            _ensure_loaded(store)
+            recency = _get_index(store, 'recency', RecencyIndex)
+            return [store.records[store.positions[doc_id]] for doc_id in recency.latest(n)]
+    except Exception as e:
+        print(f"Error querying data: {e}")
+        return []
+
+def _text_index(store, name, factory):
+    """Indeks turunan teks penuh untuk backend aktif; harus dipanggil saat store.lock dipegang.
+
+    Di backend SQLite indeks dibangun dari seluruh data hanya jika basi:
+    penulisan lewat modul ini memperbaruinya langsung (lihat _sqlite_indexed),
+    sehingga pembangunan ulang hanya terjadi setelah database diubah proses lain.
+    """
+    backend = _sqlite_backend()
+    if backend is None:
+        _ensure_loaded(store)
+        return _get_index(store, name, factory, full_text=True)
+    # Satu indeks per database sehingga shard tidak saling menimpa cache
+    key, version = (backend.path, name), backend.version()
+    cached = _sqlite_text_indexes.get(key)
+    if cached is None or cached[0] != version:
+        index = factory()
+        with span(f"indeks:{name}", 'index', nama=name):
+            index.build(backend.load_all())
+        cached = _sqlite_text_indexes[key] = (version, index)
+    return cached[1]
+
+def _sqlite_indexed(store, backend, before, records):
+    """Terapkan record yang baru ditulis ke indeks teks SQLite yang masih segar.
+
+    before adalah versi database sebelum penulisan. Indeks pada versi itu
+    diperbarui inkremental dan dinaikkan ke versi baru; jika ada penulis lain
+    di antaranya indeks dibiarkan basi dan dibangun ulang saat dipakai.
+    """
+    after = backend.version()
+    if after != before + 1:
+        return
+    with store.lock:
+        for key, (version, index) in list(_sqlite_text_indexes.items()):
+            if key[0] == backend.path and version == before:
+                for record in records:
+                    index.add(record)
+                _sqlite_text_indexes[key] = (after, index)
+
+@profiled()
+@_across_collections(_merge_concat, route=_route_by_id)
+def get_similar_research(research_id, k=5):
+    """Penelitian paling mirip (TF-IDF judul, kata kunci, abstrak) dengan sebuah record.
+
+    Mengembalikan list (record, skor kosinus) dari yang paling mirip.
+    """
+    store = _get_store()
+    try:
+        with store.lock:
+            pairs = _text_index(store, 'similar', SimilarityIndex).similar(research_id, k)
+            backend = _sqlite_backend()
+            if backend is not None:
+                return [(backend.get(doc_id), score) for doc_id, score in pairs]
+            return [(store.records[store.positions[doc_id]], score) for doc_id, score in pairs]
+    except Exception as e:
+        print(f"Error finding similar research: {e}")
+        return []
+
+@profiled()
+@_across_collections(_merge_sum)
+def precompute_similar_research(limit=100, k=5):
+    """Hitung di muka tetangga record yang paling sering dibuka (tabel tetangga)"""
+    store = _get_store()
+    try:
+        with store.lock:
+            return _text_index(store, 'similar', SimilarityIndex).precompute(limit, k)
+    except Exception as e:
+        print(f"Error precomputing similar research: {e}")
+        return 0
+
+@profiled()
+@_across_collections(_merge_scored, route=_route_by_record)
+def find_near_duplicates(record, limit=5, threshold=None):
+    """Penelitian yang hampir sama (MinHash judul dan abstrak) dengan sebuah record.
+
+    record boleh belum disimpan (misalnya isian form). Mengembalikan list
+    (record, perkiraan kemiripan Jaccard) dari yang paling mirip.
+    """
+    store = _get_store()
+    try:
+        with store.lock:
+            pairs = _text_index(store, 'duplicates', NearDuplicateIndex).find(record, threshold, limit)
+            backend = _sqlite_backend()
+            if backend is not None:
+                return [(backend.get(doc_id), score) for doc_id, score in pairs]
+            return [(store.records[store.positions[doc_id]], score) for doc_id, score in pairs]
+    except Exception as e:
+        print(f"Error finding near duplicates: {e}")
+        return []
+
+def _facet_index(store, field):
+    """FacetIndex field list backend JSON; harus dipanggil saat store.lock dipegang"""
+    _ensure_loaded(store)
+    return _get_index(store, f'facet:{field}', partial(FacetIndex, field))
+
+@_across_collections(_merge_facets, route=_route_by_filter)
+def _facet_counts(field, status=None, tahun=None, bidang=None, institusi=None, text=None):
+    filters = {'status': status, 'tahun': tahun, 'bidang': bidang, 'institusi': institusi}
+    backend = _sqlite_backend()
+    if backend is not None:
+        # Dihitung dengan GROUP BY pada kolom istilah ternormalisasi
+        return backend.facet_counts(field, filters, text)
+    store = _get_store()
+    with store.lock:
+        index = _facet_index(store, field)
+        if all(value is None for value in filters.values()) and not text:
+            return index.most_common()
+        return index.most_common(doc_ids=_query_ids(store, filters, text))
+
+@profiled()
+def get_facet_counts(field, limit=None, status=None, tahun=None, bidang=None, institusi=None, text=None):
+    """Jumlah record per istilah field list (FACET_FIELDS), dari yang terbanyak.
+
+    Istilah dicocokkan dalam bentuk ternormalisasi sehingga "AI" dan "ai",
+    atau "Machine Learning" dan "machine-learning", dihitung sebagai satu
+    istilah dengan ejaan yang paling sering dipakai sebagai label. Filter
+    sama dengan query_research. Mengembalikan list (label, jumlah).
+    """
+    if field not in FACET_FIELDS:
+        raise ValueError(f"Field {field} tidak memiliki facet")
+    try:
+        counts = _facet_counts(field, status, tahun, bidang, institusi, text)
+    except Exception as e:
+        print(f"Error counting facets: {e}")
+        return []
+    return counts[:limit] if limit is not None else counts
+
+@_across_collections(_merge_facets)
+def _suggestions(field, prefix):
+    backend = _sqlite_backend()
+    if backend is not None:
+        return backend.facet_counts(field, prefix=prefix)
+    store = _get_store()
+    with store.lock:
+        return _facet_index(store, field).suggest(prefix, None)
+
+@profiled()
+def suggest_terms(field, prefix, limit=10):
+    """Saran isian (autocomplete) dari kamus istilah: list (label, jumlah) berawalan prefix"""
+    if field not in FACET_FIELDS:
+        raise ValueError(f"Field {field} tidak memiliki facet")
+    try:
+        # Semua kandidat diambil agar urutan gabungan lintas shard tepat
+        return _suggestions(field, prefix)[:limit]
+    except Exception as e:
+        print(f"Error suggesting terms: {e}")
+        return []
+
+def canonical_terms(field, values):
+    """Ejaan baku istilah masukan: istilah yang sudah dikenal memakai label kamus.
+
+    Istilah kosong dan duplikat (menurut bentuk ternormalisasi) dibuang;
+    istilah baru dipertahankan dengan spasi dirapikan.
+    """
+    known = {normalize_term(label): label for label, _ in reversed(get_facet_counts(field))}
+    terms, seen = [], set()
+    for value in values:
+        key = normalize_term(value)
+        if key and key not in seen:
+            seen.add(key)
+            terms.append(known.get(key) or clean_label(value))
+    return terms
+
+@profiled()
+@_across_collections(_merge_first, route=_route_by_id)
+def get_research_detail(research_id):
+    """Record lengkap (termasuk teks panjang) sebagai dict, atau None.
+
+    Record di store menyimpan teks panjang (abstrak, latar belakang, dst.)
+    di disk; fungsi ini memuatnya untuk halaman detail dan ekspor per record.
+    """
+    store = _get_store()
+    try:
+        backend = _sqlite_backend()
+        if backend is not None:
+            return backend.get(research_id)
+        with store.lock:
+            _ensure_loaded(store)
+            pos = store.positions.get(research_id)
+            if pos is None:
+                return None
+            return store.records[pos].to_dict()
+    except Exception as e:
+        print(f"Error loading research detail: {e}")
+        return None
+
+@profiled()
+@_across_collections(_merge_sum)
+def count_research():
+    """Jumlah seluruh penelitian di store"""
+    store = _get_store()
+    try:
+        backend = _sqlite_backend()
+        if backend is not None:
+            return backend.count()
+        with store.lock:
+            _ensure_loaded(store)
+            return len(store.records)
+    except Exception as e:
+        print(f"Error counting data: {e}")
+        return 0
+
+@profiled()
+@_across_collections(_merge_counts)
+def count_research_by(field):
+    """Jumlah penelitian per nilai field terindeks (status, tahun, bidang, institusi)"""
+    if field not in INDEXED_FIELDS:
+        raise ValueError(f"Field {field} tidak diindeks")
+    store = _get_store()
+    try:
+        backend = _sqlite_backend()
+        if backend is not None:
+            return backend.count_by(field)
+        with store.lock:
+            _ensure_loaded(store)
+            return _field_index(store, field).counts()
+    except Exception as e:
+        print(f"Error counting data: {e}")
+        return {}
+
+@profiled()
+@_across_collections(_merge_aggregates)
+def get_research_aggregates():
+    """Statistik agregat (status, tahun, bidang, kata kunci, bulan) yang terpelihara.
+
+    Agregat diperbarui inkremental saat record ditambahkan sehingga biayanya
+    sebanding jumlah bucket, bukan jumlah record.
+    """
+    store = _get_store()
+    try:
+        backend = _sqlite_backend()
+        if backend is not None:
+            return backend.aggregates()
+        with store.lock:
+            _ensure_loaded(store)
+            return _get_index(store, 'aggregates', ResearchAggregates).snapshot()
+    except Exception as e:
+        print(f"Error computing aggregates: {e}")
+        return ResearchAggregates().snapshot()
+
+@profiled()
+@_across_collections(_merge_aggregates)
+def rebuild_research_aggregates():
+    """Hitung ulang agregat dari nol, misalnya setelah data diubah manual"""
+    if _sqlite_backend() is not None:
+        return get_research_aggregates()
+    store = _get_store()
+    with store.lock:
+        _ensure_loaded(store)
+        store.indexes.pop('aggregates', None)
+    return get_research_aggregates()
+
+@profiled()
+def get_research_frames():
+    """DataFrame kolumnar bertipe untuk halaman analisis, dibangun sekali per generasi data.
+
+    Lihat build_research_frames untuk isi dict. DataFrame dipakai bersama
+    oleh semua sesi sehingga tidak boleh diubah di tempat oleh pemanggil.
+    """
+    store = _get_store()
+    try:
+        if _all_collections():
+            # Gabungan semua koleksi, dibangun ulang jika salah satu shard berubah
+            generation = get_data_generation()
+            cached = _frames_cache.get(None)
+            if cached is None or cached[0] != generation:
+                cached = _frames_cache[None] = (generation, build_research_frames(_load_records()))
+            return cached[1]
+        backend = _sqlite_backend()
+        if backend is not None:
+            version = backend.version()
+            cached = _frames_cache.get(backend.path)
+            if cached is None or cached[0] != version:
+                # Hanya kolom yang dipakai DataFrame, tanpa teks panjang
+                cached = _frames_cache[backend.path] = (version, build_research_frames(backend.frame_records()))
+            return cached[1]
+        with store.lock:
+            _ensure_loaded(store)
+            if store.frames_generation != store.generation:
+                store.frames = build_research_frames(store.records)
+                store.frames_generation = store.generation
+            return store.frames
+    except Exception as e:
+        print(f"Error building frames: {e}")
+        return build_research_frames([])
+
+@_across_collections(lambda results, params: tuple(results))
+def get_data_generation():
+    """Nomor generasi data saat ini, naik setiap kali data dimuat ulang atau disimpan.
+
+    Dengan sharding berupa (slug, generasi) per koleksi, atau tuple seluruh
+    koleksi jika tidak ada koleksi terpilih.
+    """
+    backend = _sqlite_backend()
+    if backend is not None:
+        return _tag_collection(backend.version())
+    store = _get_store()
+    with store.lock:
+        try:
+            _ensure_loaded(store)
+        except Exception as e:
+            print(f"Error loading data: {e}")
+        return _tag_collection(store.generation)
+
+def _tag_collection(value):
+    """Pasangkan nilai per shard dengan slug koleksinya agar tidak tertukar antar shard"""
+    if SHARD_BY is None:
+        return value
+    return (_active_collection.get() or DEFAULT_COLLECTION, value)
+
+@_across_collections(_merge_stats)
+def get_store_stats():
+    """Statistik cache store: jumlah hit/miss, generasi, dan jumlah record"""
+    backend = _sqlite_backend()
+    if backend is not None:
+        stats = backend.stats()
+        return {
+            'backend': 'sqlite',
+            'hits': 0,
+            'misses': 0,
+            'generation': stats['version'],
+            'records': stats['records'],
+            'queries': stats['queries'],
+        }
+    store = _get_store()
+    with store.lock:
+        return {
+            'backend': 'json',
+            'hits': store.hits,
+            'misses': store.misses,
+            'generation': store.generation,
+            'records': len(store.records) if store.records is not None else 0,
+        }
+
+@_across_collections(lambda results, params: "|".join(results))
+def get_data_version():
+    """Versi (ETag) data di disk, berubah setiap kali snapshot atau journal ditulis.
+
+    Berbeda dengan generasi, versi ini sama di semua proses sehingga bisa
+    dipakai untuk pemeriksaan optimistik saat menyimpan. Dengan sharding
+    setiap versi shard diawali slug koleksinya ("slug:versi", dipisah "|").
+    """
+    backend = _sqlite_backend()
+    if backend is not None:
+        return _version_string(f"sqlite-{backend.version()}")
+    store = _get_store()
+    with store.lock:
+        try:
+            _ensure_loaded(store)
+        except Exception as e:
+            print(f"Error loading data: {e}")
+        return _version_string(_format_version(store.signature))
+
+def _version_string(version):
+    return "%s:%s" % _tag_collection(version) if SHARD_BY is not None else version
+
+def _format_version(signature):
+    snapshot, journal = signature or (None, None)
+    parts = [snapshot or (0, 0), journal or (0, 0)]
+    return "-".join(f"{mtime:x}.{size:x}" for mtime, size in parts)
+
+def _allocate_ids(store, count):
+    """Ambil rentang id berikutnya; harus dipanggil saat store terkunci.
+
+    Dengan sharding id diambil dari urutan bersama di registry agar unik
+    di semua koleksi.
+    """
+    registry = _registry_store() if SHARD_BY is not None else store
+    if registry is not store:
+        with _locked(registry):
+            registry.max_id = max(registry.max_id, store.max_id)
+            ids = _allocate_ids(registry, count)
+        store.max_id = max(store.max_id, ids[-1])
+        return ids
+    first = max(_read_seq(store), store.max_id) + 1
+    new_id = first + count - 1
+    _atomic_write(store.seq_path, lambda f: f.write(str(new_id)))
+    store.max_id = new_id
+    return range(first, new_id + 1)
+
+def _allocate_id(store):
+    """Ambil id berikutnya; harus dipanggil saat store terkunci"""
+    return _allocate_ids(store, 1)[0]
+
+@profiled()
+def allocate_research_id():
+    """Alokasikan id penelitian baru yang unik dan tidak pernah dipakai ulang"""
+    if SHARD_BY is not None:
+        _ensure_sharded()
+        with _locked(_registry_store()):
+            return _allocate_id(_registry_store())
+    backend = _sqlite_backend()
+    if backend is not None:
+        return backend.allocate_id()
+    store = _get_store()
+    with _locked(store):
+        _ensure_loaded(store)
+        return _allocate_id(store)
+
+def _merge_concurrent(data, current):
+    """Gabungkan record yang ditambahkan penulis lain ke data yang akan disimpan.
+
+    Record dengan id yang sama mengikuti versi pemanggil; record lain dari
+    disk yang tidak ada di data pemanggil dipertahankan.
+    """
+    ids = {r.get('id') for r in data}
+    return list(data) + [r for r in current if r.get('id') not in ids]
+
+@profiled()
+def save_research_data(data, expected_version=None):
+    """Menyimpan data penelitian ke file JSON.
+
+    Jika expected_version diberikan dan data di disk sudah diubah penulis
+    lain sejak versi tersebut, record milik penulis lain digabungkan alih-alih
+    ditimpa. Dengan sharding tanpa koleksi terpilih data dibagi ulang ke
+    shard menurut field SHARD_BY; koleksi yang tidak lagi punya record dikosongkan.
+    """
+    if _all_collections():
+        return _save_across_collections(data, expected_version)
+    if SHARD_BY is not None and expected_version is not None:
+        expected_version = _split_version(expected_version).get(_active_collection.get() or DEFAULT_COLLECTION)
+    store = _get_store()
+    try:
+        if SHARD_BY is not None:
+            # Id yang disimpan di shard ini tidak boleh dialokasikan ulang di shard lain
+            _reserve_ids(data)
+        backend = _sqlite_backend()
+        if backend is not None:
+            version = None
+            if isinstance(expected_version, str) and expected_version.startswith("sqlite-"):
+                version = int(expected_version.split("-", 1)[1])
+            backend.replace_all([coerce_record(r).to_dict() for r in data], expected_version=version)
+            return True
+        data = [coerce_record(r) for r in data]
+        with _locked(store):
+            _ensure_loaded(store)
+            if expected_version is not None and expected_version != _format_version(store.signature):
+                data = _merge_concurrent(data, store.records)
+            # Delta backup dihitung dari record yang ditulis, terhadap snapshot lama
+            base_signature = store.signature[0]
+            upsert, delete = _saved_changes(store, data, _journal_ids(store))
+
+            # Simpan ke file secara atomik; teks panjang record ringkas
+            # dibaca dari file lama selama snapshot baru ditulis
+            sources = _write_snapshot(store.path, data, store)
+            _resummarize(store, data, [('snapshot',) + s for s in sources])
+            store.details.clear()
+
+            # Snapshot sudah memuat semua record, journal dikosongkan
+            if os.path.exists(store.journal_path):
+                os.remove(store.journal_path)
+            store.journal_entries = 0
+
+            # Perbarui cache langsung tanpa parse ulang file
+            store.records = data
+            store.snapshot_count = len(data)
+            store.positions = _build_positions(store.records)
+            store.indexes = {}
+            store.max_id = _max_id(store.records, store.max_id)
+            store.signature = _store_signature(store)
+            store.generation += 1
+
+            # Backup inkremental: hanya record yang berubah yang ditulis
+            _backup_snapshot(store, upsert, delete, base_signature)
+
         return True
     except Exception as e:
         print(f"Error saving data: {e}")
         return False
 
+def _split_version(version):
+    """Versi gabungan "slug:versi|..." dari get_data_version sebagai {slug: versi}"""
+    return dict(part.split(":", 1) for part in version.split("|") if ":" in part)
+
+def _save_across_collections(data, expected_version):
+    versions = _split_version(expected_version) if expected_version is not None else {}
+    groups = {slug: [] for slug in _collections()}
+    for record in data:
+        slug, name = _record_collection(record)
+        if slug not in groups:
+            _register_collection(slug, name)
+            groups[slug] = []
+        groups[slug].append(record)
+    ok = True
+    for slug, group in groups.items():
+        with use_collection(slug):
+            version = versions.get(slug)
+            ok = save_research_data(group, f"{slug}:{version}" if version else None) and ok
+    return ok
+
+def _group_by_collection(records, reassign_taken):
+    """Kelompokkan record baru per shard tujuan dan siapkan id yang unik di semua shard.
+
+    Record tanpa id diberi id dari urutan bersama. Record dengan id yang sudah
+    dipakai (di shard mana pun, atau di record sebelumnya) diberi id baru jika
+    reassign_taken, selain itu dibuang. Mengembalikan ({slug: [record]},
+    jumlah yang dibuang).
+    """
+    _ensure_sharded()
+    registry = _registry_store()
+    with registry.lock:
+        # Id di atas urutan bersama belum pernah dipakai, tidak perlu dicari di shard
+        last_id = max(_read_seq(registry), registry.max_id)
+    groups, seen, missing, dropped = {}, set(), [], 0
+    for record in records:
+        record_id = record.get('id')
+        taken = record_id is not None and (record_id in seen or (
+            isinstance(record_id, int) and record_id <= last_id and _collection_of(record_id) is not None))
+        if taken and not reassign_taken:
+            dropped += 1
+            continue
+        if record_id is None or taken:
+            missing.append(record)
+        else:
+            seen.add(record_id)
+        slug, name = _record_collection(record)
+        _register_collection(slug, name)
+        groups.setdefault(slug, []).append(record)
+    # Id eksplisit menggeser urutan bersama agar id baru selalu di atasnya
+    _reserve_ids(records)
+    if missing:
+        with _locked(registry):
+            for record, new_id in zip(missing, _allocate_ids(registry, len(missing))):
+                if isinstance(record, ResearchRecord):
+                    record.id = new_id
+                else:
+                    record['id'] = new_id
+    return groups, dropped
+
+@profiled()
+def append_research_data(record):
+    """Menambahkan satu record ke journal tanpa menulis ulang seluruh data.
+
+    Record tanpa id (atau dengan id yang sudah dipakai) diberi id baru dari
+    alokator; id yang dipakai ditulis kembali ke dict record. Dengan sharding
+    record masuk ke koleksi menurut field SHARD_BY-nya.
+    """
+    if SHARD_BY is not None:
+        try:
+            groups, _ = _group_by_collection([record], reassign_taken=True)
+        except Exception as e:
+            print(f"Error appending data: {e}")
+            return False
+        (slug, _), = groups.items()
+        with use_collection(slug):
+            return _append_record(record)
+    return _append_record(record)
+
+def _append_record(record):
+    store = _get_store()
+    try:
+        typed = coerce_record(record)
+        backend = _sqlite_backend()
+        if backend is not None:
+            data = typed.to_dict()
+            before = backend.version()
+            backend.append(data)
+            record['id'] = data['id']
+            _sqlite_indexed(store, backend, before, [data])
+            return True
+        with _locked(store):
+            _ensure_loaded(store)
+            if typed.get('id') is None or typed.get('id') in store.positions:
+                typed.id = _allocate_id(store)
+            record['id'] = typed.id
+            _append_journal(store, [typed])
+
+        return True
+    except Exception as e:
+        print(f"Error appending data: {e}")
+        return False
+
+@profiled()
+def append_research_batch(records, compact=True, skip_near_duplicates=False):
+    """Menambahkan sekumpulan record ke journal dalam satu penulisan.
+
+    Record dengan id yang sudah ada (di data maupun di batch) dilewati,
+    record tanpa id diberi id baru. Dengan skip_near_duplicates=True record
+    yang hampir sama dengan data yang ada atau record lain di batch (lihat
+    find_near_duplicates) juga dilewati. Dengan compact=False pemadatan
+    otomatis ditunda (misalnya selama impor besar). Mengembalikan dict berisi
+    jumlah 'added', 'duplicates' dan 'near_duplicates'.
+
+    Dengan sharding setiap record masuk ke koleksi menurut field SHARD_BY-nya;
+    hampir-duplikat dicari di dalam koleksi yang sama.
+    """
+    if SHARD_BY is None:
+        return _append_records(records, compact, skip_near_duplicates)
+    try:
+        groups, dropped = _group_by_collection(records, reassign_taken=False)
+    except Exception as e:
+        print(f"Error appending data: {e}")
+        return None
+    report = {'added': 0, 'duplicates': dropped, 'near_duplicates': 0}
+    for slug, group in groups.items():
+        with use_collection(slug):
+            result = _append_records(group, compact, skip_near_duplicates)
+        if result is None:
+            return None
+        for key, value in result.items():
+            report[key] += value
+    return report
+
+def _append_records(records, compact, skip_near_duplicates):
+    store = _get_store()
+    try:
+        records = [coerce_record(r) for r in records]
+        backend = _sqlite_backend()
+        if backend is not None:
+            with store.lock:
+                near = 0
+                if skip_near_duplicates:
+                    index = _text_index(store, 'duplicates', NearDuplicateIndex)
+                    records, near = _drop_near_duplicates(records, index)
+                before = backend.version()
+                # Record batch ini (id-nya diisi saat disimpan) langsung masuk indeks
+                # agar batch berikutnya tidak membangun ulang dari database
+                added, duplicates = backend.append_many([r.to_dict() for r in records])
+                _sqlite_indexed(store, backend, before, added)
+            return {'added': len(added), 'duplicates': duplicates, 'near_duplicates': near}
+        with _locked(store):
+            _ensure_loaded(store)
+            near = 0
+            if skip_near_duplicates:
+                index = _get_index(store, 'duplicates', NearDuplicateIndex, full_text=True)
+                records, near = _drop_near_duplicates(records, index)
+            batch, seen, missing = [], set(), []
+            for record in records:
+                record_id = record.get('id')
+                if record_id is None:
+                    missing.append(record)
+                elif record_id in store.positions or record_id in seen:
+                    continue
+                else:
+                    seen.add(record_id)
+                batch.append(record)
+            duplicates = len(records) - len(batch)
+            if missing:
+                # Id baru harus di atas id yang dibawa batch ini
+                store.max_id = _max_id(batch, store.max_id)
+                for record, new_id in zip(missing, _allocate_ids(store, len(missing))):
+                    record.id = new_id
+            if not batch:
+                return {'added': 0, 'duplicates': duplicates, 'near_duplicates': near}
+            _append_journal(store, batch, compact=compact)
+
+        return {'added': len(batch), 'duplicates': duplicates, 'near_duplicates': near}
+    except Exception as e:
+        print(f"Error appending data: {e}")
+        return None
+
+def _drop_near_duplicates(records, index):
+    """Pisahkan record yang hampir sama dengan isi indeks atau record sebelumnya di batch.
+
+    Mengembalikan (record yang lolos, jumlah yang dibuang).
+    """
+    kept, local = [], NearDuplicateIndex()
+    for i, record in enumerate(records):
+        if index.find(record, limit=1) or local.find(record, limit=1):
+            continue
+        kept.append(record)
+        # Id sementara: record tanpa id tetap bisa dicocokkan dengan sesamanya
+        local.add({'id': ('batch', i), 'judul': record.get('judul'), 'abstrak': record.get('abstrak')})
+    return kept, len(records) - len(kept)
+
+@profiled()
+def update_research_data(research_id, changes):
+    """Mengubah field sebuah record lewat journal (entri dengan id sama menimpa record lama).
+
+    Mengembalikan True jika record ditemukan dan perubahan tersimpan. Dengan
+    sharding record tidak bisa dipindah ke koleksi lain lewat perubahan field
+    SHARD_BY.
+    """
+    if SHARD_BY is not None:
+        _ensure_sharded()
+        slug = _collection_of(research_id)
+        if slug is None:
+            return False
+        if SHARD_BY in changes and _record_collection(changes)[0] != slug:
+            print(f"Error updating data: {SHARD_BY} tidak bisa dipindah ke koleksi lain")
+            return False
+        if slug != _active_collection.get():
+            with use_collection(slug):
+                return update_research_data(research_id, changes)
+    store = _get_store()
+    try:
+        backend = _sqlite_backend()
+        if backend is not None:
+            current = backend.get(research_id)
+            if current is None:
+                return False
+            current.update(changes)
+            row = coerce_record(current).to_dict()
+            before = backend.version()
+            backend.upsert_many([row])
+            _sqlite_indexed(store, backend, before, [row])
+            return True
+        with _locked(store):
+            _ensure_loaded(store)
+            pos = store.positions.get(research_id)
+            if pos is None:
+                return False
+            updated = store.records[pos].to_dict()
+            updated.update(changes)
+            _append_journal(store, [coerce_record(updated)])
+        return True
+    except Exception as e:
+        print(f"Error updating data: {e}")
+        return False
+
+@profiled()
+@_across_collections(_merge_all)
+def compact_research_data():
+    """Memadatkan journal ke dalam snapshot utama.
+
+    Snapshot ditulis di luar lock sehingga pembaca tidak tertahan; entri
+    journal yang masuk selama proses berjalan tetap dipertahankan.
+    """
+    if _sqlite_backend() is not None:
+        # SQLite tidak memakai journal JSON
+        return True
+    store = _get_store()
+    tmp_path = None
+    try:
+        with _locked(store):
+            _ensure_loaded(store)
+            records = list(store.records)
+            snapshot_signature, journal_signature = store.signature
+            journal_offset = journal_signature[1] if journal_signature else 0
+
+        directory = os.path.dirname(store.path) or "."
+        fd, tmp_path = tempfile.mkstemp(prefix="research_data.", suffix=".compact.tmp", dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            sources = _dump_snapshot(f, records, store)
+            f.flush()
+            os.fsync(f.fileno())
+        _match_mode(tmp_path, store.path)
+
+        with _locked(store):
+            # Entri journal dari proses lain harus sudah ada di memori sebelum
+            # tanda tangan store diperbarui di bawah
+            _ensure_loaded(store)
+            if store.signature[0] != snapshot_signature:
+                # Snapshot sudah diganti penulis lain, hasil pemadatan ini basi
+                return False
+            # Record dari entri journal yang dipadatkan adalah delta backup snapshot baru
+            compacted = _journal_ids(store, end=journal_offset)
+            # Sisakan entri yang ditambahkan selama snapshot ditulis
+            remaining = b""
+            if os.path.exists(store.journal_path):
+                with open(store.journal_path, 'rb') as f:
+                    f.seek(journal_offset)
+                    remaining = f.read()
+            os.replace(tmp_path, store.path)
+            tmp_path = None
+            if remaining:
+                _atomic_write(store.journal_path, lambda f: f.write(remaining), binary=True)
+                count('byte_ditulis', len(remaining))
+            elif os.path.exists(store.journal_path):
+                os.remove(store.journal_path)
+            # Record yang dipadatkan kini dibaca dari snapshot baru, entri
+            # journal yang tersisa bergeser ke awal file
+            _resummarize(store, records, [('snapshot',) + s for s in sources])
+            for record in store.records:
+                source = summary_source(record)
+                if source is not None and source[0] == 'journal' and source[1] >= journal_offset:
+                    summarize_record(record, store.loader, ('journal', source[1] - journal_offset, source[2]))
+            store.details.clear()
+            store.journal_entries = remaining.count(b"\n")
+            store.snapshot_count = len(records)
+            store.signature = _store_signature(store)
+
+            upsert = None if None in compacted else [r for r in records if r.get('id') in compacted]
+            _backup_snapshot(store, upsert, (), snapshot_signature)
+        return True
+    except Exception as e:
+        print(f"Error compacting data: {e}")
+        return False
+    finally:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        store.compacting = False
+
 def export_to_csv(data, filename="research_export.csv"):
     """Ekspor data ke format CSV"""
     try:
-        df = pd.DataFrame(data)
-        df.to_csv(filename, index=False, encoding='utf-8')
+        # Ditulis bertahap tanpa membangun DataFrame seluruh data
+        from utils.exporter import write_export
+        write_export(data, 'csv', filename)
         return True
     except Exception as e:
         print(f"Error exporting to CSV: {e}")
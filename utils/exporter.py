@@ -0,0 +1,174 @@
+# utils/exporter.py
+import csv
+import hashlib
+import io
+import json
+import os
+import tempfile
+from utils import data_handler
+from utils.data_handler import get_data_version, iter_full_records, query_research
+from utils.profiler import profiled
+from utils.schema import record_to_json
+
+# Format ekspor: ekstensi file dan MIME type
+EXPORT_FORMATS = {
+    'json': ('json', 'application/json'),
+    'jsonl': ('jsonl', 'application/x-ndjson'),
+    'csv': ('csv', 'text/csv'),
+    'xlsx': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+# Jumlah record per potongan tulis dan jumlah file ekspor yang disimpan
+EXPORT_CHUNK_SIZE = 500
+EXPORT_CACHE_FILES = 8
+
+# Pemisah nilai list (bidang, kata kunci) di CSV/Excel
+LIST_SEPARATOR = "; "
+
+# Encoder dipakai ulang; json.dumps dengan argumen membuat encoder baru setiap panggilan
+_JSON_INDENTED = json.JSONEncoder(indent=2, ensure_ascii=False, default=record_to_json)
+_JSON_COMPACT = json.JSONEncoder(ensure_ascii=False, default=record_to_json)
+
+def _chunked(records, size):
+    """Potongan records sebagai dict lengkap (teks panjang dibaca per potongan)"""
+    for start in range(0, len(records), size):
+        yield list(iter_full_records(records[start:start + size]))
+
+def export_columns(records):
+    """Gabungan nama kolom semua record, sesuai urutan kemunculan"""
+    columns = {}
+    for record in records:
+        columns.update(dict.fromkeys(record))
+    return list(columns)
+
+def flatten_value(value):
+    """Nilai sel CSV/Excel: list digabung, dict sebagai JSON, None sebagai kosong"""
+    if isinstance(value, str):
+        return value
+    if value is None:
+        return ""
+    if isinstance(value, (list, tuple)):
+        return LIST_SEPARATOR.join(json.dumps(v, ensure_ascii=False) if isinstance(v, dict) else str(v)
+                                   for v in value)
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+def iter_json(records):
+    """Array JSON (indent 2) dalam potongan teks, sama dengan json.dumps(records, indent=2)"""
+    if not records:
+        yield "[]"
+        return
+    first = True
+    for chunk in _chunked(records, EXPORT_CHUNK_SIZE):
+        # Potongan di-encode sebagai array lalu tanda kurungnya dibuang,
+        # elemennya sudah berindentasi sama dengan array penuh
+        yield ("[\n" if first else ",\n") + _JSON_INDENTED.encode(chunk)[2:-2]
+        first = False
+    yield "\n]"
+
+def iter_jsonl(records):
+    """JSON Lines dalam potongan teks"""
+    for chunk in _chunked(records, EXPORT_CHUNK_SIZE):
+        yield "".join(_JSON_COMPACT.encode(r) + "\n" for r in chunk)
+
+def iter_csv(records, columns=None):
+    """CSV dalam potongan teks; kolom list diratakan menjadi satu sel"""
+    columns = columns or export_columns(records)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for chunk in _chunked(records, EXPORT_CHUNK_SIZE):
+        writer.writerows([flatten_value(r.get(c)) for c in columns] for r in chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def write_xlsx(records, path):
+    """Tulis Excel dengan mode write-only openpyxl (baris di-stream ke file)"""
+    from openpyxl import Workbook
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+    def cell(value):
+        value = flatten_value(value)
+        # Karakter kontrol tidak diizinkan di file Excel
+        return ILLEGAL_CHARACTERS_RE.sub("", value) if isinstance(value, str) else value
+
+    columns = export_columns(records)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Penelitian")
+    sheet.append(columns)
+    for record in iter_full_records(records):
+        sheet.append([cell(record.get(c)) for c in columns])
+    workbook.save(path)
+
+def write_export(records, fmt, path):
+    """Tulis records ke path dalam format tertentu"""
+    if fmt == 'xlsx':
+        write_xlsx(records, path)
+        return
+    chunks = {'json': iter_json, 'jsonl': iter_jsonl, 'csv': iter_csv}[fmt](records)
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+def _export_dir():
+    return os.path.join(os.path.dirname(data_handler.DATA_FILE) or ".", "exports")
+
+def _export_path(fmt, filters):
+    """Path file ekspor untuk versi data, format, dan filter tertentu"""
+    active = {k: v for k, v in filters.items() if v not in (None, "", [])}
+    key = json.dumps([get_data_version(), fmt, active], sort_keys=True, default=str)
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=10).hexdigest()
+    return os.path.join(_export_dir(), f"research_{digest}.{EXPORT_FORMATS[fmt][0]}"), active
+
+def _prune_exports(directory):
+    """Hapus file ekspor lama, sisakan EXPORT_CACHE_FILES terbaru"""
+    files = [os.path.join(directory, name) for name in os.listdir(directory)
+             if name.startswith("research_") and not name.endswith(".tmp")]
+    files.sort(key=os.path.getmtime, reverse=True)
+    for path in files[EXPORT_CACHE_FILES:]:
+        os.remove(path)
+
+def cached_export_path(fmt, **filters):
+    """Path file ekspor yang sudah dibuat untuk versi data saat ini, atau None"""
+    try:
+        path, _ = _export_path(fmt, filters)
+        return path if os.path.exists(path) else None
+    except Exception as e:
+        print(f"Error checking export cache: {e}")
+        return None
+
+@profiled(category='export')
+def export_research(fmt, status=None, tahun=None, bidang=None, institusi=None, text=None):
+    """Buat file ekspor data penelitian dan kembalikan path-nya.
+
+    Tanpa filter seluruh data diekspor; dengan filter hanya hasil
+    query_research. File disimpan per versi data sehingga unduhan berulang
+    tidak membangun ulang file.
+    """
+    try:
+        filters = {'status': status, 'tahun': tahun, 'bidang': bidang,
+                   'institusi': institusi, 'text': text}
+        path, active = _export_path(fmt, filters)
+        if os.path.exists(path):
+            return path
+        # Tanpa filter query_research mengembalikan seluruh data; teks panjang dibaca per potongan
+        records = query_research(**active)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix="export.", suffix=".tmp", dir=directory)
+        os.close(fd)
+        try:
+            write_export(records, fmt, tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        _prune_exports(directory)
+        return path
+    except Exception as e:
+        print(f"Error exporting data: {e}")
+        return None
@@ -0,0 +1,201 @@
+# utils/facets.py
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+# Tanda hubung, garis bawah, dan garis miring dianggap spasi: "machine-learning" == "Machine Learning"
+_SEPARATOR_RE = re.compile(r"[\s\-_/]+")
+
+@lru_cache(maxsize=65536)
+def normalize_term(value):
+    """Bentuk baku istilah untuk pencocokan: huruf kecil, spasi tunggal; '' jika kosong.
+
+    Istilah sangat berulang antar record, hasilnya di-cache.
+    """
+    if value is None:
+        return ''
+    text = unicodedata.normalize('NFKC', str(value)).casefold()
+    return _SEPARATOR_RE.sub(" ", text).strip()
+
+def clean_label(value):
+    """Ejaan asli istilah dengan spasi dirapikan, untuk ditampilkan"""
+    return " ".join(str(value).split())
+
+class FacetDictionary:
+    """Kamus istilah ternormalisasi -> id bulat berurutan.
+
+    Setiap istilah disimpan sekali; label tampilannya adalah ejaan asli yang
+    paling sering dipakai. Prefiks dicari dengan bisect pada daftar istilah
+    terurut yang dibangun ulang hanya setelah ada istilah baru.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.terms = []
+        self.spellings = []
+        self.labels = []
+        self._sorted_terms = None
+        self._sorted_ids = None
+
+    def __len__(self):
+        return len(self.terms)
+
+    def lookup(self, value):
+        """Id istilah, atau None jika belum ada di kamus"""
+        return self.ids.get(normalize_term(value))
+
+    def intern(self, value):
+        """Id istilah (ditambahkan jika baru); None untuk istilah kosong"""
+        term = normalize_term(value)
+        if not term:
+            return None
+        term_id = self.ids.get(term)
+        if term_id is None:
+            term_id = self.ids[term] = len(self.terms)
+            self.terms.append(term)
+            self.spellings.append(Counter())
+            self.labels.append(None)
+            self._sorted_terms = None
+        self.spellings[term_id][clean_label(value)] += 1
+        self.labels[term_id] = None
+        return term_id
+
+    def release(self, term_id, value):
+        """Kurangi hitungan ejaan value (record yang memakainya dihapus)"""
+        spellings = self.spellings[term_id]
+        label = clean_label(value)
+        spellings[label] -= 1
+        if spellings[label] <= 0:
+            del spellings[label]
+        self.labels[term_id] = None
+
+    def label(self, term_id):
+        label = self.labels[term_id]
+        if label is None:
+            common = self.spellings[term_id].most_common(1)
+            label = self.labels[term_id] = common[0][0] if common else self.terms[term_id]
+        return label
+
+    def prefix_ids(self, prefix):
+        """Id semua istilah yang diawali prefix (setelah dinormalisasi)"""
+        if self._sorted_terms is None:
+            order = sorted(range(len(self.terms)), key=self.terms.__getitem__)
+            self._sorted_terms = [self.terms[i] for i in order]
+            self._sorted_ids = np.array(order, dtype=np.int32)
+        prefix = normalize_term(prefix)
+        start = bisect_left(self._sorted_terms, prefix)
+        end = bisect_left(self._sorted_terms, prefix + "\U0010ffff", start)
+        return self._sorted_ids[start:end]
+
+class FacetIndex:
+    """Indeks facet field list (bidang, kata_kunci) di atas FacetDictionary.
+
+    Setiap record disimpan sebagai array id istilah (int32, tanpa duplikat)
+    dan jumlah record per istilah dipelihara dalam satu array NumPy, sehingga
+    facet seluruh data langsung tersedia dan facet sebagian record cukup
+    dihitung dengan np.bincount. Ejaan asli setiap record juga disimpan agar
+    hitungan ejaan di kamus bisa dikurangi saat record diganti atau dihapus.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self.dictionary = FacetDictionary()
+        self.rows = {}
+        self.values = {}
+        self._counts = np.zeros(0, dtype=np.int64)
+
+    @property
+    def counts(self):
+        """Jumlah record per id istilah"""
+        return self._counts[:len(self.dictionary)]
+
+    def _values(self, record):
+        value = record.get(self.field)
+        if value is None:
+            return ()
+        return [value] if isinstance(value, str) else value
+
+    def _encode(self, values):
+        """Array id istilah dari ejaan asli (istilah baru masuk kamus)"""
+        ids = []
+        for value in values:
+            term_id = self.dictionary.intern(value)
+            if term_id is not None and term_id not in ids:
+                ids.append(term_id)
+        return np.array(ids, dtype=np.int32)
+
+    def _grow(self):
+        size = len(self.dictionary)
+        if size > len(self._counts):
+            counts = np.zeros(max(size, 2 * len(self._counts), 256), dtype=np.int64)
+            counts[:len(self._counts)] = self._counts
+            self._counts = counts
+
+    def build(self, records):
+        self.__init__(self.field)
+        arrays = []
+        for record in records:
+            values = tuple(self._values(record))
+            ids = self._encode(values)
+            doc_id = record.get('id')
+            if doc_id is not None:
+                self.rows[doc_id] = ids
+                self.values[doc_id] = values
+            arrays.append(ids)
+        flat = np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int32)
+        self._counts = np.bincount(flat, minlength=len(self.dictionary)).astype(np.int64)
+
+    def add(self, record):
+        doc_id = record.get('id')
+        if doc_id in self.rows:
+            self.remove(record)
+        values = tuple(self._values(record))
+        ids = self._encode(values)
+        self._grow()
+        self._counts[ids] += 1
+        if doc_id is not None:
+            self.rows[doc_id] = ids
+            self.values[doc_id] = values
+
+    def remove(self, record):
+        """Lepas record menurut id-nya; isi yang dilepas adalah versi yang tersimpan"""
+        doc_id = record.get('id')
+        ids = self.rows.pop(doc_id, None)
+        if ids is None:
+            return
+        self._counts[ids] -= 1
+        for value in self.values.pop(doc_id):
+            term_id = self.dictionary.lookup(value)
+            if term_id is not None:
+                self.dictionary.release(term_id, value)
+
+    def count_ids(self, doc_ids):
+        """Jumlah record per id istilah, hanya untuk record dengan id di doc_ids"""
+        arrays = [self.rows[d] for d in doc_ids if d in self.rows]
+        flat = np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int32)
+        return np.bincount(flat, minlength=len(self.dictionary))
+
+    def _ranked(self, counts, term_ids=None, limit=None):
+        if term_ids is None:
+            term_ids = np.flatnonzero(counts)
+        else:
+            term_ids = term_ids[counts[term_ids] > 0]
+        # Jumlah terbanyak dulu; seri diurutkan menurut urutan masuk kamus
+        order = term_ids[np.argsort(-counts[term_ids], kind='stable')]
+        if limit is not None:
+            order = order[:limit]
+        label = self.dictionary.label
+        return [(label(i), int(counts[i])) for i in order]
+
+    def most_common(self, limit=None, doc_ids=None):
+        """List (label, jumlah record) dari istilah terbanyak"""
+        counts = self.counts if doc_ids is None else self.count_ids(doc_ids)
+        return self._ranked(counts, limit=limit)
+
+    def suggest(self, prefix, limit=10):
+        """Istilah yang diawali prefix sebagai list (label, jumlah record), terbanyak dulu"""
+        return self._ranked(self.counts, self.dictionary.prefix_ids(prefix), limit)
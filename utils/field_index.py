@@ -0,0 +1,145 @@
+# utils/field_index.py
+import re
+from bisect import bisect_left, insort
+from datetime import date
+
+_DATE_RE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})")
+
+# Field yang diberi indeks hash untuk filter cepat
+INDEXED_FIELDS = ('status', 'tahun', 'bidang', 'institusi')
+
+def normalize_value(field, value):
+    """Samakan representasi nilai agar 2023 dan "2023" jatuh ke kunci yang sama"""
+    if value is None:
+        return None
+    if field == 'tahun':
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return str(value).strip() or None
+    if isinstance(value, str):
+        return value.strip() or None
+    return value
+
+def date_key(value):
+    """Tanggal ISO ('YYYY-MM-DD...') sebagai string terurut, '' jika kosong/tidak valid"""
+    if not value:
+        return ''
+    match = _DATE_RE.match(str(value))
+    if not match:
+        return ''
+    try:
+        return date(*(int(g) for g in match.groups())).isoformat()
+    except ValueError:
+        return ''
+
+class FieldIndex:
+    """Indeks hash nilai field -> himpunan id record.
+
+    Field bernilai list (misalnya bidang) diindeks per elemen.
+    """
+
+    def __init__(self, field):
+        self.field = field
+        self.values = {}
+
+    def build(self, records):
+        self.values = {}
+        for record in records:
+            self.add(record)
+
+    def _keys(self, record):
+        value = record.get(self.field)
+        items = value if isinstance(value, (list, tuple, set)) else [value]
+        keys = {normalize_value(self.field, v) for v in items}
+        keys.discard(None)
+        return keys
+
+    def add(self, record):
+        doc_id = record.get('id')
+        if doc_id is None:
+            return
+        for key in self._keys(record):
+            self.values.setdefault(key, set()).add(doc_id)
+
+    def remove(self, record):
+        doc_id = record.get('id')
+        for key in self._keys(record):
+            ids = self.values.get(key)
+            if ids is None:
+                continue
+            ids.discard(doc_id)
+            if not ids:
+                del self.values[key]
+
+    def lookup(self, value):
+        """Id record dengan nilai tertentu; value boleh berupa list (OR)"""
+        if isinstance(value, (list, tuple, set, frozenset)):
+            ids = set()
+            for v in value:
+                ids.update(self.values.get(normalize_value(self.field, v), ()))
+            return ids
+        return self.values.get(normalize_value(self.field, value), set())
+
+    def counts(self):
+        """Jumlah record per nilai field"""
+        return {key: len(ids) for key, ids in self.values.items()}
+
+def _id_key(doc_id):
+    # Id campuran int/str tetap bisa dibandingkan
+    return (0, doc_id) if isinstance(doc_id, int) else (1, str(doc_id))
+
+class RecencyIndex:
+    """Daftar id terurut menurut tanggal, dipelihara dengan bisect.
+
+    Record dengan tanggal kosong atau tidak valid berada di ujung terlama,
+    sehingga N record terbaru bisa diambil tanpa mengurutkan seluruh data.
+    """
+
+    def __init__(self, field='tanggal_mulai'):
+        self.field = field
+        self.entries = []
+        self.keys = {}
+
+    def build(self, records):
+        self.keys = {}
+        for record in records:
+            doc_id = record.get('id')
+            if doc_id is not None:
+                self.keys[doc_id] = (date_key(record.get(self.field)), _id_key(doc_id), doc_id)
+        self.entries = sorted(self.keys.values())
+
+    def add(self, record):
+        doc_id = record.get('id')
+        if doc_id is None:
+            return
+        if doc_id in self.keys:
+            self.remove(record)
+        key = (date_key(record.get(self.field)), _id_key(doc_id), doc_id)
+        self.keys[doc_id] = key
+        insort(self.entries, key)
+
+    def remove(self, record):
+        key = self.keys.pop(record.get('id'), None)
+        if key is None:
+            return
+        pos = bisect_left(self.entries, key)
+        if pos < len(self.entries) and self.entries[pos] == key:
+            del self.entries[pos]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def latest(self, n):
+        """Id N record terbaru (tanggal terbaru lebih dulu)"""
+        return [doc_id for _, _, doc_id in reversed(self.entries[-n:])] if n > 0 else []
+
+    def ordered_ids(self, descending=True, start=0, stop=None):
+        """Id menurut tanggal, opsional hanya potongan [start:stop] dari urutan itu"""
+        n = len(self.entries)
+        stop = n if stop is None else min(stop, n)
+        if descending:
+            entries = self.entries[n - stop:n - start][::-1] if start < stop else []
+        else:
+            entries = self.entries[start:stop]
+        return [doc_id for _, _, doc_id in entries]
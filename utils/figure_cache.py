@@ -0,0 +1,81 @@
+# utils/figure_cache.py
+import json
+import threading
+from collections import OrderedDict
+from utils.data_handler import get_data_generation
+from utils.profiler import span
+
+# Jumlah grafik (kombinasi id + parameter) yang disimpan
+FIGURE_CACHE_SIZE = 32
+
+class FigureCache:
+    """Cache LRU figure Plotly per (id grafik, parameter filter, generasi data).
+
+    Setiap kombinasi id grafik dan parameter menyimpan satu figure beserta
+    generasi data saat figure dibuat; figure dari generasi lama diganti
+    saat diminta lagi, dan kombinasi yang paling lama tidak dipakai dibuang
+    jika cache penuh.
+    """
+
+    def __init__(self, max_size=FIGURE_CACHE_SIZE):
+        self.max_size = max_size
+        self.figures = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, chart_id, build, generation, params=None):
+        """Figure dari cache, atau hasil build() jika belum ada/basi"""
+        key = (chart_id, json.dumps(params or {}, sort_keys=True, default=str))
+        with self.lock:
+            entry = self.figures.get(key)
+            if entry is not None and entry[0] == generation:
+                self.figures.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        # Figure dibangun di luar lock agar grafik lain tidak ikut tertahan
+        with span(f"grafik:{chart_id}", 'chart'):
+            figure = build()
+        with self.lock:
+            self.figures[key] = (generation, figure)
+            self.figures.move_to_end(key)
+            while len(self.figures) > self.max_size:
+                self.figures.popitem(last=False)
+                self.evictions += 1
+        return figure
+
+    def clear(self):
+        with self.lock:
+            self.figures.clear()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'size': len(self.figures),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+_figure_cache = FigureCache()
+
+def cached_figure(chart_id, build, generation=None, **params):
+    """Figure Plotly untuk grafik chart_id, dibangun ulang hanya jika data/parameter berubah.
+
+    build() membuat figure (boleh None jika tidak ada data untuk digambar).
+    generation sebaiknya diambil sekali per halaman dengan get_data_generation().
+    """
+    try:
+        if generation is None:
+            generation = get_data_generation()
+        return _figure_cache.get(chart_id, build, generation, params)
+    except Exception as e:
+        print(f"Error building figure {chart_id}: {e}")
+        return None
+
+def get_figure_cache_stats():
+    """Statistik cache figure: ukuran, hit, miss, dan jumlah eviction"""
+    return _figure_cache.stats()
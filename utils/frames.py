@@ -0,0 +1,45 @@
+# utils/frames.py
+import pandas as pd
+from utils.profiler import profiled
+
+# Kolom skalar yang dibawa ke tabel utama beserta tipenya
+CATEGORY_COLUMNS = ('status', 'institusi', 'sumber_dana')
+DATE_COLUMNS = ('tanggal_mulai', 'tanggal_selesai')
+
+def _explode(records, field):
+    """Tabel panjang (id, nilai) untuk field bernilai list"""
+    ids, values = [], []
+    for record in records:
+        items = record.get(field) or []
+        if isinstance(items, str):
+            items = [items]
+        for item in items:
+            ids.append(record.get('id'))
+            values.append(item)
+    return pd.DataFrame({'id': ids, field: pd.Categorical(values)})
+
+@profiled(category='frame')
+def build_research_frames(records):
+    """Representasi kolumnar bertipe dari data penelitian.
+
+    Mengembalikan dict berisi:
+    - 'penelitian': satu baris per record; status/institusi/sumber_dana sebagai
+      categorical, tahun sebagai Int64, tanggal sebagai datetime64
+    - 'bidang' dan 'kata_kunci': tabel panjang (id, nilai) hasil explode list
+    """
+    main = pd.DataFrame({
+        'id': [r.get('id') for r in records],
+        'judul': [r.get('judul', '') for r in records],
+        'tahun': pd.to_numeric(pd.Series([r.get('tahun') for r in records], dtype=object),
+                               errors='coerce').astype('Int64'),
+    })
+    for column in CATEGORY_COLUMNS:
+        main[column] = pd.Categorical([r.get(column) for r in records])
+    for column in DATE_COLUMNS:
+        main[column] = pd.to_datetime(pd.Series([r.get(column) for r in records], dtype=object),
+                                      errors='coerce', format='ISO8601')
+    return {
+        'penelitian': main,
+        'bidang': _explode(records, 'bidang'),
+        'kata_kunci': _explode(records, 'kata_kunci'),
+    }
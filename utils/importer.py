@@ -0,0 +1,198 @@
+# utils/importer.py
+import codecs
+import json
+import re
+import time
+from utils.data_handler import append_research_batch
+from utils.profiler import profiled
+from utils.schema import validate_record
+
+# Ukuran potongan baca dan jumlah record per commit
+IMPORT_CHUNK_SIZE = 1 << 16
+IMPORT_BATCH_SIZE = 1000
+
+# Jumlah contoh pesan error yang disimpan di laporan
+MAX_REPORTED_ERRORS = 20
+
+_WHITESPACE_RE = re.compile(r"[ \t\r\n]*")
+
+class _CountingReader:
+    """Pembungkus stream biner yang mencatat jumlah byte terbaca"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self.stream.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def readline(self):
+        data = self.stream.readline()
+        self.bytes_read += len(data)
+        return data
+
+def _chunks(stream, chunk_size):
+    """Potongan teks UTF-8 dari stream biner (BOM di awal diabaikan)"""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+            return
+        text = decoder.decode(data)
+        if text:
+            yield text
+
+def iter_json_array(stream, chunk_size=None):
+    """Parse array JSON secara bertahap, menghasilkan satu elemen setiap kali.
+
+    Hanya potongan yang sedang diproses yang ditahan di memori, sehingga
+    file berukuran ratusan MB tidak perlu dimuat sekaligus.
+    """
+    decoder = json.JSONDecoder()
+    chunks = _chunks(stream, chunk_size or IMPORT_CHUNK_SIZE)
+    buffer, pos, eof = "", 0, False
+
+    def fill():
+        nonlocal buffer, pos, eof
+        chunk = next(chunks, None)
+        if chunk is None:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE_RE.match(buffer, pos).end()
+            if pos < len(buffer) or not fill():
+                return
+
+    skip_whitespace()
+    if pos >= len(buffer) or buffer[pos] != '[':
+        raise ValueError("File JSON harus berupa array record")
+    pos += 1
+    expect_value = True
+    while True:
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise ValueError("Array JSON tidak ditutup")
+        if buffer[pos] == ']':
+            return
+        if not expect_value:
+            if buffer[pos] != ',':
+                raise ValueError(f"Diharapkan ',' atau ']' di posisi {pos}")
+            pos += 1
+            skip_whitespace()
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+            complete = end < len(buffer) or eof
+        except json.JSONDecodeError:
+            value, complete = None, False
+        while not complete:
+            # Elemen terpotong di batas chunk: tambah data lalu parse ulang
+            if not fill():
+                value, end = decoder.raw_decode(buffer, pos)
+                break
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                complete = end < len(buffer) or eof
+            except json.JSONDecodeError:
+                pass
+        pos = end
+        expect_value = False
+        yield value
+
+def iter_json_lines(stream):
+    """Baca JSON Lines baris per baris; baris rusak dihasilkan sebagai ValueError"""
+    for number, line in enumerate(iter(stream.readline, b""), start=1):
+        line = line.decode('utf-8-sig' if number == 1 else 'utf-8').strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            yield ValueError(f"Baris {number}: {e}")
+
+def detect_format(stream):
+    """'json' jika stream diawali array, selain itu 'jsonl'; posisi stream dikembalikan"""
+    start = stream.tell()
+    head = stream.read(1)
+    while head and head in b"\xef\xbb\xbf \t\r\n":
+        head = stream.read(1)
+    stream.seek(start)
+    return 'json' if head == b"[" else 'jsonl'
+
+def iter_records(stream, fmt=None, chunk_size=None):
+    """Record dari stream array JSON atau JSON Lines"""
+    if (fmt or detect_format(stream)) == 'json':
+        return iter_json_array(stream, chunk_size)
+    return iter_json_lines(stream)
+
+@profiled(category='import')
+def import_research_stream(stream, total_bytes=None, batch_size=None, on_progress=None,
+                           skip_near_duplicates=True):
+    """Impor record dari stream biner JSON/JSONL secara bertahap.
+
+    Record divalidasi, diduplikasi terhadap indeks id data yang ada (dan,
+    dengan skip_near_duplicates, terhadap indeks MinHash judul/abstrak), lalu
+    disimpan per batch; journal dipadatkan sekali setelah batch terakhir.
+    on_progress(report) dipanggil setelah setiap batch.
+    Mengembalikan laporan berisi jumlah record, duplikat, hampir duplikat,
+    record tidak valid, durasi, dan kecepatan (record/detik).
+    """
+    batch_size = batch_size or IMPORT_BATCH_SIZE
+    fmt = detect_format(stream)
+    reader = _CountingReader(stream)
+    report = {
+        'format': fmt, 'read': 0, 'imported': 0, 'duplicates': 0, 'near_duplicates': 0, 'invalid': 0,
+        'errors': [], 'aborted': None,
+        'bytes_read': 0, 'total_bytes': total_bytes, 'seconds': 0.0, 'records_per_sec': 0.0,
+    }
+    started = time.perf_counter()
+
+    def invalid(message):
+        report['invalid'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append(message)
+
+    def commit(batch, last=False):
+        # Pemadatan journal baru dipicu (di latar belakang) pada batch terakhir
+        result = append_research_batch(batch, compact=last, skip_near_duplicates=skip_near_duplicates)
+        if result is None:
+            raise IOError("Gagal menyimpan batch impor")
+        report['imported'] += result['added']
+        report['duplicates'] += result['duplicates']
+        report['near_duplicates'] += result['near_duplicates']
+        report['bytes_read'] = reader.bytes_read
+        report['seconds'] = time.perf_counter() - started
+        report['records_per_sec'] = report['read'] / report['seconds'] if report['seconds'] else 0.0
+        if on_progress:
+            on_progress(report)
+
+    batch = []
+    try:
+        for record in iter_records(reader, fmt):
+            report['read'] += 1
+            if isinstance(record, ValueError):
+                invalid(str(record))
+                continue
+            error = validate_record(record)
+            if error:
+                invalid(f"Record {report['read']}: {error}")
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                commit(batch)
+                batch = []
+    except ValueError as e:
+        # Struktur file rusak: batch yang sudah dibaca tetap disimpan
+        report['aborted'] = str(e)
+    commit(batch, last=True)
+    return report
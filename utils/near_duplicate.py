@@ -0,0 +1,222 @@
+# utils/near_duplicate.py
+import numpy as np
+
+from utils.search_index import tokenize
+
+# Field yang membentuk shingle (n-gram kata) sebuah record
+DUPLICATE_FIELDS = ('judul', 'abstrak')
+SHINGLE_SIZE = 3
+
+# Panjang signature MinHash = BANDS x ROWS_PER_BAND. Dua record menjadi
+# kandidat jika satu band signature-nya sama persis; dengan 16 x 4 peluang
+# itu ~50% pada kemiripan Jaccard 0.5 dan >99% pada 0.8
+BANDS = 16
+ROWS_PER_BAND = 4
+NUM_PERM = BANDS * ROWS_PER_BAND
+
+# Perkiraan kemiripan Jaccard minimum agar record dianggap duplikat
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+# Record baru ditampung terpisah sampai jumlahnya melewati porsi ini dari
+# tabel band terurut, baru tabel dibangun ulang
+PENDING_REBUILD_RATIO = 0.05
+MIN_PENDING_REBUILD = 256
+
+# Jumlah record per perhitungan signature saat membangun indeks
+BUILD_BATCH_SIZE = 512
+
+# Permutasi MinHash: h * a + b (mod 2^32) dengan a ganjil. Signature hanya
+# hidup di memori proses, jadi hash() bawaan Python cukup untuk token
+_rng = np.random.RandomState(20240501)
+_A = (_rng.randint(0, 1 << 31, size=NUM_PERM).astype(np.uint32) << np.uint32(1)) | np.uint32(1)
+_B = _rng.randint(0, 1 << 31, size=NUM_PERM).astype(np.uint32)
+# Pengali untuk menggabungkan hash kata berurutan menjadi hash shingle
+_GRAM_MIX = np.array([0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D], dtype=np.uint64)[:SHINGLE_SIZE]
+# Pengali ganjil untuk menggabungkan baris band menjadi satu kunci 64-bit
+_BAND_MIX = (_rng.randint(1, 1 << 31, size=ROWS_PER_BAND).astype(np.uint64) << np.uint64(32)) | np.uint64(1)
+
+def _shingles(record):
+    """Hash 32-bit unik n-gram kata judul dan abstrak (kata tunggal untuk teks sangat pendek)"""
+    tokens = []
+    for field in DUPLICATE_FIELDS:
+        tokens.extend(tokenize(record.get(field), stemming=False))
+    words = np.fromiter((hash(t) for t in tokens), dtype=np.int64, count=len(tokens)).view(np.uint64)
+    if len(words) >= SHINGLE_SIZE:
+        n = len(words) - SHINGLE_SIZE + 1
+        grams = sum(words[i:i + n] * _GRAM_MIX[i] for i in range(SHINGLE_SIZE))
+    else:
+        grams = words
+    return np.unique((grams ^ (grams >> np.uint64(32))).astype(np.uint32))
+
+def _signatures(hash_lists):
+    """Signature MinHash sekumpulan daftar hash shingle (tidak boleh kosong) sekaligus"""
+    lengths = np.fromiter((len(h) for h in hash_lists), dtype=np.int64, count=len(hash_lists))
+    starts = np.zeros(len(lengths), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    values = np.concatenate(hash_lists)[:, None] * _A + _B
+    return np.minimum.reduceat(values, starts, axis=0)
+
+def signature(record):
+    """Signature MinHash (NUM_PERM x uint32) record, atau None jika tidak ada teks"""
+    hashes = _shingles(record)
+    if not len(hashes):
+        return None
+    return _signatures([hashes])[0]
+
+def _band_keys(signatures):
+    """Kunci 64-bit per band untuk satu atau banyak signature"""
+    rows = signatures.reshape(-1, BANDS, ROWS_PER_BAND).astype(np.uint64)
+    return (rows * _BAND_MIX).sum(axis=2)
+
+class NearDuplicateIndex:
+    """Indeks LSH atas signature MinHash untuk mencari record yang hampir sama.
+
+    Signature dan kunci band disimpan dalam array NumPy per slot. Untuk setiap
+    band, kunci diurutkan sekali sehingga kandidat sebuah query dicari dengan
+    np.searchsorted (logaritmik terhadap jumlah record); hanya kandidat yang
+    signature-nya dibandingkan. Record yang ditambahkan setelah tabel terurut
+    dibangun dicocokkan langsung sampai cukup banyak untuk membangun ulang.
+    """
+
+    def __init__(self):
+        self.slots = {}
+        self.slot_ids = []
+        self.signatures = np.zeros((0, NUM_PERM), dtype=np.uint32)
+        self.keys = np.zeros((0, BANDS), dtype=np.uint64)
+        self.alive = np.zeros(0, dtype=bool)
+        self.live_count = 0
+        # Tabel band terurut untuk slot < sorted_count
+        self.sorted_count = 0
+        self.sorted_keys = np.zeros((BANDS, 0), dtype=np.uint64)
+        self.sorted_slots = np.zeros((BANDS, 0), dtype=np.int64)
+        self.pending = []
+
+    def __contains__(self, doc_id):
+        return doc_id in self.slots
+
+    def __len__(self):
+        return self.live_count
+
+    def build(self, records):
+        self.__init__()
+        hash_lists = []
+        for record in records:
+            doc_id = record.get('id')
+            hashes = _shingles(record) if doc_id is not None else ()
+            if not len(hashes):
+                continue
+            if doc_id in self.slots:
+                # Id ganda: record terakhir yang berlaku
+                self.slot_ids[self.slots[doc_id]] = None
+            self.slots[doc_id] = len(self.slot_ids)
+            self.slot_ids.append(doc_id)
+            hash_lists.append(hashes)
+        if hash_lists:
+            # Dihitung per potongan agar matriks sementara (shingle x NUM_PERM) tetap kecil
+            self.signatures = np.vstack([_signatures(hash_lists[i:i + BUILD_BATCH_SIZE])
+                                         for i in range(0, len(hash_lists), BUILD_BATCH_SIZE)])
+            self.keys = _band_keys(self.signatures)
+        self.alive = np.array([doc_id is not None for doc_id in self.slot_ids], dtype=bool)
+        self.live_count = int(self.alive.sum())
+        self._sort()
+
+    def _sort(self):
+        """Bangun ulang tabel band terurut dari semua slot"""
+        n = len(self.slot_ids)
+        order = np.argsort(self.keys[:n].T, axis=1, kind='stable')
+        self.sorted_slots = order
+        self.sorted_keys = np.take_along_axis(self.keys[:n].T, order, axis=1)
+        self.sorted_count = n
+        self.pending = []
+
+    def _grow(self, size):
+        capacity = len(self.signatures)
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2, 1024)
+        signatures = np.zeros((capacity, NUM_PERM), dtype=np.uint32)
+        keys = np.zeros((capacity, BANDS), dtype=np.uint64)
+        alive = np.zeros(capacity, dtype=bool)
+        n = len(self.slot_ids)
+        signatures[:n], keys[:n], alive[:n] = self.signatures[:n], self.keys[:n], self.alive[:n]
+        self.signatures, self.keys, self.alive = signatures, keys, alive
+
+    def add(self, record):
+        doc_id = record.get('id')
+        if doc_id is None:
+            return
+        if doc_id in self.slots:
+            self.remove(record)
+        sig = signature(record)
+        if sig is None:
+            return
+        slot = len(self.slot_ids)
+        self._grow(slot + 1)
+        self.signatures[slot] = sig
+        self.keys[slot] = _band_keys(sig)[0]
+        self.alive[slot] = True
+        self.slot_ids.append(doc_id)
+        self.slots[doc_id] = slot
+        self.live_count += 1
+        self.pending.append(slot)
+        if len(self.pending) > max(MIN_PENDING_REBUILD, PENDING_REBUILD_RATIO * self.sorted_count):
+            self._compact()
+
+    def remove(self, record):
+        slot = self.slots.pop(record.get('id'), None)
+        if slot is None:
+            return
+        self.slot_ids[slot] = None
+        self.alive[slot] = False
+        self.live_count -= 1
+
+    def _compact(self):
+        """Buang slot yang sudah dihapus lalu urutkan ulang semua band"""
+        n = len(self.slot_ids)
+        keep = np.flatnonzero(self.alive[:n])
+        self.signatures = self.signatures[keep]
+        self.keys = self.keys[keep]
+        self.alive = np.ones(len(keep), dtype=bool)
+        self.slot_ids = [self.slot_ids[s] for s in keep]
+        self.slots = {doc_id: slot for slot, doc_id in enumerate(self.slot_ids)}
+        self._sort()
+
+    def _candidates(self, keys):
+        """Slot hidup yang berbagi minimal satu band dengan kunci query"""
+        found = []
+        if self.sorted_count:
+            lo = [np.searchsorted(self.sorted_keys[b], keys[b], 'left') for b in range(BANDS)]
+            hi = [np.searchsorted(self.sorted_keys[b], keys[b], 'right') for b in range(BANDS)]
+            found.extend(self.sorted_slots[b, lo[b]:hi[b]] for b in range(BANDS) if hi[b] > lo[b])
+        if self.pending:
+            pending = np.array(self.pending, dtype=np.int64)
+            found.append(pending[(self.keys[pending] == keys).any(axis=1)])
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        slots = np.unique(np.concatenate(found))
+        return slots[self.alive[slots]]
+
+    def find(self, record, threshold=None, limit=None):
+        """Record yang hampir sama: list (id, perkiraan Jaccard) dari skor tertinggi.
+
+        Record dengan id yang sama dengan record query tidak ikut dihitung.
+        """
+        threshold = NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+        sig = signature(record)
+        if sig is None:
+            return []
+        slots = self._candidates(_band_keys(sig)[0])
+        if not len(slots):
+            return []
+        scores = (self.signatures[slots] == sig).mean(axis=1)
+        order = np.argsort(-scores, kind='stable')
+        result = []
+        for i in order:
+            if scores[i] < threshold:
+                break
+            doc_id = self.slot_ids[slots[i]]
+            if doc_id != record.get('id'):
+                result.append((doc_id, float(scores[i])))
+                if limit is not None and len(result) >= limit:
+                    break
+        return result
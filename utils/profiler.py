@@ -0,0 +1,168 @@
+# utils/profiler.py
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+# Profiling hanya aktif jika diminta (RESEARCH_PROFILE=1 atau set_profiling)
+PROFILING_ENABLED = os.environ.get('RESEARCH_PROFILE', '') not in ('', '0')
+
+# Jumlah span terakhir yang disimpan di memori
+MAX_SPANS = 20_000
+
+# Jika diisi, trace Chrome ditulis ke path ini saat proses selesai
+PROFILE_TRACE_FILE = os.environ.get('RESEARCH_PROFILE_TRACE')
+
+class Profiler:
+    """Pencatat span waktu (nama, kategori, mulai, durasi) dan counter.
+
+    Span bersarang per thread: waktu span induk dikurangi waktu anaknya
+    menjadi waktu 'self', misalnya waktu render widget di show_* setelah
+    dikurangi pemanggilan data_handler dan pembuatan grafik.
+    """
+
+    def __init__(self, enabled=False, max_spans=MAX_SPANS):
+        self.enabled = enabled
+        self.spans = deque(maxlen=max_spans)
+        self.counters = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.origin = time.perf_counter_ns()
+
+    @contextmanager
+    def span(self, name, category='app', **args):
+        if not self.enabled:
+            yield
+            return
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        # Elemen stack: total durasi anak-anak span (ns)
+        stack.append(0)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += duration
+            with self.lock:
+                self.spans.append((name, category, (start - self.origin) // 1000, duration // 1000,
+                                   (duration - children) // 1000, threading.get_ident(), args))
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self):
+        with self.lock:
+            self.spans.clear()
+            self.counters.clear()
+
+    def summary(self):
+        """Ringkasan per nama span, diurutkan dari total waktu terbesar"""
+        with self.lock:
+            spans = list(self.spans)
+        rows = {}
+        for name, category, _, duration, self_time, _, _ in spans:
+            row = rows.get(name)
+            if row is None:
+                row = rows[name] = {'name': name, 'category': category, 'calls': 0,
+                                    'total_ms': 0.0, 'self_ms': 0.0, 'max_ms': 0.0}
+            row['calls'] += 1
+            row['total_ms'] += duration / 1000
+            row['self_ms'] += self_time / 1000
+            row['max_ms'] = max(row['max_ms'], duration / 1000)
+        for row in rows.values():
+            row['mean_ms'] = row['total_ms'] / row['calls']
+        return sorted(rows.values(), key=lambda r: r['total_ms'], reverse=True)
+
+    def chrome_trace(self):
+        """Span dalam format Chrome Trace Event (chrome://tracing, Perfetto)"""
+        with self.lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        pid = os.getpid()
+        events = [{'name': name, 'cat': category, 'ph': 'X', 'ts': start, 'dur': duration,
+                   'pid': pid, 'tid': tid, 'args': {k: str(v) for k, v in args.items()}}
+                  for name, category, start, duration, _, tid, args in spans]
+        if counters:
+            end = max((e['ts'] + e['dur'] for e in events), default=0)
+            events.extend({'name': name, 'ph': 'C', 'ts': end, 'pid': pid, 'args': {name: value}}
+                          for name, value in counters.items())
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+_profiler = Profiler(PROFILING_ENABLED)
+
+def span(name, category='app', **args):
+    """Context manager pencatat waktu satu bagian kode (tidak berbiaya jika profiling mati)"""
+    return _profiler.span(name, category, **args)
+
+def profiled(name=None, category='data'):
+    """Decorator: setiap pemanggilan fungsi dicatat sebagai span.
+
+    Nama default '<modul>.<fungsi>', misalnya 'data_handler.load_research_data';
+    fungsi di skrip utama (app.py) cukup dengan nama fungsinya.
+    """
+    def decorator(func):
+        module = func.__module__.rsplit('.', 1)[-1]
+        span_name = name or (func.__qualname__ if module == '__main__' else f"{module}.{func.__qualname__}")
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _profiler.enabled:
+                return func(*args, **kwargs)
+            with _profiler.span(span_name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def count(name, value=1):
+    """Tambahkan nilai ke counter (misalnya record_dipindai, byte_dibaca)"""
+    _profiler.count(name, value)
+
+def is_profiling_enabled():
+    return _profiler.enabled
+
+def set_profiling(enabled):
+    """Aktifkan/matikan profiling untuk seluruh proses"""
+    _profiler.enabled = bool(enabled)
+
+def reset_profile():
+    _profiler.reset()
+
+def get_profile_summary():
+    """List dict per nama span: calls, total_ms, self_ms, mean_ms, max_ms"""
+    return _profiler.summary()
+
+def get_profile_counters():
+    with _profiler.lock:
+        return dict(_profiler.counters)
+
+def chrome_trace():
+    return _profiler.chrome_trace()
+
+def export_chrome_trace(path):
+    """Tulis span ke file JSON format Chrome trace, kembalikan path atau None jika gagal"""
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(chrome_trace(), f)
+        os.replace(tmp_path, path)
+        return path
+    except Exception as e:
+        print(f"Error exporting profile trace: {e}")
+        return None
+
+if PROFILE_TRACE_FILE:
+    atexit.register(lambda: _profiler.spans and export_chrome_trace(PROFILE_TRACE_FILE))
@@ -0,0 +1,311 @@
+# utils/schema.py
+import re
+import sys
+from collections.abc import Mapping
+from datetime import date, datetime
+from functools import lru_cache
+
+# Field record penelitian sesuai form input, dalam urutan penyimpanan
+RECORD_FIELDS = (
+    'id', 'judul', 'peneliti_utama', 'institusi', 'tahun', 'status',
+    'tanggal_mulai', 'tanggal_selesai', 'bidang', 'sumber_dana', 'abstrak',
+    'latar_belakang', 'metodologi', 'hasil', 'kesimpulan', 'link_publikasi',
+    'kata_kunci', 'tanggal_input', 'lampiran', 'teks_lampiran',
+)
+LIST_FIELDS = ('bidang', 'kata_kunci')
+
+# Metadata dokumen pendukung (lihat utils/attachments.py), disimpan sebagai tuple dict
+ATTACHMENT_FIELD = 'lampiran'
+DATE_FIELDS = ('tanggal_mulai', 'tanggal_selesai')
+
+# Nilai yang banyak berulang antar record disimpan sebagai string ter-intern
+INTERNED_FIELDS = ('status', 'institusi', 'sumber_dana')
+
+# Field teks panjang yang dibaca dari disk saat dibutuhkan (lihat summarize_record)
+LONG_TEXT_FIELDS = ('abstrak', 'latar_belakang', 'metodologi', 'hasil', 'kesimpulan', 'teks_lampiran')
+PREVIEW_LENGTH = 200
+
+# Record dengan total teks panjang di bawah ini tetap disimpan utuh di memori
+LAZY_TEXT_MIN_LENGTH = 512
+
+_FIELD_SET = frozenset(RECORD_FIELDS)
+_LONG_SET = frozenset(LONG_TEXT_FIELDS)
+_SEQUENCE_SET = frozenset(LIST_FIELDS + (ATTACHMENT_FIELD,))
+_DATE_RE = re.compile(r"^(\d{4})-(\d{1,2})-(\d{1,2})")
+_YEAR_RE = re.compile(r"\b(\d{4})\b")
+_EMPTY_DATES = ("", "None", "NaT", "null")
+
+# Penanda field yang tidak ada (berbeda dari nilai None)
+_MISSING = object()
+
+def _coerce_id(value):
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return value
+
+def _coerce_text(value):
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+def _coerce_interned(value):
+    if value is None:
+        return None
+    return sys.intern(str(value).strip())
+
+def _coerce_year(value):
+    """Tahun sebagai int; None jika kosong atau tidak bisa dibaca"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        value = value.strip()
+        if value.isdigit():
+            return int(value)
+        match = _YEAR_RE.search(value)
+        if match:
+            return int(match.group(1))
+    return None
+
+def _coerce_date(value):
+    """Tanggal sebagai string ISO 'YYYY-MM-DD'; teks yang bukan tanggal dibiarkan"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return _coerce_date_text(str(value))
+
+@lru_cache(maxsize=65536)
+def _coerce_date_text(value):
+    # Nilai tanggal sangat berulang antar record, hasilnya di-cache
+    value = value.strip()
+    if value in _EMPTY_DATES:
+        return None
+    match = _DATE_RE.match(value)
+    if match:
+        try:
+            return date(*(int(g) for g in match.groups())).isoformat()
+        except ValueError:
+            pass
+    return value
+
+def _coerce_list(value):
+    """List string (dari list atau teks dipisah koma) sebagai tuple ter-intern"""
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        value = value.split(',')
+    elif not isinstance(value, (list, tuple)):
+        value = [value]
+    intern = sys.intern
+    return tuple([intern(v) for v in [str(v).strip() for v in value if v is not None] if v])
+
+def _coerce_attachments(value):
+    """Daftar lampiran sebagai tuple dict; entri yang bukan objek dibuang"""
+    if not value:
+        return ()
+    if isinstance(value, Mapping):
+        value = [value]
+    return tuple(dict(v) for v in value if isinstance(v, Mapping))
+
+_COERCERS = dict.fromkeys(RECORD_FIELDS, _coerce_text)
+_COERCERS.update(dict.fromkeys(INTERNED_FIELDS, _coerce_interned))
+_COERCERS.update(dict.fromkeys(DATE_FIELDS, _coerce_date))
+_COERCERS.update(dict.fromkeys(LIST_FIELDS, _coerce_list))
+_COERCERS['id'] = _coerce_id
+_COERCERS['tahun'] = _coerce_year
+_COERCERS[ATTACHMENT_FIELD] = _coerce_attachments
+
+class ResearchRecord(Mapping):
+    """Record penelitian bertipe dengan __slots__.
+
+    Dapat dibaca seperti dict (get, [], in, keys, items) sehingga kode
+    tampilan dan indeks tidak perlu diubah, tetapi jauh lebih hemat memori:
+    tidak ada dict per record, dan nilai kategori berbagi string ter-intern.
+    Field yang tidak ada di record asal dibiarkan kosong (slot tidak diisi),
+    field di luar skema disimpan di _extra.
+
+    Record ringkas (lihat summarize_record) tidak menyimpan teks panjang;
+    _lazy berisi (loader, sumber, field yang ada, cuplikan abstrak) dan teks
+    dibaca lewat loader saat field tersebut diminta.
+    """
+
+    __slots__ = RECORD_FIELDS + ('_extra', '_lazy')
+
+    @classmethod
+    def from_dict(cls, data):
+        """Buat record dari dict dengan koersi tipe; record bertipe dikembalikan apa adanya"""
+        if isinstance(data, cls):
+            return data
+        record = cls.__new__(cls)
+        extra = None
+        setters = _SETTERS
+        for key, value in data.items():
+            coerce = _COERCERS.get(key)
+            if coerce is None:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            elif coerce is _coerce_text and (value is None or value.__class__ is str):
+                # Jalur cepat: teks biasa tidak perlu dikonversi
+                setters[key](record, value)
+            else:
+                setters[key](record, coerce(value))
+        record._extra = extra
+        record._lazy = None
+        return record
+
+    def _long_text(self):
+        loader, source = self._lazy[0], self._lazy[1]
+        return loader(source, getattr(self, 'id', None))
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            value = getattr(self, key, _MISSING)
+            if value is _MISSING:
+                if self._lazy is not None and key in self._lazy[2]:
+                    return self._long_text().get(key, default)
+                return default
+            return value
+        extra = self._extra
+        return extra.get(key, default) if extra else default
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        if key in _FIELD_SET:
+            return hasattr(self, key) or (self._lazy is not None and key in self._lazy[2])
+        return bool(self._extra) and key in self._extra
+
+    def __iter__(self):
+        lazy_fields = self._lazy[2] if self._lazy is not None else ()
+        for field in RECORD_FIELDS:
+            if hasattr(self, field) or field in lazy_fields:
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        other = other.to_dict() if isinstance(other, ResearchRecord) else dict(other)
+        return self.to_dict() == other
+
+    def to_dict(self, texts=None):
+        """Dict biasa dengan list (bukan tuple), siap diserialisasi.
+
+        texts: teks panjang record ringkas yang sudah dibaca pemanggil.
+        """
+        data = {}
+        if texts is None:
+            texts = self._long_text() if self._lazy is not None else {}
+        for field in RECORD_FIELDS:
+            value = getattr(self, field, _MISSING)
+            if value is _MISSING:
+                value = texts.get(field, _MISSING)
+            if value is not _MISSING:
+                data[field] = list(value) if field in _SEQUENCE_SET else value
+        if self._extra:
+            data.update(self._extra)
+        return data
+
+    def __repr__(self):
+        return f"ResearchRecord({self.to_dict()!r})"
+
+# Setter slot langsung, lebih cepat daripada setattr
+_SETTERS = {field: getattr(ResearchRecord, field).__set__ for field in RECORD_FIELDS}
+
+def coerce_record(data):
+    """Record bertipe dari dict (lunak: tidak pernah menolak data)"""
+    return ResearchRecord.from_dict(data)
+
+_PRESENT_FIELDS = {}
+
+def summarize_record(record, loader, source):
+    """Jadikan record ringkas: teks panjang dilepas dari memori.
+
+    loader(source, id) harus mengembalikan dict field teks panjang record
+    tersebut. Record yang sudah ringkas hanya diperbarui sumbernya; record
+    dengan teks pendek dibiarkan utuh. Mengembalikan True jika record ringkas.
+    """
+    if record._lazy is not None:
+        record._lazy = (loader, source) + record._lazy[2:]
+        return True
+    present = tuple(f for f in LONG_TEXT_FIELDS if hasattr(record, f))
+    total = sum(len(v) for v in (getattr(record, f) for f in present) if isinstance(v, str))
+    if total < LAZY_TEXT_MIN_LENGTH:
+        return False
+    preview = (getattr(record, 'abstrak', None) or '')[:PREVIEW_LENGTH]
+    for field in present:
+        delattr(record, field)
+    # Tuple nama field dipakai bersama oleh semua record dengan susunan yang sama
+    present = _PRESENT_FIELDS.setdefault(present, present)
+    record._lazy = (loader, source, present, preview)
+    return True
+
+def is_summary(record):
+    """True jika record ringkas (teks panjang belum dimuat)"""
+    return isinstance(record, ResearchRecord) and record._lazy is not None
+
+def summary_source(record):
+    """Sumber teks panjang record ringkas, atau None"""
+    return record._lazy[1] if is_summary(record) else None
+
+def summary_loader(record):
+    """Loader teks panjang record ringkas (menandai store pemiliknya), atau None"""
+    return record._lazy[0] if is_summary(record) else None
+
+def long_text_fields(data):
+    """Field teks panjang dari dict record mentah, dengan koersi tipe"""
+    return {f: _coerce_text(data[f]) for f in LONG_TEXT_FIELDS if f in data}
+
+def abstract_preview(record, length=PREVIEW_LENGTH):
+    """Cuplikan abstrak tanpa memuat teks panjang dari disk"""
+    if is_summary(record) and length <= PREVIEW_LENGTH:
+        return record._lazy[3][:length]
+    return (record.get('abstrak') or '')[:length]
+
+def record_to_json(obj):
+    """Hook default json.dump untuk ResearchRecord"""
+    if isinstance(obj, ResearchRecord):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def validate_record(record):
+    """Validasi ketat untuk data masuk (impor dan form input).
+
+    Mengembalikan pesan error, atau None jika record dapat diterima.
+    """
+    if not isinstance(record, Mapping):
+        return "record bukan objek JSON"
+    judul = record.get('judul')
+    if not isinstance(judul, str) or not judul.strip():
+        return "judul kosong"
+    record_id = _coerce_id(record.get('id'))
+    if record_id is not None and (not isinstance(record_id, int) or isinstance(record_id, bool)):
+        return f"id tidak valid: {record.get('id')!r}"
+    tahun = record.get('tahun')
+    if tahun not in (None, "") and _coerce_year(tahun) is None:
+        return f"tahun tidak valid: {tahun!r}"
+    for field in DATE_FIELDS:
+        value = _coerce_date(record.get(field))
+        if value is not None:
+            try:
+                date.fromisoformat(value)
+            except ValueError:
+                return f"{field} bukan tanggal: {value!r}"
+    for field in LIST_FIELDS:
+        value = record.get(field)
+        if value is not None and not isinstance(value, (str, list, tuple)):
+            return f"{field} harus berupa list"
+    return None
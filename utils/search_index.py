@@ -0,0 +1,211 @@
+# utils/search_index.py
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from functools import lru_cache
+
+# Field yang diindeks beserta bobotnya dalam perhitungan skor
+SEARCH_FIELDS = {
+    'judul': 3.0,
+    'peneliti_utama': 2.0,
+    'kata_kunci': 2.0,
+    'abstrak': 1.0,
+    'metodologi': 1.0,
+    'hasil': 1.0,
+    # Teks hasil ekstraksi dokumen pendukung (lihat utils/attachments.py)
+    'teks_lampiran': 0.5,
+}
+
+# Stemming bahasa Indonesia sederhana (imbuhan umum); nonaktif secara default
+# karena bisa mengacaukan pencarian prefiks saat pengguna masih mengetik
+SEARCH_STEMMING = False
+
+# Parameter BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Prefiks yang lebih pendek dari ini hanya dicocokkan persis
+MIN_PREFIX_LENGTH = 3
+
+# Batas jumlah term hasil ekspansi prefiks (dipilih yang paling sering muncul)
+MAX_PREFIX_EXPANSION = 64
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_PARTICLES = ("lah", "kah", "tah", "pun")
+_POSSESSIVES = ("nya", "ku", "mu")
+_SUFFIXES = ("kan", "an", "i")
+_PREFIXES = ("meng", "meny", "mem", "men", "me", "peng", "peny", "pem", "pen", "pe",
+             "ber", "be", "ter", "di", "ke", "se")
+
+@lru_cache(maxsize=65536)
+def stem(token):
+    """Stemmer ringan bahasa Indonesia: buang partikel, kepemilikan, akhiran, awalan"""
+    if len(token) <= 4:
+        return token
+    for group in (_PARTICLES, _POSSESSIVES, _SUFFIXES):
+        for suffix in group:
+            if token.endswith(suffix) and len(token) - len(suffix) >= 4:
+                token = token[:-len(suffix)]
+                break
+    for prefix in _PREFIXES:
+        if token.startswith(prefix) and len(token) - len(prefix) >= 4:
+            return token[len(prefix):]
+    return token
+
+def tokenize(text, stemming=None):
+    """Pecah teks menjadi token huruf kecil tanpa diakritik"""
+    if not text:
+        return []
+    if isinstance(text, (list, tuple)):
+        text = " ".join(str(t) for t in text)
+    text = str(text).lower()
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    tokens = _TOKEN_RE.findall(text)
+    if SEARCH_STEMMING if stemming is None else stemming:
+        tokens = [stem(t) for t in tokens]
+    return tokens
+
+class SearchIndex:
+    """Indeks terbalik (inverted index) untuk pencarian teks penuh data penelitian.
+
+    Posting disimpan per term sebagai {id_record: frekuensi berbobot}.
+    Kosakata disimpan terurut untuk ekspansi prefiks dengan bisect.
+    """
+
+    def __init__(self, fields=None):
+        self.fields = fields or SEARCH_FIELDS
+        self.postings = {}
+        self.terms = []
+        self.doc_terms = {}
+        self.doc_lengths = {}
+        self.total_length = 0.0
+
+    def build(self, records):
+        self.__init__(self.fields)
+        for record in records:
+            self.add(record, sort_terms=False)
+        self.terms = sorted(self.postings)
+
+    def _weighted_terms(self, record):
+        weights = {}
+        for field, weight in self.fields.items():
+            for token, count in Counter(tokenize(record.get(field))).items():
+                weights[token] = weights.get(token, 0.0) + weight * count
+        return weights
+
+    def add(self, record, sort_terms=True):
+        doc_id = record.get('id')
+        if doc_id is None:
+            return
+        if doc_id in self.doc_terms:
+            self.remove(record)
+        weights = self._weighted_terms(record)
+        for term, tf in weights.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+                if sort_terms:
+                    insort(self.terms, term)
+            posting[doc_id] = tf
+        self.doc_terms[doc_id] = weights
+        length = sum(weights.values())
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+
+    def remove(self, record):
+        doc_id = record.get('id')
+        weights = self.doc_terms.pop(doc_id, None)
+        if weights is None:
+            return
+        for term in weights:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(doc_id, None)
+            if not posting:
+                del self.postings[term]
+                pos = bisect_left(self.terms, term)
+                if pos < len(self.terms) and self.terms[pos] == term:
+                    del self.terms[pos]
+        self.total_length -= self.doc_lengths.pop(doc_id, 0.0)
+
+    def _expand(self, token):
+        """Term di kosakata yang cocok dengan token (persis atau prefiks)"""
+        if len(token) < MIN_PREFIX_LENGTH:
+            return [token] if token in self.postings else []
+        pos = bisect_left(self.terms, token)
+        matches = []
+        while pos < len(self.terms) and self.terms[pos].startswith(token):
+            matches.append(self.terms[pos])
+            pos += 1
+        if len(matches) > MAX_PREFIX_EXPANSION:
+            # Prefiks sangat umum: ambil term yang paling sering muncul,
+            # term yang persis sama selalu disertakan
+            exact = [token] if token in self.postings else []
+            others = heapq.nlargest(MAX_PREFIX_EXPANSION - len(exact),
+                                    (t for t in matches if t != token),
+                                    key=lambda t: len(self.postings[t]))
+            matches = exact + others
+        return matches
+
+    def search(self, query, limit=None):
+        """Cari record yang memuat semua term query (AND), diurutkan skor BM25.
+
+        Setiap term query juga cocok sebagai prefiks kata. Mengembalikan
+        daftar (id, skor) dari skor tertinggi.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or not self.doc_terms:
+            return []
+
+        n_docs = len(self.doc_terms)
+        avg_length = self.total_length / n_docs if n_docs else 0.0
+        groups = []
+        for token in tokens:
+            terms = self._expand(token)
+            if not terms:
+                return []
+            groups.append(terms)
+
+        # Kandidat: irisan dokumen tiap term query, mulai dari yang terkecil
+        candidate_sets = []
+        for terms in groups:
+            if len(terms) == 1:
+                candidate_sets.append(self.postings[terms[0]].keys())
+            else:
+                docs = set()
+                for term in terms:
+                    docs.update(self.postings[term])
+                candidate_sets.append(docs)
+        candidate_sets.sort(key=len)
+        candidates = set(candidate_sets[0])
+        for docs in candidate_sets[1:]:
+            candidates.intersection_update(docs)
+            if not candidates:
+                return []
+
+        norms = {d: BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths[d] / avg_length)
+                 for d in candidates}
+        scores = dict.fromkeys(candidates, 0.0)
+        for terms in groups:
+            for term in terms:
+                posting = self.postings[term]
+                idf = math.log(1 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                weight = idf * (BM25_K1 + 1)
+                if len(candidates) < len(posting):
+                    docs = candidates.intersection(posting)
+                else:
+                    docs = candidates.intersection(posting.keys())
+                for doc_id in docs:
+                    tf = posting[doc_id]
+                    scores[doc_id] += weight * tf / (tf + norms[doc_id])
+
+        if limit:
+            return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
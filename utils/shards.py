@@ -0,0 +1,50 @@
+# utils/shards.py
+import json
+import os
+import re
+import unicodedata
+
+# Daftar koleksi (shard) yang pernah dibuat: {slug: nama tampilan}
+MANIFEST_FILE = "collections.json"
+
+# Koleksi untuk record yang tidak memiliki nilai kunci koleksi
+DEFAULT_COLLECTION = "umum"
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+def collection_slug(value):
+    """Nama direktori shard untuk sebuah nilai kunci koleksi.
+
+    "Universitas Gadjah Mada" dan "universitas gadjah  mada" jatuh ke shard
+    yang sama; nilai kosong masuk ke DEFAULT_COLLECTION.
+    """
+    if isinstance(value, (list, tuple)):
+        value = value[0] if value else None
+    if value is None:
+        return DEFAULT_COLLECTION
+    text = unicodedata.normalize('NFKD', str(value)).encode('ascii', 'ignore').decode('ascii')
+    slug = _SLUG_RE.sub("-", text.lower()).strip("-")[:64].strip("-")
+    return slug or DEFAULT_COLLECTION
+
+def collection_name(value):
+    """Nama tampilan koleksi dari nilai kunci record"""
+    if isinstance(value, (list, tuple)):
+        value = value[0] if value else None
+    name = str(value).strip() if value is not None else ""
+    return name or DEFAULT_COLLECTION.title()
+
+def load_manifest(shards_dir):
+    """Membaca daftar koleksi; kosong jika belum ada shard"""
+    path = os.path.join(shards_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def save_manifest(shards_dir, manifest):
+    os.makedirs(shards_dir, exist_ok=True)
+    path = os.path.join(shards_dir, MANIFEST_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, path)
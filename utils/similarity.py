@@ -0,0 +1,308 @@
+# utils/similarity.py
+import math
+from collections import Counter
+
+import numpy as np
+
+from utils.search_index import stem, tokenize
+
+# Field yang membentuk vektor TF-IDF beserta bobot frekuensinya
+SIMILARITY_FIELDS = {
+    'judul': 2.0,
+    'kata_kunci': 2.0,
+    'abstrak': 1.0,
+}
+
+# Term query dengan bobot terbesar yang dipakai untuk mencari kandidat
+MAX_QUERY_TERMS = 32
+
+# Term yang muncul di lebih dari porsi dokumen ini tidak dipakai mencari
+# kandidat (tetap dihitung di norma vektor); posting-nya terlalu panjang
+COMMON_TERM_RATIO = 0.5
+
+# Record baru ditampung terpisah sampai jumlahnya melewati porsi ini dari
+# matriks, baru matriks dibangun ulang
+PENDING_REBUILD_RATIO = 0.05
+MIN_PENDING_REBUILD = 256
+
+# Jumlah query per perkalian batch (membatasi memori skor: batch x jumlah dokumen)
+QUERY_BATCH_SIZE = 16
+
+# Record yang diminta sesering ini hasilnya disimpan di tabel tetangga
+HOT_RECORD_HITS = 3
+
+# Kandidat teratas (per k) yang skornya dihitung ulang dengan vektor query
+# lengkap; skor dari query yang dipangkas hanya dipakai untuk menyaring
+RESCORE_FACTOR = 4
+MIN_RESCORE = 32
+
+# Skor minimum agar sebuah record dianggap serupa
+MIN_SIMILARITY = 0.05
+
+def _terms(record):
+    """Frekuensi berbobot term (kata dasar) record"""
+    counts = Counter()
+    for field, weight in SIMILARITY_FIELDS.items():
+        # Token dihitung dulu agar stemming cukup sekali per kata unik
+        for token, count in Counter(tokenize(record.get(field), stemming=False)).items():
+            if len(token) >= 3 and not token.isdigit():
+                counts[stem(token)] += weight * count
+    return counts
+
+class SimilarityIndex:
+    """Matriks TF-IDF (judul, kata kunci, abstrak) untuk mencari penelitian serupa.
+
+    Setiap record menempati satu slot. Term record disimpan per baris (CSR)
+    dan bobot ternormalisasinya per term (posting) dalam array NumPy, sehingga
+    skor kosinus query cukup dihitung dari posting term query dengan
+    np.bincount tanpa memindai semua record. Record yang ditambahkan setelah
+    matriks dibangun disimpan terpisah dan dinilai langsung sampai cukup
+    banyak untuk membangun ulang matriks. Hasil untuk record yang sering
+    diminta disimpan di tabel tetangga sampai data berubah.
+    """
+
+    def __init__(self):
+        self.vocabulary = {}
+        self.df = np.zeros(0, dtype=np.int64)
+        self.slots = {}
+        self.slot_ids = []
+        self.alive = np.zeros(0, dtype=bool)
+        self.live_count = 0
+        # Baris matriks (CSR) untuk slot < len(row_ptr) - 1
+        self.row_ptr = np.zeros(1, dtype=np.int64)
+        self.row_terms = np.zeros(0, dtype=np.int32)
+        self.row_tf = np.zeros(0, dtype=np.float32)
+        # Record yang masuk setelah matriks dibangun: slot -> (term, tf)
+        self.extra = {}
+        self.extra_matrix = None
+        self.postings = None
+        self.neighbors = {}
+        self.hits = Counter()
+
+    def build(self, records):
+        hits = self.hits
+        self.__init__()
+        self.hits = hits
+        vocabulary, terms, tf, lengths = self.vocabulary, [], [], []
+        for record in records:
+            doc_id = record.get('id')
+            if doc_id is None:
+                continue
+            counts = _terms(record)
+            if doc_id in self.slots:
+                # Id ganda: record terakhir yang berlaku
+                self.slot_ids[self.slots[doc_id]] = None
+            self.slots[doc_id] = len(self.slot_ids)
+            self.slot_ids.append(doc_id)
+            terms.extend(vocabulary.setdefault(t, len(vocabulary)) for t in counts)
+            tf.extend(counts.values())
+            lengths.append(len(counts))
+        self.row_terms = np.array(terms, dtype=np.int32)
+        self.row_tf = (1 + np.log(np.array(tf, dtype=np.float32))).astype(np.float32)
+        self.row_ptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.row_ptr[1:])
+        self.alive = np.array([doc_id is not None for doc_id in self.slot_ids], dtype=bool)
+        self._compact()
+
+    def _row(self, slot):
+        row = self.extra.get(slot)
+        if row is not None:
+            return row
+        start, end = self.row_ptr[slot], self.row_ptr[slot + 1]
+        return self.row_terms[start:end], self.row_tf[start:end]
+
+    def add(self, record):
+        doc_id = record.get('id')
+        if doc_id is None:
+            return
+        if doc_id in self.slots:
+            self.remove(record)
+        counts = _terms(record)
+        term_ids = np.fromiter((self.vocabulary.setdefault(t, len(self.vocabulary)) for t in counts),
+                               dtype=np.int32, count=len(counts))
+        tf = 1 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+        if len(self.df) < len(self.vocabulary):
+            self.df = np.concatenate([self.df, np.zeros(max(len(self.vocabulary) - len(self.df), 1024),
+                                                        dtype=np.int64)])
+        self.df[term_ids] += 1
+        slot = len(self.slot_ids)
+        self.extra[slot] = (term_ids, tf.astype(np.float32))
+        self.slot_ids.append(doc_id)
+        self.slots[doc_id] = slot
+        if len(self.alive) <= slot:
+            self.alive = np.concatenate([self.alive, np.zeros(max(slot + 1 - len(self.alive), 1024), dtype=bool)])
+        self.alive[slot] = True
+        self.live_count += 1
+        self.extra_matrix = None
+        self.neighbors.clear()
+
+    def remove(self, record):
+        slot = self.slots.pop(record.get('id'), None)
+        if slot is None:
+            return
+        term_ids, _ = self._row(slot)
+        self.df[term_ids] -= 1
+        self.extra.pop(slot, None)
+        self.slot_ids[slot] = None
+        self.alive[slot] = False
+        self.live_count -= 1
+        self.extra_matrix = None
+        self.neighbors.clear()
+
+    def _idf(self):
+        n_terms = len(self.vocabulary)
+        return np.log((1 + self.live_count) / (1 + self.df[:n_terms])) + 1
+
+    def _vector(self, slot, idf):
+        """Term dan bobot TF-IDF ternormalisasi (L2) sebuah slot"""
+        term_ids, tf = self._row(slot)
+        weights = tf * idf[term_ids]
+        norm = math.sqrt(float(weights @ weights)) or 1.0
+        return term_ids, weights / norm
+
+    def _compact(self):
+        """Gabungkan record tambahan ke matriks, buang slot yang sudah dihapus,
+        lalu bangun ulang posting"""
+        n_rows = len(self.row_ptr) - 1
+        lengths = np.diff(self.row_ptr)
+        keep = self.alive[:n_rows]
+        parts_terms = [self.row_terms[np.repeat(keep, lengths)]]
+        parts_tf = [self.row_tf[np.repeat(keep, lengths)]]
+        kept_lengths = [lengths[keep]]
+        kept_ids = [doc_id for doc_id in self.slot_ids[:n_rows] if doc_id is not None]
+        for slot in sorted(self.extra):
+            term_ids, tf = self.extra[slot]
+            parts_terms.append(term_ids)
+            parts_tf.append(tf)
+            kept_lengths.append(np.array([len(term_ids)]))
+            kept_ids.append(self.slot_ids[slot])
+        self.row_terms = np.concatenate(parts_terms).astype(np.int32)
+        self.row_tf = np.concatenate(parts_tf).astype(np.float32)
+        lengths = np.concatenate(kept_lengths).astype(np.int64)
+        self.row_ptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.row_ptr[1:])
+        self.slot_ids = kept_ids
+        self.slots = {doc_id: slot for slot, doc_id in enumerate(kept_ids)}
+        self.alive = np.ones(len(kept_ids), dtype=bool)
+        self.live_count = len(kept_ids)
+        self.df = np.bincount(self.row_terms, minlength=len(self.vocabulary)).astype(np.int64)
+        self.extra = {}
+        self.extra_matrix = None
+
+        # Bobot TF-IDF ternormalisasi per baris, lalu diurutkan menurut term
+        idf = self._idf()
+        docs = np.repeat(np.arange(len(kept_ids), dtype=np.int32), lengths)
+        weights = self.row_tf * idf[self.row_terms].astype(np.float32)
+        norms = np.sqrt(np.bincount(docs, weights.astype(np.float64) ** 2, minlength=len(kept_ids)))
+        norms[norms == 0] = 1.0
+        weights /= norms[docs].astype(np.float32)
+        order = np.argsort(self.row_terms, kind='stable')
+        indptr = np.zeros(len(idf) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.row_terms, minlength=len(idf)), out=indptr[1:])
+        self.postings = (indptr, docs[order], weights[order])
+
+    def _ensure_postings(self):
+        if self.postings is None or len(self.extra) > max(MIN_PENDING_REBUILD,
+                                                          PENDING_REBUILD_RATIO * self.live_count):
+            self._compact()
+        return self.postings
+
+    def _query(self, term_ids, weights, n_terms):
+        """Vektor query yang dipangkas: term di matriks yang informatif dengan bobot terbesar"""
+        usable = term_ids < n_terms
+        common = self.df[term_ids[usable]] > COMMON_TERM_RATIO * max(self.live_count, 1)
+        term_ids, weights = term_ids[usable][~common], weights[usable][~common]
+        if len(term_ids) > MAX_QUERY_TERMS:
+            top = np.argpartition(weights, -MAX_QUERY_TERMS)[-MAX_QUERY_TERMS:]
+            term_ids, weights = term_ids[top], weights[top]
+        return term_ids, weights
+
+    def _scores(self, slots):
+        """Matriks skor kosinus perkiraan (len(slots) x jumlah slot) untuk
+        sekumpulan query, beserta vektor query lengkapnya dan IDF yang dipakai.
+
+        Harus dipanggil setelah _ensure_postings (pemadatan mengubah nomor slot).
+        """
+        indptr, docs, weights = self.postings
+        n_terms, n_slots = len(indptr) - 1, len(self.slot_ids)
+        # IDF terkini: query boleh memuat term yang belum ada saat matriks dibangun
+        idf = self._idf()
+        queries = [self._vector(slot, idf) for slot in slots]
+        positions, values = [], []
+        for row, (query_terms, query_weights) in enumerate(queries):
+            for term, weight in zip(*self._query(query_terms, query_weights, n_terms)):
+                start, end = indptr[term], indptr[term + 1]
+                positions.append(docs[start:end] + row * n_slots)
+                values.append(weights[start:end] * weight)
+        if positions:
+            flat = np.bincount(np.concatenate(positions), np.concatenate(values), minlength=len(slots) * n_slots)
+            scores = flat.reshape(len(slots), n_slots)
+        else:
+            scores = np.zeros((len(slots), n_slots))
+        if self.extra:
+            # Record di luar matriks dinilai langsung dengan vektor padat query
+            if self.extra_matrix is None:
+                vectors = [(slot,) + self._vector(slot, idf) for slot in self.extra]
+                self.extra_matrix = (np.concatenate([v[1] for v in vectors]),
+                                     np.concatenate([v[2] for v in vectors]),
+                                     np.repeat([v[0] for v in vectors], [len(v[1]) for v in vectors]))
+            extra_terms, extra_weights, extra_docs = self.extra_matrix
+            dense = np.zeros(len(idf))
+            for row, (query_terms, query_weights) in enumerate(queries):
+                dense[query_terms] = query_weights
+                scores[row] += np.bincount(extra_docs, extra_weights * dense[extra_terms], minlength=n_slots)
+                dense[query_terms] = 0.0
+        scores[:, ~self.alive[:n_slots]] = 0.0
+        scores[np.arange(len(slots)), slots] = 0.0
+        return scores, queries, idf
+
+    def _top(self, scores, query, idf, k):
+        """k slot teratas; kandidat dari skor perkiraan dinilai ulang secara tepat"""
+        count = min(max(k * RESCORE_FACTOR, MIN_RESCORE), len(scores))
+        if count <= 0 or k <= 0:
+            return []
+        candidates = np.argpartition(-scores, count - 1)[:count]
+        candidates = candidates[scores[candidates] > 0]
+        dense = np.zeros(len(idf))
+        dense[query[0]] = query[1]
+        exact = []
+        for slot in candidates:
+            term_ids, weights = self._vector(slot, idf)
+            exact.append(float(weights @ dense[term_ids]))
+        order = sorted(range(len(candidates)), key=lambda i: -exact[i])[:k]
+        return [(self.slot_ids[candidates[i]], exact[i]) for i in order if exact[i] >= MIN_SIMILARITY]
+
+    def similar(self, doc_id, k=5):
+        """k record paling mirip dengan doc_id: list (id, skor kosinus) dari skor tertinggi"""
+        if doc_id not in self.slots:
+            return []
+        self.hits[doc_id] += 1
+        cached = self.neighbors.get(doc_id)
+        if cached is not None and cached[0] >= k:
+            return cached[1][:k]
+        self._ensure_postings()
+        slot = self.slots[doc_id]
+        scores, queries, idf = self._scores([slot])
+        result = self._top(scores[0], queries[0], idf, k)
+        if self.hits[doc_id] >= HOT_RECORD_HITS:
+            self.neighbors[doc_id] = (k, result)
+        return result
+
+    def similar_batch(self, doc_ids, k=5):
+        """Hasil similar() untuk banyak record sekaligus, dihitung per batch"""
+        results = {}
+        self._ensure_postings()
+        slots = [(doc_id, self.slots[doc_id]) for doc_id in doc_ids if doc_id in self.slots]
+        for start in range(0, len(slots), QUERY_BATCH_SIZE):
+            batch = slots[start:start + QUERY_BATCH_SIZE]
+            scores, queries, idf = self._scores([slot for _, slot in batch])
+            for (doc_id, _), row, query in zip(batch, scores, queries):
+                results[doc_id] = self._top(row, query, idf, k)
+        return results
+
+    def precompute(self, limit=100, k=5):
+        """Isi tabel tetangga untuk record yang paling sering diminta"""
+        hot = [doc_id for doc_id, _ in self.hits.most_common(limit)]
+        for doc_id, result in self.similar_batch(hot, k).items():
+            self.neighbors[doc_id] = (k, result)
+        return len(hot)
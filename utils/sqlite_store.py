@@ -0,0 +1,478 @@
+# utils/sqlite_store.py
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
+
+from utils.aggregates import UNKNOWN_STATUS
+from utils.facets import clean_label, normalize_term
+from utils.search_index import tokenize
+
+# Kolom skalar yang disimpan sebagai kolom tabel; field lain masuk kolom extra (JSON)
+SCALAR_COLUMNS = (
+    'judul', 'peneliti_utama', 'institusi', 'tahun', 'status', 'tanggal_mulai',
+    'tanggal_selesai', 'sumber_dana', 'abstrak', 'latar_belakang', 'metodologi',
+    'hasil', 'kesimpulan', 'link_publikasi', 'tanggal_input',
+)
+LIST_TABLES = {'bidang': 'research_bidang', 'kata_kunci': 'research_kata_kunci'}
+# Kolom untuk DataFrame analisis (lihat utils/frames.py), tanpa teks panjang
+FRAME_COLUMNS = ('judul', 'tahun', 'status', 'institusi', 'sumber_dana', 'tanggal_mulai', 'tanggal_selesai')
+FTS_COLUMNS = ('judul', 'peneliti_utama', 'kata_kunci', 'abstrak', 'metodologi', 'hasil')
+# Bobot bm25() per kolom FTS, selaras dengan SEARCH_FIELDS
+FTS_WEIGHTS = (3.0, 2.0, 2.0, 1.0, 1.0, 1.0)
+
+# Tanggal yang dianggap valid untuk pengurutan/timeline
+_DATE_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*"
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS research (
+    id INTEGER PRIMARY KEY,
+    judul TEXT,
+    peneliti_utama TEXT,
+    institusi TEXT,
+    tahun INTEGER,
+    status TEXT,
+    tanggal_mulai TEXT,
+    tanggal_selesai TEXT,
+    sumber_dana TEXT,
+    abstrak TEXT,
+    latar_belakang TEXT,
+    metodologi TEXT,
+    hasil TEXT,
+    kesimpulan TEXT,
+    link_publikasi TEXT,
+    tanggal_input TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_research_status ON research(status);
+CREATE INDEX IF NOT EXISTS idx_research_tahun ON research(tahun);
+CREATE INDEX IF NOT EXISTS idx_research_institusi ON research(institusi);
+CREATE INDEX IF NOT EXISTS idx_research_tanggal_mulai ON research(tanggal_mulai);
+CREATE TABLE IF NOT EXISTS research_bidang (
+    research_id INTEGER NOT NULL REFERENCES research(id) ON DELETE CASCADE,
+    pos INTEGER NOT NULL,
+    bidang TEXT NOT NULL,
+    term TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_bidang_value ON research_bidang(bidang, research_id);
+CREATE INDEX IF NOT EXISTS idx_bidang_research ON research_bidang(research_id);
+CREATE TABLE IF NOT EXISTS research_kata_kunci (
+    research_id INTEGER NOT NULL REFERENCES research(id) ON DELETE CASCADE,
+    pos INTEGER NOT NULL,
+    kata_kunci TEXT NOT NULL,
+    term TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_kata_kunci_value ON research_kata_kunci(kata_kunci, research_id);
+CREATE INDEX IF NOT EXISTS idx_kata_kunci_research ON research_kata_kunci(research_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS research_fts USING fts5(
+    {', '.join(FTS_COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta(key, value) VALUES ('version', 0), ('last_id', 0);
+"""
+
+def normalize_id(value):
+    """Id record sebagai int untuk kolom INTEGER PRIMARY KEY; None jika kosong.
+
+    String angka ("12") dan float bulat (12.0) diterima; id lain ditolak
+    dengan ValueError karena SQLite tidak bisa menyimpannya.
+    """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    raise ValueError(f"id tidak valid untuk backend SQLite: {value!r} (harus bilangan bulat)")
+
+def _normalize_ids(records):
+    """Ubah id setiap record ke int di tempat; semua id yang tidak valid dilaporkan sekaligus"""
+    invalid = []
+    for record in records:
+        try:
+            record['id'] = normalize_id(record.get('id'))
+        except ValueError:
+            invalid.append(record.get('id'))
+    if invalid:
+        shown = ", ".join(repr(v) for v in invalid[:10]) + (", ..." if len(invalid) > 10 else "")
+        raise ValueError(f"{len(invalid)} record memiliki id yang tidak valid untuk backend SQLite "
+                         f"(harus bilangan bulat): {shown}")
+
+class SqliteStorage:
+    """Backend penyimpanan SQLite (mode WAL) untuk data penelitian.
+
+    Filter, pencarian (FTS5), pengurutan, dan agregat dijalankan di SQL
+    sehingga halaman tidak perlu memuat seluruh data. Setiap penulisan
+    menaikkan versi di tabel meta, dipakai sebagai generasi dan ETag.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self.queries = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn().executescript(_SCHEMA)
+        self._migrate_terms()
+
+    def _migrate_terms(self):
+        """Tambahkan kolom istilah ternormalisasi (term) ke tabel list database lama"""
+        conn = self._conn()
+        for field, table in LIST_TABLES.items():
+            columns = {row['name'] for row in conn.execute(f"PRAGMA table_info({table})")}
+            if 'term' not in columns:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN term TEXT")
+                    rows = conn.execute(f"SELECT rowid, {field} FROM {table}").fetchall()
+                    conn.executemany(f"UPDATE {table} SET term = ? WHERE rowid = ?",
+                                     [(normalize_term(value), rowid) for rowid, value in rows])
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{field}_term ON {table}(term, research_id)")
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None,
+                                   check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def _execute(self, sql, params=()):
+        self.queries += 1
+        return self._conn().execute(sql, params)
+
+    # --- transaksi dan versi ---
+
+    def _write(self, func):
+        """Jalankan func(conn) dalam transaksi tulis dan naikkan versi data"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(conn)
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'version'")
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def version(self):
+        return self._execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+
+    def _allocate_id(self, conn):
+        last = conn.execute("SELECT value FROM meta WHERE key = 'last_id'").fetchone()[0]
+        max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM research").fetchone()[0]
+        new_id = max(last, max_id) + 1
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'last_id'", (new_id,))
+        return new_id
+
+    def allocate_id(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            new_id = self._allocate_id(conn)
+            conn.execute("COMMIT")
+            return new_id
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    # --- konversi record <-> baris ---
+
+    def _insert(self, conn, record):
+        record['id'] = normalize_id(record.get('id'))
+        if record['id'] is None:
+            record['id'] = self._allocate_id(conn)
+        record_id = record['id']
+        extra = {k: v for k, v in record.items()
+                 if k != 'id' and k not in SCALAR_COLUMNS and k not in LIST_TABLES}
+        values = [record.get(c) for c in SCALAR_COLUMNS]
+        conn.execute(
+            f"INSERT OR REPLACE INTO research (id, {', '.join(SCALAR_COLUMNS)}, extra) "
+            f"VALUES ({', '.join('?' * (len(SCALAR_COLUMNS) + 2))})",
+            [record_id] + values + [json.dumps(extra, ensure_ascii=False) if extra else None])
+        for field, table in LIST_TABLES.items():
+            conn.execute(f"DELETE FROM {table} WHERE research_id = ?", (record_id,))
+            items = record.get(field) or []
+            conn.executemany(
+                f"INSERT INTO {table} (research_id, pos, {field}, term) VALUES (?, ?, ?, ?)",
+                [(record_id, pos, str(item), normalize_term(item)) for pos, item in enumerate(items)])
+        conn.execute("DELETE FROM research_fts WHERE rowid = ?", (record_id,))
+        conn.execute(
+            f"INSERT INTO research_fts (rowid, {', '.join(FTS_COLUMNS)}) "
+            f"VALUES (?, {', '.join('?' * len(FTS_COLUMNS))})",
+            [record_id] + [" ".join(map(str, record.get(c) or [])) if c in LIST_TABLES
+                           else record.get(c) for c in FTS_COLUMNS])
+        return record_id
+
+    def _rows_to_records(self, rows):
+        """Ubah baris tabel research menjadi dict record lengkap dengan list field"""
+        records = []
+        by_id = {}
+        for row in rows:
+            record = {'id': row['id']}
+            for column in SCALAR_COLUMNS:
+                # Kolom kosong tidak dimunculkan, sama seperti field yang tidak ada di JSON
+                if row[column] is not None:
+                    record[column] = row[column]
+            for field in LIST_TABLES:
+                record[field] = []
+            if row['extra']:
+                record.update(json.loads(row['extra']))
+            records.append(record)
+            by_id[row['id']] = record
+        if not by_id:
+            return records
+        ids = list(by_id)
+        for field, table in LIST_TABLES.items():
+            for chunk_start in range(0, len(ids), 900):
+                chunk = ids[chunk_start:chunk_start + 900]
+                rows = self._execute(
+                    f"SELECT research_id, {field} FROM {table} "
+                    f"WHERE research_id IN ({', '.join('?' * len(chunk))}) ORDER BY research_id, pos",
+                    chunk)
+                for research_id, value in rows:
+                    by_id[research_id][field].append(value)
+        return records
+
+    # --- API penyimpanan ---
+
+    def load_all(self):
+        rows = self._execute("SELECT * FROM research ORDER BY id").fetchall()
+        return self._rows_to_records(rows)
+
+    def replace_all(self, records, expected_version=None):
+        """Timpa seluruh data.
+
+        Jika expected_version diberikan dan berbeda dengan versi saat ini,
+        record milik penulis lain yang tidak ada di records dipertahankan.
+        Id diubah ke int (lihat normalize_id); jika ada id yang tidak valid,
+        ValueError dilempar sebelum data apa pun ditimpa.
+        """
+        records = list(records)
+        _normalize_ids(records)
+
+        def write(conn):
+            records_to_write = list(records)
+            current = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()[0]
+            if expected_version is not None and expected_version != current:
+                ids = {r.get('id') for r in records_to_write}
+                existing = self._rows_to_records(conn.execute(
+                    "SELECT * FROM research ORDER BY id").fetchall())
+                records_to_write += [r for r in existing if r['id'] not in ids]
+            for table in ('research_fts', 'research_bidang', 'research_kata_kunci', 'research'):
+                conn.execute(f"DELETE FROM {table}")
+            # Id baru untuk record tanpa id harus melewati semua id yang ditulis,
+            # agar tidak menimpa record yang disisipkan setelahnya
+            top = max((r['id'] for r in records_to_write if r.get('id') is not None), default=0)
+            conn.execute("UPDATE meta SET value = MAX(value, ?) WHERE key = 'last_id'", (top,))
+            for record in records_to_write:
+                self._insert(conn, record)
+        self._write(write)
+
+    def upsert_many(self, records):
+        """Tambah/timpa banyak record dalam satu transaksi"""
+        self._write(lambda conn: [self._insert(conn, r) for r in records])
+
+    def append(self, record):
+        """Tambah satu record baru; id yang kosong atau sudah dipakai diganti id baru"""
+        def write(conn):
+            record_id = record.get('id')
+            if record_id is not None and conn.execute(
+                    "SELECT 1 FROM research WHERE id = ?", (record_id,)).fetchone():
+                record['id'] = None
+            return self._insert(conn, record)
+        return self._write(write)
+
+    def append_many(self, records):
+        """Tambah banyak record baru dalam satu transaksi; id yang sudah ada dilewati.
+
+        Mengembalikan (list record yang ditambahkan, jumlah duplikat).
+        """
+        def write(conn):
+            added, duplicates = [], 0
+            for record in records:
+                record_id = record.get('id')
+                if record_id is not None and conn.execute(
+                        "SELECT 1 FROM research WHERE id = ?", (record_id,)).fetchone():
+                    duplicates += 1
+                    continue
+                self._insert(conn, record)
+                added.append(record)
+            return added, duplicates
+        return self._write(write)
+
+    def count(self):
+        return self._execute("SELECT COUNT(*) FROM research").fetchone()[0]
+
+    def count_by(self, field):
+        if field in LIST_TABLES:
+            rows = self._execute(
+                f"SELECT {field}, COUNT(DISTINCT research_id) FROM {LIST_TABLES[field]} GROUP BY {field}")
+        else:
+            rows = self._execute(
+                f"SELECT {field}, COUNT(*) FROM research "
+                f"WHERE {field} IS NOT NULL AND {field} != '' GROUP BY {field}")
+        return {value: count for value, count in rows}
+
+    # --- query ---
+
+    @staticmethod
+    def _fts_query(text):
+        """Ubah teks bebas menjadi query FTS5: setiap kata sebagai prefiks, digabung AND"""
+        tokens = tokenize(text, stemming=False)
+        return " ".join(f'"{t}"*' for t in dict.fromkeys(tokens))
+
+    def _where(self, filters, text):
+        clauses, params = [], []
+        for field, value in filters.items():
+            if value is None:
+                continue
+            values = list(value) if isinstance(value, (list, tuple, set, frozenset)) else [value]
+            if field == 'tahun':
+                values = [int(v) if str(v).strip().lstrip('-').isdigit() else v for v in values]
+            placeholders = ', '.join('?' * len(values))
+            if field in LIST_TABLES:
+                clauses.append(f"r.id IN (SELECT research_id FROM {LIST_TABLES[field]} "
+                               f"WHERE {field} IN ({placeholders}))")
+            else:
+                clauses.append(f"r.{field} IN ({placeholders})")
+            params.extend(values)
+        join = ""
+        if text:
+            match = self._fts_query(text)
+            if not match:
+                return None, None, None
+            join = "JOIN research_fts ON research_fts.rowid = r.id"
+            clauses.append("research_fts MATCH ?")
+            params.append(match)
+        where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+        return join, where, params
+
+    def _order(self, sort_by, descending, text):
+        direction = "DESC" if descending else "ASC"
+        if sort_by == 'tanggal_mulai':
+            return (f"ORDER BY CASE WHEN r.tanggal_mulai GLOB '{_DATE_GLOB}' "
+                    f"THEN substr(r.tanggal_mulai, 1, 10) ELSE '' END {direction}, r.id {direction}")
+        if sort_by == 'tahun':
+            return (f"ORDER BY CASE WHEN typeof(r.tahun) = 'integer' THEN r.tahun ELSE -1 END "
+                    f"{direction}, r.id {direction}")
+        if text:
+            weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+            return f"ORDER BY bm25(research_fts, {weights}), r.id"
+        return "ORDER BY r.id"
+
+    def query(self, filters, text=None, sort_by=None, descending=True, offset=0, limit=None):
+        """Record yang cocok beserta total; filter, FTS, urut, dan paging di SQL"""
+        join, where, params = self._where(filters, text)
+        if where is None:
+            return [], 0
+        total = self._execute(f"SELECT COUNT(*) FROM research r {join} {where}", params).fetchone()[0]
+        sql = f"SELECT r.* FROM research r {join} {where} {self._order(sort_by, descending, text)}"
+        page_params = list(params)
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            page_params += [limit, offset]
+        rows = self._execute(sql, page_params).fetchall()
+        return self._rows_to_records(rows), total
+
+    def facet_counts(self, field, filters=None, text=None, prefix=None):
+        """Jumlah record per istilah ternormalisasi field list, dihitung dengan GROUP BY.
+
+        Filter sama dengan query; prefix membatasi ke istilah berawalan
+        tersebut (setelah dinormalisasi). Mengembalikan list (label, jumlah)
+        dari yang terbanyak; label adalah ejaan yang paling sering dipakai.
+        """
+        table = LIST_TABLES[field]
+        terms, term_params = "l.term != ''", []
+        if prefix:
+            prefix = normalize_term(prefix)
+            terms += " AND l.term >= ? AND l.term < ?"
+            term_params = [prefix, prefix + "\U0010ffff"]
+        scope, scope_params = "", []
+        if text or any(value is not None for value in (filters or {}).values()):
+            join, where, scope_params = self._where(filters or {}, text)
+            if where is None:
+                return []
+            scope = f"AND l.research_id IN (SELECT r.id FROM research r {join} {where})"
+        counts = self._execute(
+            f"SELECT l.term, COUNT(DISTINCT l.research_id) AS n, MIN(l.rowid) AS first "
+            f"FROM {table} l WHERE {terms} {scope} GROUP BY l.term ORDER BY n DESC, first",
+            term_params + scope_params).fetchall()
+        if not counts:
+            return []
+        # Ejaan dihitung di seluruh data, seperti kamus facet backend JSON
+        spellings = {}
+        for term, value, n in self._execute(
+                f"SELECT l.term, l.{field}, COUNT(*) FROM {table} l WHERE {terms} "
+                f"GROUP BY l.term, l.{field} ORDER BY MIN(l.rowid)", term_params):
+            spellings.setdefault(term, Counter())[clean_label(value)] += n
+        return [(spellings[term].most_common(1)[0][0], n) for term, n, _ in counts]
+
+    def frame_records(self):
+        """Record berisi kolom FRAME_COLUMNS dan field list saja, untuk DataFrame analisis"""
+        records, by_id = [], {}
+        for row in self._execute(f"SELECT id, {', '.join(FRAME_COLUMNS)} FROM research ORDER BY id"):
+            record = {key: row[key] for key in row.keys() if row[key] is not None}
+            for field in LIST_TABLES:
+                record[field] = []
+            records.append(record)
+            by_id[row['id']] = record
+        for field, table in LIST_TABLES.items():
+            for research_id, value in self._execute(
+                    f"SELECT research_id, {field} FROM {table} ORDER BY research_id, pos"):
+                record = by_id.get(research_id)
+                if record is not None:
+                    record[field].append(value)
+        return records
+
+    def get(self, record_id):
+        rows = self._execute("SELECT * FROM research WHERE id = ?", (record_id,)).fetchall()
+        records = self._rows_to_records(rows)
+        return records[0] if records else None
+
+    def latest(self, n):
+        records, _ = self.query({}, sort_by='tanggal_mulai', descending=True, limit=n)
+        return records
+
+    def aggregates(self):
+        """Agregat dashboard/analisis dihitung dengan GROUP BY di SQLite"""
+        status = {value if value is not None else UNKNOWN_STATUS: count for value, count in self._execute(
+            "SELECT status, COUNT(*) FROM research GROUP BY status")}
+        tahun = {value: count for value, count in self._execute(
+            "SELECT tahun, COUNT(*) FROM research "
+            "WHERE tahun IS NOT NULL AND tahun != '' AND tahun != 0 GROUP BY tahun")}
+        bidang = self.count_by('bidang')
+        kata_kunci = Counter({value: count for value, count in self._execute(
+            "SELECT kata_kunci, COUNT(*) FROM research_kata_kunci GROUP BY kata_kunci")})
+        bulan = {}
+        for month, count in self._execute(
+                f"SELECT substr(tanggal_mulai, 1, 7) AS bulan, COUNT(*) FROM research "
+                f"WHERE tanggal_mulai GLOB '{_DATE_GLOB}' GROUP BY bulan ORDER BY bulan"):
+            if 1 <= int(month[5:7]) <= 12:
+                bulan[month] = count
+        return {
+            'total': self.count(),
+            'status': status,
+            'tahun': tahun,
+            'bidang': bidang,
+            'kata_kunci': kata_kunci,
+            'bulan': bulan,
+            'keyword_occurrences': sum(kata_kunci.values()),
+        }
+
+    def stats(self):
+        return {'queries': self.queries, 'version': self.version(), 'records': self.count()}